@@ -44,6 +44,11 @@ export async function POST(
     headers["Authorization"] = authHeader;
   }
 
+  const profileHeader = request.headers.get("x-profile");
+  if (profileHeader) {
+    headers["X-Profile"] = profileHeader;
+  }
+
   const contentType = request.headers.get("content-type");
 
   try {
@@ -70,7 +75,15 @@ export async function POST(
     });
 
     const data = await response.json();
-    return NextResponse.json(data, { status: response.status });
+    const responseHeaders: HeadersInit = {};
+    const profileId = response.headers.get("x-profile-id");
+    if (profileId) {
+      responseHeaders["X-Profile-Id"] = profileId;
+    }
+    return NextResponse.json(data, {
+      status: response.status,
+      headers: responseHeaders,
+    });
   } catch (error) {
     console.error("Backend proxy error:", error);
     return NextResponse.json(
@@ -19,6 +19,19 @@ type SourceItem = {
   score: number;
 };
 
+type ProfileItem = {
+  id: string;
+  label: string;
+  mode: string;
+  engine: string;
+  created_at: string;
+  wall_ms: number;
+  cpu_ms: number;
+  failed: boolean;
+  meta: Record<string, unknown>;
+  report?: string;
+};
+
 type UploadLog = {
   name: string;
   status: "queued" | "success" | "error";
@@ -56,8 +69,13 @@ export default function Home() {
   const [ragAnswer, setRagAnswer] = useState<string | null>(null);
   const [ragSources, setRagSources] = useState<SourceItem[]>([]);
   const [ragLoading, setRagLoading] = useState(false);
+  const [ragProfile, setRagProfile] = useState(false);
+  const [profiles, setProfiles] = useState<ProfileItem[]>([]);
+  const [selectedProfile, setSelectedProfile] = useState<ProfileItem | null>(
+    null
+  );
   const [activeTab, setActiveTab] = useState<
-    "overview" | "documents" | "rag"
+    "overview" | "documents" | "rag" | "profiles"
   >("overview");
 
   useEffect(() => {
@@ -229,23 +247,55 @@ export default function Home() {
     }
   }
 
+  async function fetchProfiles() {
+    if (!token) return;
+    const res = await fetch(`${API_BASE}/admin/profiles?limit=50`, {
+      headers: {
+        Authorization: `Bearer ${token}`,
+      },
+    });
+    setProfiles(res.ok ? ((await res.json()) as ProfileItem[]) : []);
+  }
+
+  async function openProfile(id: string) {
+    if (!token) return;
+    const res = await fetch(`${API_BASE}/admin/profiles/${id}`, {
+      headers: {
+        Authorization: `Bearer ${token}`,
+      },
+    });
+    if (res.ok) {
+      setSelectedProfile((await res.json()) as ProfileItem);
+    }
+  }
+
   async function runRagTest() {
     if (!ragQuery) return;
     setRagLoading(true);
     setRagAnswer(null);
     setRagSources([]);
     try {
+      const headers: Record<string, string> = {
+        "Content-Type": "application/json",
+      };
+      if (ragProfile && token) {
+        headers["Authorization"] = `Bearer ${token}`;
+        headers["X-Profile"] = "wall";
+      }
       const res = await fetch(`${API_BASE}/chat/query`, {
         method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
+        headers,
         body: JSON.stringify({ query: ragQuery, top_k: ragTopK }),
       });
       if (res.ok) {
         const data = await res.json();
         setRagAnswer(data.answer);
         setRagSources(data.sources ?? []);
+        const profileId = res.headers.get("x-profile-id");
+        if (profileId) {
+          await fetchProfiles();
+          await openProfile(profileId);
+        }
       } else {
         setRagAnswer("요청이 실패했습니다.");
       }
@@ -361,12 +411,16 @@ export default function Home() {
             { id: "overview", label: "Overview" },
             { id: "documents", label: "Documents" },
             { id: "rag", label: "RAG Test" },
+            { id: "profiles", label: "Profiles" },
           ].map((tab) => (
             <button
               key={tab.id}
-              onClick={() =>
-                setActiveTab(tab.id as "overview" | "documents" | "rag")
-              }
+              onClick={() => {
+                setActiveTab(
+                  tab.id as "overview" | "documents" | "rag" | "profiles"
+                );
+                if (tab.id === "profiles") fetchProfiles();
+              }}
               className={`rounded-full px-5 py-2 transition ${
                 activeTab === tab.id
                   ? "bg-[var(--ink-900)] text-[var(--ink-100)]"
@@ -598,6 +652,14 @@ export default function Home() {
                     <span className="rounded-full bg-white/80 px-3 py-1 text-xs">
                       {ragTopK}
                     </span>
+                    <label className="flex items-center gap-2">
+                      <input
+                        type="checkbox"
+                        checked={ragProfile}
+                        onChange={(e) => setRagProfile(e.target.checked)}
+                      />
+                      Profile
+                    </label>
                   </div>
                   <button
                     onClick={runRagTest}
@@ -641,6 +703,65 @@ export default function Home() {
             </div>
           </section>
         )}
+
+        {activeTab === "profiles" && (
+          <section className="grid gap-8 lg:grid-cols-[0.9fr_1.1fr]">
+            <div className="fade-up rounded-[32px] bg-[var(--card)] p-8 shadow-[var(--shadow)] backdrop-blur">
+              <div className="flex flex-wrap items-center justify-between gap-4">
+                <div>
+                  <h2 className="text-xl font-semibold text-[var(--ink-900)]">
+                    Request Profiles
+                  </h2>
+                  <p className="mt-2 text-sm text-[var(--ink-600)]">
+                    X-Profile 헤더 또는 샘플링으로 수집된 get_answer 프로파일입니다.
+                  </p>
+                </div>
+                <button
+                  onClick={fetchProfiles}
+                  className="rounded-full border border-[var(--ink-200)] px-4 py-2 text-sm font-semibold text-[var(--ink-600)] transition hover:border-[var(--ink-600)]"
+                >
+                  Refresh
+                </button>
+              </div>
+              <div className="mt-6 space-y-3">
+                {profiles.map((profile) => (
+                  <button
+                    key={profile.id}
+                    onClick={() => openProfile(profile.id)}
+                    className="flex w-full items-center justify-between rounded-2xl border border-[var(--ink-200)] bg-white/70 px-4 py-3 text-left text-sm"
+                  >
+                    <div>
+                      <p className="font-semibold text-[var(--ink-900)]">
+                        {String(profile.meta?.query ?? profile.label)}
+                      </p>
+                      <p className="text-xs text-[var(--ink-600)]">
+                        {formatDate(profile.created_at)} · {profile.engine}
+                      </p>
+                    </div>
+                    <span className="rounded-full bg-[var(--sun-400)] px-3 py-1 text-xs font-semibold text-[var(--ink-900)]">
+                      {profile.wall_ms.toFixed(0)} ms / CPU{" "}
+                      {profile.cpu_ms.toFixed(0)} ms
+                    </span>
+                  </button>
+                ))}
+                {profiles.length === 0 && (
+                  <p className="text-sm text-[var(--ink-600)]">
+                    저장된 프로파일이 없습니다.
+                  </p>
+                )}
+              </div>
+            </div>
+
+            <div className="fade-up rounded-[32px] bg-[var(--card)] p-8 shadow-[var(--shadow)] backdrop-blur">
+              <h2 className="text-xl font-semibold text-[var(--ink-900)]">
+                Profile Report
+              </h2>
+              <pre className="mt-4 max-h-[640px] overflow-auto rounded-2xl border border-[var(--ink-200)] bg-white/80 p-4 text-xs text-[var(--ink-900)]">
+                {selectedProfile?.report ?? "프로파일을 선택하세요."}
+              </pre>
+            </div>
+          </section>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,41 @@
+"""add search filter indexes
+
+검색 필터(category / document_ids / 기간)를 ANN 쿼리 안에서 처리하기 위한 보조 인덱스.
+초기 스키마는 app.initial_data의 create_all로 생성되므로, 테이블이 아직 없으면 건너뜁니다.
+
+Revision ID: 3c1f0a9b2d41
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f0a9b2d41'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    # CONCURRENTLY는 트랜잭션 밖에서만 실행 가능
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_document_id ON embeddings (document_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_category ON embeddings ((metadata_info ->> 'category'))")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_created_at ON documents (created_at)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_category")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_document_id")
@@ -0,0 +1,43 @@
+"""add binary quantized hnsw index
+
+VECTOR_SEARCH_MODE=binary_rescore의 1단계(해밍 거리) 검색용 expression index.
+bit(768) 값은 float32 벡터의 1/32 크기이며, 별도 컬럼 없이 INSERT 시 인덱스가 함께 갱신됩니다.
+pgvector 0.7+ 필요 (binary_quantize, bit_hamming_ops).
+
+Revision ID: 5a7d2c8e4f10
+Revises: 3c1f0a9b2d41
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7d2c8e4f10'
+down_revision: Union[str, None] = '3c1f0a9b2d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_embedding_bq_hnsw ON embeddings "
+            "USING hnsw ((binary_quantize(embedding)::bit(768)) bit_hamming_ops) "
+            f"WITH (m = {int(settings.HNSW_M)}, ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)})"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_embedding_bq_hnsw")
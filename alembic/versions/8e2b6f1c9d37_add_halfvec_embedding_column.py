@@ -0,0 +1,82 @@
+"""add halfvec embedding column
+
+VECTOR_STORAGE=halfvec 전환용 float16 벡터 컬럼과 HNSW 인덱스.
+- ADD COLUMN(nullable, default 없음)은 메타데이터만 변경하므로 테이블 재작성이 없습니다.
+- 기존 행은 BACKFILL_BATCH_SIZE 단위로 각각 커밋하며 백필합니다 (행 잠금은 배치 동안만 유지).
+- 인덱스는 백필 이후 CONCURRENTLY로 생성합니다.
+
+전환 후 float32 컬럼 공간을 회수하려면 VECTOR_STORAGE=halfvec 배포가 끝난 뒤 별도로
+`UPDATE embeddings SET embedding = NULL` (배치) + VACUUM / pg_repack 을 실행하세요.
+
+Revision ID: 8e2b6f1c9d37
+Revises: 5a7d2c8e4f10
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2b6f1c9d37'
+down_revision: Union[str, None] = '5a7d2c8e4f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    if not _has_column("embeddings", "embedding_half"):
+        op.execute("ALTER TABLE embeddings ADD COLUMN embedding_half halfvec(768)")
+    # halfvec 모드에서는 float32 컬럼을 채우지 않음
+    op.alter_column("embeddings", "embedding", nullable=True)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(sa.text(
+                "UPDATE embeddings SET embedding_half = embedding::halfvec(768) "
+                "WHERE id IN ("
+                "  SELECT id FROM embeddings"
+                "  WHERE embedding_half IS NULL AND embedding IS NOT NULL"
+                "  LIMIT :batch FOR UPDATE SKIP LOCKED"
+                ")"
+            ), {"batch": BACKFILL_BATCH_SIZE})
+            if result.rowcount == 0:
+                break
+
+        params = f"m = {int(settings.HNSW_M)}, ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)}"
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_embedding_half_hnsw ON embeddings "
+            f"USING hnsw (embedding_half halfvec_l2_ops) WITH ({params})"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_embedding_half_bq_hnsw ON embeddings "
+            f"USING hnsw ((binary_quantize(embedding_half)::bit(768)) bit_hamming_ops) WITH ({params})"
+        )
+
+
+def downgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_embedding_half_bq_hnsw")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_embedding_half_hnsw")
+        # halfvec 모드에서 적재된 행은 float32 값이 없으므로 복원
+        op.execute("UPDATE embeddings SET embedding = embedding_half::vector(768) WHERE embedding IS NULL")
+    op.alter_column("embeddings", "embedding", nullable=False)
+    op.drop_column("embeddings", "embedding_half")
@@ -0,0 +1,46 @@
+"""add document content hash
+
+업로드 시 스트리밍으로 계산한 원본 파일 SHA-256(documents.content_hash).
+같은 내용의 파일이 이미 적재되어 있으면 적재 작업을 건너뜁니다.
+기존 문서는 NULL로 두며, 다음 업로드 때 한 번 적재되면서 채워집니다.
+
+Revision ID: a9c4e1f7b362
+Revises: f3b9d2c7a814
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e1f7b362'
+down_revision: Union[str, None] = 'f3b9d2c7a814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_table("documents"):
+        return
+    if not _has_column("documents", "content_hash"):
+        op.add_column("documents", sa.Column("content_hash", sa.String(64), nullable=True))
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_content_hash ON documents (content_hash)")
+
+
+def downgrade() -> None:
+    if not _has_table("documents"):
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_content_hash")
+    op.drop_column("documents", "content_hash")
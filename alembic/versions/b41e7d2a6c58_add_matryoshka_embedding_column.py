@@ -0,0 +1,72 @@
+"""add matryoshka embedding column
+
+VECTOR_SEARCH_MODE=matryoshka_rescore 1단계 검색용 축소 차원 벡터 컬럼(vector(MATRYOSHKA_DIM))과 HNSW 인덱스.
+기존 행은 앞 MATRYOSHKA_DIM 차원을 잘라 재정규화한 값으로 배치 백필합니다
+(app.services.vector_service.truncate_embedding과 동일한 계산, pgvector 0.7+의 subvector/l2_normalize 사용).
+
+MATRYOSHKA_DIM을 바꾸면 컬럼을 다시 만들어야 하므로 downgrade → 설정 변경 → upgrade 순으로 재적용하세요.
+
+Revision ID: b41e7d2a6c58
+Revises: 8e2b6f1c9d37
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e7d2a6c58'
+down_revision: Union[str, None] = '8e2b6f1c9d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    dim = int(settings.MATRYOSHKA_DIM)
+    if not _has_column("embeddings", "embedding_short"):
+        op.execute(f"ALTER TABLE embeddings ADD COLUMN embedding_short vector({dim})")
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(sa.text(
+                f"UPDATE embeddings SET embedding_short = "
+                f"l2_normalize(subvector(COALESCE(embedding, embedding_half::vector), 1, {dim})) "
+                "WHERE id IN ("
+                "  SELECT id FROM embeddings"
+                "  WHERE embedding_short IS NULL AND (embedding IS NOT NULL OR embedding_half IS NOT NULL)"
+                "  LIMIT :batch FOR UPDATE SKIP LOCKED"
+                ")"
+            ), {"batch": BACKFILL_BATCH_SIZE})
+            if result.rowcount == 0:
+                break
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_embedding_short_hnsw ON embeddings "
+            "USING hnsw (embedding_short vector_l2_ops) "
+            f"WITH (m = {int(settings.HNSW_M)}, ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)})"
+        )
+
+
+def downgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_embedding_short_hnsw")
+    op.drop_column("embeddings", "embedding_short")
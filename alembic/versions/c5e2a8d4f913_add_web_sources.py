@@ -0,0 +1,47 @@
+"""add web sources
+
+웹 크롤링 URL별 조건부 요청 정보(web_sources: ETag, Last-Modified, 본문 SHA-256).
+재크롤링 시 변경되지 않은 페이지는 다운로드/재임베딩을 생략합니다.
+
+Revision ID: c5e2a8d4f913
+Revises: a9c4e1f7b362
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a8d4f913'
+down_revision: Union[str, None] = 'a9c4e1f7b362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if _has_table("web_sources"):
+        return
+    op.create_table(
+        "web_sources",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("url", sa.String(), nullable=False, unique=True),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("last_modified", sa.String(), nullable=True),
+        sa.Column("content_hash", sa.String(64), nullable=True),
+        sa.Column("last_status", sa.Integer(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    if _has_table("web_sources"):
+        op.drop_table("web_sources")
@@ -0,0 +1,76 @@
+"""add document summary embedding
+
+2단계 검색(TWO_STAGE_RETRIEVAL)의 문서 단위 1단계용 documents.summary_embedding(vector(768))과 HNSW 인덱스.
+기존 문서는 청크 임베딩 평균을 L2 재정규화한 값으로 문서 id 순서대로 배치 백필합니다
+(app.services.vector_index.mean_embedding과 동일한 계산, pgvector avg(vector) 집계 사용).
+
+Revision ID: d17c3a5e9b02
+Revises: b41e7d2a6c58
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = 'd17c3a5e9b02'
+down_revision: Union[str, None] = 'b41e7d2a6c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_table("documents") or not _has_table("embeddings"):
+        return
+    if not _has_column("documents", "summary_embedding"):
+        op.execute("ALTER TABLE documents ADD COLUMN summary_embedding vector(768)")
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        # 청크가 없는 문서는 NULL로 남으므로 IS NULL 반복 대신 id keyset으로 진행
+        last_id = None
+        while True:
+            batch = bind.execute(sa.text(
+                "SELECT id FROM documents WHERE summary_embedding IS NULL "
+                "AND (CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid)) ORDER BY id LIMIT :batch"
+            ), {"last_id": last_id, "batch": BACKFILL_BATCH_SIZE}).scalars().all()
+            if not batch:
+                break
+            bind.execute(sa.text(
+                "UPDATE documents d SET summary_embedding = l2_normalize(s.mean) "
+                "FROM ("
+                "  SELECT document_id, avg(COALESCE(embedding, embedding_half::vector)) AS mean"
+                "  FROM embeddings WHERE document_id = ANY(:ids)"
+                "  AND (embedding IS NOT NULL OR embedding_half IS NOT NULL)"
+                "  GROUP BY document_id"
+                ") s WHERE d.id = s.document_id"
+            ), {"ids": list(batch)})
+            last_id = str(batch[-1])
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_summary_embedding_hnsw ON documents "
+            "USING hnsw (summary_embedding vector_l2_ops) "
+            f"WITH (m = {int(settings.HNSW_M)}, ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)})"
+        )
+
+
+def downgrade() -> None:
+    if not _has_table("documents"):
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_summary_embedding_hnsw")
+    op.drop_column("documents", "summary_embedding")
@@ -0,0 +1,87 @@
+"""add near duplicate columns
+
+근사 중복 청크 탐지(NEAR_DUP_MODE)용 embeddings.simhash(bigint), simhash_bands(int[], GIN 인덱스),
+duplicate_of(원본 청크 FK, 원본 삭제 시 NULL).
+기존 청크의 SimHash는 app.utils.simhash로 계산해 id 순서대로 배치 백필합니다.
+duplicate_of는 적재 시점에만 기록되며, 기존 코퍼스의 중복은 GET /admin/duplicates 리포트로 확인합니다.
+
+Revision ID: e6a8f4b1c273
+Revises: d17c3a5e9b02
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.simhash import simhash, simhash_bands
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a8f4b1c273'
+down_revision: Union[str, None] = 'd17c3a5e9b02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    if not _has_column("embeddings", "simhash"):
+        op.add_column("embeddings", sa.Column("simhash", sa.BigInteger(), nullable=True))
+        op.add_column("embeddings", sa.Column("simhash_bands", postgresql.ARRAY(sa.Integer()), nullable=True))
+        op.add_column("embeddings", sa.Column("duplicate_of", postgresql.UUID(as_uuid=True), nullable=True))
+        op.create_foreign_key(
+            "embeddings_duplicate_of_fkey", "embeddings", "embeddings",
+            ["duplicate_of"], ["id"], ondelete="SET NULL"
+        )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        last_id = None
+        while True:
+            rows = bind.execute(sa.text(
+                "SELECT id, content FROM embeddings WHERE simhash IS NULL "
+                "AND (CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid)) ORDER BY id LIMIT :batch"
+            ), {"last_id": last_id, "batch": BACKFILL_BATCH_SIZE}).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                signature = simhash(row.content or "")
+                params.append({"id": row.id, "simhash": signature, "bands": simhash_bands(signature)})
+            bind.execute(sa.text(
+                "UPDATE embeddings SET simhash = :simhash, simhash_bands = CAST(:bands AS integer[]) WHERE id = :id"
+            ), params)
+            last_id = str(rows[-1].id)
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_simhash_bands_gin ON embeddings "
+            "USING gin (simhash_bands)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embeddings_duplicate_of ON embeddings (duplicate_of)"
+        )
+
+
+def downgrade() -> None:
+    if not _has_table("embeddings"):
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_duplicate_of")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_simhash_bands_gin")
+    op.drop_constraint("embeddings_duplicate_of_fkey", "embeddings", type_="foreignkey")
+    op.drop_column("embeddings", "duplicate_of")
+    op.drop_column("embeddings", "simhash_bands")
+    op.drop_column("embeddings", "simhash")
@@ -0,0 +1,35 @@
+"""partition embeddings
+
+스키마를 바꾸지 않는 리비전입니다. 같은 리비전의 DB는 항상 같은 스키마를 갖도록,
+embeddings의 hash(document_id) 파티셔닝 전환은 마이그레이션이 아닌 운영 명령으로 합니다:
+
+    python -m app.manage_indexes partition --partitions 8
+    python -m app.manage_indexes unpartition
+
+명령은 한 트랜잭션에서 embeddings를 EXCLUSIVE로 잠그고(적재는 대기, 검색은 계속) 컬럼을 명시해 복사한 뒤
+이름을 교체합니다 (app.services.index_service.IndexService.convert_partitioning).
+전환 후 모든 프로세스의 EMBEDDINGS_PARTITIONS를 같은 값으로 맞춰야 합니다.
+
+이전 버전의 이 리비전으로 이미 파티셔닝된 DB는 그대로 유지되며, 되돌리려면 unpartition을 사용하세요
+(이 리비전을 downgrade하면 이후 리비전의 스키마/데이터가 삭제됩니다).
+
+Revision ID: f3b9d2c7a814
+Revises: e6a8f4b1c273
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d2c7a814'
+down_revision: Union[str, None] = 'e6a8f4b1c273'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -1,5 +1,5 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Callable, Generator, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
@@ -7,8 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core import security
+from app.core.admission import AdmissionRejected, chat_admission, log_rejection
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import SessionRole, get_db, session_scope
 from app.models.user import User
 from app.schemas.token import TokenPayload
 
@@ -16,6 +17,27 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"/api/v1/auth/login"
 )
 
+# 인증이 선택적인 엔드포인트(chat 등)용: 토큰이 없으면 None
+optional_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"/api/v1/auth/login",
+    auto_error=False
+)
+
+def session_dependency(role: SessionRole) -> Callable[[], AsyncGenerator[AsyncSession, None]]:
+    """
+    세션 역할(primary/read/ingest)을 고르는 DB 의존성을 만듭니다.
+    read는 복제 지연이 허용 범위인 읽기 복제본으로, 없으면 primary로 연결됩니다.
+    """
+    async def _get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with session_scope(role) as session:
+            yield session
+    return _get_session
+
+# 검색/채팅 등 읽기 전용 엔드포인트용
+get_read_db = session_dependency("read")
+# 긴 적재 트랜잭션용 (별도 풀)
+get_ingest_db = session_dependency("ingest")
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(reusable_oauth2)
@@ -48,3 +70,75 @@ async def get_current_active_superuser(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+def decode_token_subject(token: Optional[str]) -> Optional[str]:
+    """토큰의 subject(user id)만 DB 조회 없이 추출합니다. 유효하지 않으면 None."""
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        return TokenPayload(**payload).sub
+    except (JWTError, ValidationError):
+        return None
+
+async def user_from_token(db: AsyncSession, token: Optional[str]) -> Optional[User]:
+    """
+    토큰이 유효하면 활성 사용자를 반환하고, 없거나 유효하지 않으면 None을 반환합니다.
+    Public 엔드포인트에서 관리자 전용 옵션(프로파일링 등)을 판별할 때 사용합니다.
+    """
+    subject = decode_token_subject(token)
+    if subject is None:
+        return None
+
+    result = await db.execute(select(User).where(User.id == int(subject)))
+    user = result.scalars().first()
+    if not user or not user.is_active:
+        return None
+    return user
+
+def admission_key(request: Request, token: Optional[str]) -> str:
+    """
+    공정 대기열 키. 인증된 사용자는 user id, 그 외에는 클라이언트 IP.
+    x-openwebui-user-id 헤더는 누구나 보낼 수 있으므로 CHAT_TRUSTED_PROXIES에 등록된 프록시가 보낸 경우만 사용합니다.
+    """
+    subject = decode_token_subject(token)
+    if subject is not None:
+        return f"user:{subject}"
+
+    client_host = request.client.host if request.client else "unknown"
+    trusted_proxies = {p.strip() for p in settings.CHAT_TRUSTED_PROXIES.split(",") if p.strip()}
+    webui_user = request.headers.get("x-openwebui-user-id")
+    if webui_user and client_host in trusted_proxies:
+        return f"webui:{webui_user}"
+    return f"ip:{client_host}"
+
+async def admit_chat_request(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2)
+) -> AsyncGenerator[None, None]:
+    """
+    chat 파이프라인 진입 전 Admission Control.
+    admission_key 단위로 공정 대기열을 구성합니다.
+    DB 세션/Provider 호출보다 먼저 실행되도록 엔드포인트의 첫 번째 의존성으로 선언합니다.
+    """
+    if not chat_admission.enabled:
+        yield
+        return
+
+    user_key = admission_key(request, token)
+
+    try:
+        await chat_admission.acquire(user_key)
+    except AdmissionRejected as e:
+        log_rejection(user_key, e)
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    try:
+        yield
+    finally:
+        chat_admission.release()
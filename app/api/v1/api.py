@@ -1,10 +1,12 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import documents, chat, auth
+from app.api.v1.endpoints import documents, chat, auth, admin, search
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 
 # For Open WebUI compatibility
 from app.api.v1.endpoints.chat import list_models
@@ -0,0 +1,128 @@
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core import profiling
+from app.core.database import all_engines, replica_router
+from app.models.user import User
+from app.services.index_service import IndexService
+from app.services.near_dup_service import NearDupService
+from app.core.tasks import send_task
+
+router = APIRouter()
+
+# --- Request Profiles ---
+
+@router.get("/profiles")
+async def list_profiles(
+    limit: int = 50,
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> List[Dict[str, Any]]:
+    """
+    저장된 요청 프로파일 목록 (최신순).
+    Requires superuser.
+    """
+    return profiling.list_profiles(limit)
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Dict[str, Any]:
+    record = profiling.load_profile(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return record
+
+@router.get("/profiles/{profile_id}/html", response_class=HTMLResponse)
+async def get_profile_html(
+    profile_id: str,
+    current_user: User = Depends(deps.get_current_active_superuser)
+):
+    """pyinstrument로 수집된 프로파일의 인터랙티브 HTML 리포트"""
+    html = profiling.load_profile_html(profile_id)
+    if html is None:
+        raise HTTPException(status_code=404, detail="HTML report not available for this profile")
+    return HTMLResponse(html)
+
+# --- Index Maintenance ---
+
+class IndexRebuildRequest(BaseModel):
+    target: Literal["hnsw", "bq", "half", "half_bq", "short", "gin", "all"] = "hnsw"
+    m: Optional[int] = Field(None, ge=2, le=100) # 기본값: HNSW_M
+    ef_construction: Optional[int] = Field(None, ge=4, le=1000) # 기본값: HNSW_EF_CONSTRUCTION
+    prewarm: bool = True
+
+@router.get("/indexes")
+async def list_indexes(
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> List[Dict[str, Any]]:
+    """embeddings/documents 인덱스 크기, 유효 여부, 정의(WITH 파라미터 포함)"""
+    return await IndexService().stats()
+
+@router.get("/indexes/progress")
+async def index_build_progress(
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> List[Dict[str, Any]]:
+    """진행 중인 인덱스 빌드의 단계와 진행률 (pg_stat_progress_create_index)"""
+    return await IndexService().progress()
+
+@router.post("/indexes/rebuild", status_code=202)
+async def rebuild_indexes(
+    request: IndexRebuildRequest,
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Dict[str, Any]:
+    """
+    인덱스를 CONCURRENTLY 재생성하는 작업을 Celery에 등록합니다.
+    빌드 중에도 기존 인덱스로 검색이 계속됩니다.
+    """
+    if request.target == "gin" and (request.m or request.ef_construction):
+        raise HTTPException(status_code=400, detail="m/ef_construction apply only to the HNSW index")
+    task = send_task("rebuild_index_task", request.target, request.m, request.ef_construction, request.prewarm)
+    return {"task_id": task.id, "target": request.target}
+
+@router.post("/indexes/prewarm")
+async def prewarm_indexes(
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Dict[str, Any]:
+    """현재 검색 모드의 HNSW 인덱스와 GIN 인덱스를 shared_buffers에 적재 (DB 재시작 직후 콜드 캐시 방지)"""
+    return await IndexService().prewarm()
+
+# --- Database Pools / Read Replicas ---
+
+@router.get("/db")
+async def database_status(
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Dict[str, Any]:
+    """
+    이 API 프로세스의 커넥션 풀 상태(대화형/적재/복제본)와 읽기 복제본 지연/라우팅 통계.
+    복제본 지연은 마지막 측정값이며, 이 요청에서 새로 측정합니다.
+    """
+    if replica_router.replicas:
+        await replica_router.refresh()
+    return {
+        "pools": [
+            {"url": db_engine.url.render_as_string(hide_password=True), "status": db_engine.pool.status()}
+            for db_engine in all_engines()
+        ],
+        "replicas": replica_router.status(),
+        "routed_total": replica_router.routed_total,
+    }
+
+# --- Near-duplicate Chunks ---
+
+@router.get("/duplicates")
+async def near_duplicate_report(
+    limit: int = Query(50, ge=1, le=500),
+    max_distance: Optional[int] = Query(None, ge=0, le=3),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Dict[str, Any]:
+    """
+    코퍼스 전체의 근사 중복 청크 클러스터 (SimHash 해밍 거리 max_distance 이하, 기본값 NEAR_DUP_MAX_DISTANCE).
+    큰 클러스터 순으로 대표 청크, 포함 문서, 청크 id 목록을 반환합니다.
+    """
+    return await NearDupService(db).cluster_report(limit=limit, max_distance=max_distance)
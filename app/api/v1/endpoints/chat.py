@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import time
 import uuid
 
-from app.core.database import get_db
+from app.api import deps
 from app.core.config import settings
+from app.core import profiling
 from app.schemas.chat import ChatRequest, ChatResponse, SourceDocument
 from app.services.chat_service import ChatService
 
@@ -17,13 +18,31 @@ router = APIRouter()
 @router.post("/query", response_model=ChatResponse)
 async def chat_query(
     request: ChatRequest,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    _admission: None = Depends(deps.admit_chat_request),
+    db: AsyncSession = Depends(deps.get_read_db),
+    token: Optional[str] = Depends(deps.optional_oauth2),
+    x_profile: Optional[str] = Header(None),
 ):
     # Restore default top_k to 4
     k = request.top_k if request.top_k > 0 else 4
-    
+
+    # 프로파일링 헤더가 있을 때만 사용자 조회 (평상시에는 추가 비용 없음)
+    is_admin = False
+    if x_profile:
+        user = await deps.user_from_token(db, token)
+        is_admin = bool(user and user.is_superuser)
+    profile_mode = profiling.resolve_mode(x_profile, is_admin)
+    deadline_seconds = request.deadline_ms / 1000 if request.deadline_ms else None
+
     service = ChatService(db)
-    answer, sources_data = await service.get_answer(request.query, k)
+    async with profiling.profile_request(profile_mode, "chat.query", query=request.query, top_k=k) as profiler:
+        answer, sources_data = await service.get_answer(
+            request.query, k, deadline_seconds=deadline_seconds, filters=request.resolved_filters(),
+            ef_search=request.ef_search,
+        )
+    if profiler is not None and profiler.enabled:
+        response.headers["X-Profile-Id"] = profiler.profile_id
     
     # Convert dict sources to Pydantic models
     sources = []
@@ -32,10 +51,11 @@ async def chat_query(
             document_id=s['document_id'],
             filename=s['filename'],
             content=s['content'],
-            score=s.get('score', 0.0)
+            score=s.get('score', 0.0),
+            page_number=s.get('page_number')
         ))
 
-    return ChatResponse(answer=answer, sources=sources)
+    return ChatResponse(answer=answer, sources=sources, metadata=service.metadata)
 
 
 # --- OpenAI Compatible API (For Open WebUI) ---
@@ -52,7 +72,8 @@ class OpenAIRequest(BaseModel):
 @router.post("/completions") # Full path: /api/v1/chat/completions
 async def openai_chat_completion(
     request: OpenAIRequest,
-    db: AsyncSession = Depends(get_db)
+    _admission: None = Depends(deps.admit_chat_request),
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     # 1. Extract latest user query
     last_user_message = next((m.content for m in reversed(request.messages) if m.role == "user"), None)
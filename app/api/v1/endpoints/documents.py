@@ -1,22 +1,53 @@
 import uuid
 import os
-import shutil
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from typing import List
 
 from app.core.database import get_db
 from app.core.config import settings
-from app.services.ingest_service import IngestService
-from app.schemas.document import DocumentResponse
+from app.services.document_service import DocumentService
+from app.services.upload_service import UploadError, UploadService, find_indexed
+from app.schemas.document import (
+    BulkDeleteRequest, CrawlRequest, DocumentResponse, ResumableUploadCreate, TaskStatusResponse
+)
 from app.models.document import Document
 from app.api import deps
 from app.models.user import User
-from app.worker import process_document_task
+from app.core.tasks import send_task, task_result
 
 router = APIRouter()
 
+async def _enqueue_ingest(db: AsyncSession, file_path: str, size: int, content_hash: str) -> dict:
+    """같은 파일명·같은 내용이 이미 적재되어 있으면 건너뛰고, 아니면 적재 태스크를 등록합니다."""
+    filename = os.path.basename(file_path)
+    existing = await find_indexed(db, content_hash, filename)
+    if existing is not None:
+        return {
+            "filename": filename,
+            "message": "Identical file is already indexed. Processing skipped.",
+            "skipped": True,
+            "document_id": str(existing.id),
+            "content_hash": content_hash,
+        }
+
+    # Trigger Ingestion Task (Async)
+    source_type = os.path.splitext(filename)[1][1:]
+    task = send_task("process_document_task", file_path, source_type, content_hash)
+    return {
+        "filename": filename,
+        "message": "Upload successful. Processing started in background.",
+        "task_id": str(task.id),
+        "skipped": False,
+        "size": size,
+        "content_hash": content_hash,
+    }
+
+def _upload_http_error(e: UploadError) -> HTTPException:
+    headers = {"Upload-Offset": str(e.offset)} if e.offset is not None else None
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
+
 @router.post("/upload", status_code=202)
 async def upload_document(
     file: UploadFile = File(...),
@@ -25,35 +56,91 @@ async def upload_document(
 ):
     """
     Upload a document and process it asynchronously via Celery.
+    파일은 조각 단위로 비동기 저장되며 저장 중 SHA-256을 계산합니다.
+    같은 파일명·같은 내용이 이미 적재되어 있으면 적재 태스크를 건너뜁니다 (skipped=true).
     Requires authentication.
     """
-    # Ensure upload directory exists
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    
-    file_path = os.path.join(settings.UPLOAD_DIR, file.filename)
-    
-    # Save file to disk
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        file_path, size, content_hash = await UploadService().save_stream(file, file.filename)
+    except UploadError as e:
+        raise _upload_http_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File save failed: {str(e)}")
 
-    # Trigger Ingestion Task (Async)
-    source_type = os.path.splitext(file.filename)[1][1:]
-    task = process_document_task.delay(file_path, source_type)
-    
-    return {
-        "filename": file.filename, 
-        "message": "Upload successful. Processing started in background.", 
-        "task_id": str(task.id)
-    }
+    return await _enqueue_ingest(db, file_path, size, content_hash)
+
+# --- Resumable Upload (대용량 파일) ---
+
+@router.post("/uploads", status_code=201)
+async def create_resumable_upload(
+    request: ResumableUploadCreate,
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    재개 가능한 업로드 세션 생성 → upload_id, 권장 조각 크기(chunk_size).
+    이후 PUT /documents/uploads/{upload_id}?offset=N 으로 조각을 순서대로 보내고 /complete로 마칩니다.
+    """
+    try:
+        return await UploadService().create(request.filename, request.size)
+    except UploadError as e:
+        raise _upload_http_error(e)
+
+@router.get("/uploads/{upload_id}")
+async def get_resumable_upload(
+    upload_id: str,
+    current_user: User = Depends(deps.get_current_user)
+):
+    """현재까지 받은 크기(offset). 연결이 끊긴 뒤에는 이 위치부터 다시 보냅니다."""
+    try:
+        return await UploadService().status(upload_id)
+    except UploadError as e:
+        raise _upload_http_error(e)
+
+@router.put("/uploads/{upload_id}")
+async def append_resumable_upload(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    요청 본문(raw bytes)을 offset 위치부터 이어 씁니다.
+    offset이 현재 크기와 다르면 409와 함께 Upload-Offset 헤더로 현재 크기를 알려줍니다.
+    """
+    try:
+        return await UploadService().append(upload_id, offset, request.stream())
+    except UploadError as e:
+        raise _upload_http_error(e)
+
+@router.post("/uploads/{upload_id}/complete", status_code=202)
+async def complete_resumable_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """선언한 크기를 모두 받았으면 UPLOAD_DIR로 옮기고 적재합니다 (같은 내용이 이미 적재되어 있으면 건너뜀)."""
+    try:
+        file_path, size, content_hash = await UploadService().complete(upload_id)
+    except UploadError as e:
+        raise _upload_http_error(e)
+    return await _enqueue_ingest(db, file_path, size, content_hash)
+
+@router.delete("/uploads/{upload_id}")
+async def abort_resumable_upload(
+    upload_id: str,
+    current_user: User = Depends(deps.get_current_user)
+):
+    try:
+        await UploadService().abort(upload_id)
+    except UploadError as e:
+        raise _upload_http_error(e)
+    return {"message": "Upload aborted"}
 
 @router.get("/", response_model=List[DocumentResponse])
 async def list_documents(
     skip: int = 0, 
     limit: int = 100, 
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     stmt = select(Document).offset(skip).limit(limit).order_by(Document.created_at.desc())
     result = await db.execute(stmt)
@@ -70,24 +157,62 @@ async def delete_document(
     Delete a document and its embeddings.
     Requires authentication.
     """
-    stmt = select(Document).where(Document.id == document_id)
-    result = await db.execute(stmt)
-    document = result.scalars().first()
-    
-    if not document:
+    # set-based DELETE (청크는 ON DELETE CASCADE로 삭제, ORM으로 청크를 로드하지 않음)
+    # 커밋 후 샤드 사본/local 벡터 인덱스도 정리
+    deleted = await DocumentService(db).delete_documents([document_id])
+    if not deleted:
         raise HTTPException(status_code=404, detail="Document not found")
-        
-    # Delete from disk if exists
-    # Note: Filename might be shared or not, depending on implementation. 
-    # Current implementation overwrites on filename, so deleting might be tricky if multiple docs share file?
-    # But schema says id is PK.
-    # Safe to delete DB record. File deletion is optional or handled by a separate cleanup.
-    # For now, let's delete the DB record which cascades to embeddings if configured, or manual delete.
-    
-    # IngestService has _delete_existing_document but that's by filename.
-    # Let's simple delete from DB.
-    
-    await db.delete(document)
-    await db.commit()
-    
-    return {"message": "Document deleted successfully"}
\ No newline at end of file
+
+    return {"message": "Document deleted successfully"}
+
+@router.post("/bulk-delete", status_code=202)
+async def bulk_delete_documents(
+    request: BulkDeleteRequest,
+    current_user: User = Depends(deps.get_current_active_superuser)
+):
+    """
+    id 목록 / category / 파일명 패턴(AND)에 맞는 문서를 백그라운드에서 배치 단위로 삭제합니다.
+    진행률은 GET /documents/tasks/{task_id}로 확인합니다.
+    Requires superuser.
+    """
+    task = send_task(
+        "bulk_delete_documents_task",
+        [str(document_id) for document_id in request.document_ids] if request.document_ids else None,
+        request.category,
+        request.filename_pattern,
+        request.batch_size,
+    )
+    return {"task_id": str(task.id), "message": "Bulk delete started in background."}
+
+@router.post("/crawl", status_code=202)
+async def crawl_web_sources(
+    request: CrawlRequest,
+    current_user: User = Depends(deps.get_current_active_superuser)
+):
+    """
+    시드 URL / sitemap을 백그라운드에서 크롤링해 적재합니다 (문서 이름 = URL).
+    재크롤링 시 ETag/Last-Modified 조건부 요청으로 변경되지 않은 페이지는 다시 받거나 임베딩하지 않습니다.
+    진행률은 GET /documents/tasks/{task_id}로 확인합니다.
+    Requires superuser.
+    """
+    task = send_task("crawl_web_task", request.seeds, request.sitemaps, request.force)
+    return {"task_id": str(task.id), "message": "Crawl started in background."}
+
+@router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
+async def get_task_status(
+    task_id: str,
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    업로드/일괄 삭제 등 백그라운드 태스크 상태 (CELERY_RESULT_BACKEND 필요).
+    알 수 없는 task_id도 PENDING으로 표시됩니다.
+    """
+    result = task_result(task_id)
+    status = TaskStatusResponse(task_id=task_id, state=result.state)
+    if result.state == "PROGRESS":
+        status.progress = result.info
+    elif result.successful():
+        status.result = result.result
+    elif result.failed():
+        status.error = str(result.result)
+    return status
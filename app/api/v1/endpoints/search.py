@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.schemas.search import (
+    SearchRequest, SearchResponse, BatchSearchRequest, BatchSearchResponse
+)
+from app.services.search_service import SearchService
+
+router = APIRouter()
+
+@router.post("", response_model=SearchResponse)
+async def search(
+    request: SearchRequest,
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    """
+    Retrieval-only 하이브리드 검색.
+    쿼리 확장/답변 생성 없이 RRF + 재순위화된 청크를 레그별 점수와 함께 반환합니다.
+    """
+    service = SearchService(db)
+    return await service.search(
+        request.query,
+        top_k=request.top_k,
+        offset=request.offset,
+        filters=request.filters,
+        rerank=request.rerank,
+        ef_search=request.ef_search,
+    )
+
+@router.post("/batch", response_model=BatchSearchResponse)
+async def search_batch(
+    request: BatchSearchRequest,
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    """
+    여러 쿼리를 한 번에 검색합니다.
+    임베딩은 Provider 호출 1회, DB 조회는 쿼리 수와 무관하게 고정된 횟수로 처리됩니다.
+    """
+    service = SearchService(db)
+    results = await service.search_batch(
+        request.queries,
+        top_k=request.top_k,
+        filters=request.filters,
+        rerank=request.rerank,
+        ef_search=request.ef_search,
+    )
+    return BatchSearchResponse(results=results)
@@ -0,0 +1,256 @@
+"""
+대량 적재 CLI (디렉터리 트리 / 매니페스트)
+
+    python -m app.bulk_ingest /data/docs
+    python -m app.bulk_ingest /data/docs --workers 8 --concurrency 4 --embed-batch 100 --embed-concurrency 8
+    python -m app.bulk_ingest --manifest files.txt --checkpoint /data/ingest.ckpt.jsonl
+
+- 파싱(PDF/HWP 등, CPU bound)과 SHA-256 계산은 프로세스 풀(--workers, 기본 CPU 수)에서 실행합니다.
+- 임베딩은 청크 --embed-batch개를 Provider 호출 1회로 묶고, 전체 동시 호출 수를 --embed-concurrency로 제한합니다
+  (Provider 쿼터에 맞춰 조정). 문서 단위 DB 적재는 --concurrency개까지 동시에 진행하며 각자 ingest 풀 세션을 씁니다.
+- 파일 하나가 끝날 때마다 체크포인트(JSONL)에 결과를 추가합니다. 중단 후 같은 명령을 다시 실행하면
+  같은 내용(SHA-256)으로 완료된 파일은 파싱 없이 건너뛰고, 실패했거나 내용이 바뀐 파일만 다시 적재합니다.
+- 문서 이름은 API 업로드와 같이 파일명(basename)이며 같은 이름이면 덮어씁니다.
+  하위 디렉터리에 같은 파일명이 있으면 --path-names로 루트 기준 상대 경로를 이름으로 씁니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = {".hwp", ".pdf", ".docx", ".xlsx", ".xls", ".csv", ".txt", ".md"}
+DEFAULT_CHECKPOINT = "bulk_ingest.ckpt.jsonl"
+
+
+def discover_files(root: str) -> Iterator[str]:
+    """root 아래 지원 확장자 파일 (정렬된 순서, 숨김 디렉터리/파일 제외 — 예: UPLOAD_DIR/.uploads)"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if not name.startswith(".") and os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield os.path.join(dirpath, name)
+
+
+def read_manifest(path: str) -> List[str]:
+    """한 줄에 경로 하나 (빈 줄과 #으로 시작하는 줄은 무시)"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+class Checkpoint:
+    """
+    파일별 적재 결과를 한 줄씩 추가하는 JSONL 로그: {"path", "sha256", "status": done|failed, "error"}
+    같은 경로가 여러 번 기록되면 마지막 줄이 유효합니다. 줄 단위 append라 중간에 죽어도 앞 기록은 온전합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 기록 도중 중단된 마지막 줄
+                    self.entries[entry["path"]] = entry
+        truncated = os.path.exists(path) and os.path.getsize(path) > 0 and not _ends_with_newline(path)
+        self._file = open(path, "a", encoding="utf-8")
+        if truncated:
+            self._file.write("\n")  # 잘린 마지막 줄과 다음 기록이 붙지 않도록
+
+    def done_hash(self, path: str) -> Optional[str]:
+        entry = self.entries.get(path)
+        return entry["sha256"] if entry and entry["status"] == "done" else None
+
+    def record(self, path: str, sha256: Optional[str], status: str, error: Optional[str] = None) -> None:
+        entry = {"path": path, "sha256": sha256, "status": status, "error": error, "at": time.time()}
+        self.entries[path] = entry
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class Progress:
+    """처리량(files/s, MB/s)과 남은 바이트 기준 ETA"""
+
+    def __init__(self, total_files: int, total_bytes: int):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.counts = {"done": 0, "skipped": 0, "failed": 0}
+        self.bytes_done = 0
+        self.bytes_processed = 0  # 실제로 파싱/적재한 바이트 (건너뛴 파일 제외 → 처리 속도)
+        self.started = time.monotonic()
+
+    def update(self, status: str, size: int) -> None:
+        self.counts[status] += 1
+        self.bytes_done += size
+        if status != "skipped":
+            self.bytes_processed += size
+
+    @property
+    def files_done(self) -> int:
+        return sum(self.counts.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rate = self.bytes_processed / elapsed
+        remaining = self.total_bytes - self.bytes_done
+        return {
+            **self.counts,
+            "files": self.files_done,
+            "total_files": self.total_files,
+            "elapsed_seconds": round(elapsed, 1),
+            "files_per_second": round((self.counts["done"] + self.counts["failed"]) / elapsed, 2),
+            "mb_per_second": round(rate / 1e6, 2),
+            "eta_seconds": round(remaining / rate) if rate > 0 else None,
+        }
+
+    def line(self) -> str:
+        s = self.snapshot()
+        eta = "?" if s["eta_seconds"] is None else f"{s['eta_seconds'] // 60}m{s['eta_seconds'] % 60:02d}s"
+        return (
+            f"{s['files']}/{s['total_files']} files (done {s['done']}, skipped {s['skipped']}, failed {s['failed']}) "
+            f"| {s['files_per_second']} files/s, {s['mb_per_second']} MB/s | ETA {eta}"
+        )
+
+
+def parse_source(
+    path: str, done_hash: Optional[str] = None
+) -> Tuple[str, Optional[str], Optional[List[str]], Optional[List[int]]]:
+    """
+    (프로세스 풀에서 실행) → (sha256, 본문, 청크, 청크별 페이지 번호). 체크포인트의 해시와 같으면 파싱하지 않고 본문 None.
+    표 형식은 행 묶음 청크, PDF는 페이지별로 분할한 청크를 함께 반환하고, 그 외는 청크 None (적재 시 텍스트 분할)
+    """
+    from app.services.upload_service import file_sha256
+    from app.utils.parsers import TABULAR_EXTENSIONS, parse_file, parse_pdf_pages, parse_table_chunks, split_pages
+
+    content_hash = file_sha256(path)
+    if content_hash == done_hash:
+        return content_hash, None, None, None
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        # 이미 풀의 자식 프로세스이므로 페이지 추출은 순차 (페이지 캐시는 그대로 사용)
+        pages = parse_pdf_pages(path)
+        chunks, page_numbers = split_pages(pages)
+        return content_hash, "\n\n".join(pages), chunks, page_numbers
+    if ext in TABULAR_EXTENSIONS:
+        chunks = parse_table_chunks(path)
+        return content_hash, "\n\n".join(chunks), chunks, None
+    return content_hash, parse_file(path), None, None
+
+
+def batched_embedder(concurrency: int):
+    """IngestService embedder: 배치 하나를 Provider 호출 1회로 임베딩 (전체 동시 호출 수 제한)"""
+    from app.core.exceptions import AppError
+    from app.services.vector_service import VectorService
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def embed(texts: List[str]) -> List[List[float]]:
+        async with semaphore:
+            vectors = await VectorService.create_embeddings(texts)
+        if len(vectors) != len(texts):
+            # 일부만 적재되지 않도록 문서 전체를 실패 처리 → 체크포인트에 failed로 남아 재실행 시 다시 적재
+            raise AppError(f"Batch embedding failed ({len(vectors)}/{len(texts)} vectors)")
+        return vectors
+
+    return embed
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.core.database import IngestSessionLocal, all_engines
+    from app.core.logging import logger
+    from app.services.ingest_service import IngestService
+
+    if args.manifest:
+        paths = read_manifest(args.manifest)
+        base = os.path.dirname(os.path.abspath(args.manifest))
+    else:
+        paths = list(discover_files(args.root))
+        base = args.root
+    sizes = {path: os.path.getsize(path) if os.path.exists(path) else 0 for path in paths}
+    checkpoint = Checkpoint(args.checkpoint)
+    progress = Progress(len(paths), sum(sizes.values()))
+    embedder = batched_embedder(args.embed_concurrency)
+    ingest_slots = asyncio.Semaphore(args.concurrency)
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    loop = asyncio.get_running_loop()
+    logger.info(f"📦 Bulk ingest: {len(paths)} files, {progress.total_bytes / 1e6:.1f} MB")
+
+    async def consume(pool: ProcessPoolExecutor) -> None:
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            content_hash = None
+            try:
+                content_hash, content, chunks, page_numbers = await loop.run_in_executor(
+                    pool, parse_source, path, checkpoint.done_hash(path)
+                )
+                if content is None:
+                    progress.update("skipped", sizes[path])
+                    continue
+                filename = os.path.relpath(path, base) if args.path_names else os.path.basename(path)
+                async with ingest_slots, IngestSessionLocal() as db:
+                    service = IngestService(db, embedder=embedder, embed_batch_size=args.embed_batch)
+                    await service.process_document(
+                        path, "file", content_hash, content=content, filename=filename,
+                        chunks=chunks, page_numbers=page_numbers
+                    )
+                checkpoint.record(path, content_hash, "done")
+                progress.update("done", sizes[path])
+            except Exception as e:
+                checkpoint.record(path, content_hash, "failed", error=str(e))
+                progress.update("failed", sizes[path])
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(args.report_interval)
+            logger.info(f"📦 {progress.line()}")
+
+    reporter = asyncio.create_task(report())
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            # 파싱 중인 파일 workers개 + 적재 대기/진행 중인 파일 concurrency개까지 본문을 메모리에 유지
+            await asyncio.gather(*(consume(pool) for _ in range(args.workers + args.concurrency)))
+    finally:
+        reporter.cancel()
+        checkpoint.close()
+        for engine in all_engines():
+            await engine.dispose()
+    logger.info(f"📦 {progress.line()}")
+    return progress.snapshot()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel bulk ingestion with checkpointing")
+    parser.add_argument("root", nargs="?", help="directory to ingest recursively")
+    parser.add_argument("--manifest", help="file with one path per line (instead of root)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="JSONL checkpoint; rerun to resume")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="documents written to the DB concurrently")
+    parser.add_argument("--embed-batch", type=int, default=100, help="chunks per embedding request")
+    parser.add_argument("--embed-concurrency", type=int, default=4, help="concurrent embedding requests")
+    parser.add_argument("--path-names", action="store_true", help="name documents by relative path")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="seconds between progress lines")
+    args = parser.parse_args()
+    if bool(args.root) == bool(args.manifest):
+        parser.error("give either a root directory or --manifest")
+    result = asyncio.run(run(args))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,145 @@
+"""
+Admission Control / Load Shedding (워커 프로세스 단위)
+
+동시에 실행되는 chat 파이프라인 수를 제한하고, 초과 요청은 짧은 대기열에서 기다리게 합니다.
+- 대기열이 가득 차면 즉시 429 (Retry-After)
+- 대기 시간이 초과되면 503 (Retry-After)
+- 대기열은 사용자별로 분리되어 라운드로빈으로 슬롯을 배정합니다 (Fair Queuing).
+"""
+import asyncio
+import math
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(reason)
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        # user_key -> 대기 중인 Future 목록 (삽입 순서 = 라운드로빈 순서)
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.queued = 0
+        # Metrics
+        self.admitted_total = 0
+        self.rejected_total: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    async def acquire(self, user_key: str) -> None:
+        if self.active < self.max_concurrent and self.queued == 0:
+            self.active += 1
+            self.admitted_total += 1
+            return
+
+        if self.queued >= self.max_queue:
+            self.rejected_total["queue_full"] += 1
+            raise AdmissionRejected(429, "Too many concurrent requests, please retry later", self.retry_after)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user_key, deque()).append(future)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # 타임아웃 직전에 슬롯을 넘겨받은 경우: 그대로 진행
+                self.admitted_total += 1
+                return
+            self._remove_waiter(user_key, future)
+            self.rejected_total["queue_timeout"] += 1
+            raise AdmissionRejected(503, "Service is busy, request timed out in queue", self.retry_after)
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료 등으로 취소됨: 이미 슬롯을 받았다면 반납
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._remove_waiter(user_key, future)
+            raise
+        self.admitted_total += 1
+
+    def release(self) -> None:
+        """슬롯 반납. 대기자가 있으면 다음 사용자에게 슬롯을 그대로 넘깁니다."""
+        while self._waiters:
+            user_key, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            self.queued -= 1
+            # 라운드로빈: 방금 처리한 사용자는 대기열이 남아 있으면 맨 뒤로 보냄
+            if queue:
+                self._waiters.move_to_end(user_key)
+            else:
+                del self._waiters[user_key]
+            if not future.done():
+                future.set_result(True)
+                return
+        self.active -= 1
+
+    def _remove_waiter(self, user_key: str, future: asyncio.Future) -> None:
+        queue = self._waiters.get(user_key)
+        if queue and future in queue:
+            queue.remove(future)
+            self.queued -= 1
+            if not queue:
+                del self._waiters[user_key]
+
+    def metrics(self) -> Dict[str, object]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "queued_users": len(self._waiters),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted_total": self.admitted_total,
+            "rejected_total": dict(self.rejected_total),
+        }
+
+
+chat_admission = AdmissionController(
+    max_concurrent=settings.CHAT_MAX_CONCURRENT,
+    max_queue=settings.CHAT_MAX_QUEUE,
+    queue_timeout=settings.CHAT_QUEUE_TIMEOUT_SECONDS,
+)
+
+
+def render_prometheus(controller: Optional[AdmissionController] = None) -> str:
+    """Prometheus text exposition format (/metrics)"""
+    controller = controller or chat_admission
+    m = controller.metrics()
+    lines = [
+        "# HELP rag_chat_inflight Chat pipelines currently running in this worker.",
+        "# TYPE rag_chat_inflight gauge",
+        f"rag_chat_inflight {m['active']}",
+        "# HELP rag_chat_queue_depth Chat requests waiting for admission.",
+        "# TYPE rag_chat_queue_depth gauge",
+        f"rag_chat_queue_depth {m['queued']}",
+        "# HELP rag_chat_admitted_total Chat requests admitted.",
+        "# TYPE rag_chat_admitted_total counter",
+        f"rag_chat_admitted_total {m['admitted_total']}",
+        "# HELP rag_chat_rejected_total Chat requests rejected by admission control.",
+        "# TYPE rag_chat_rejected_total counter",
+    ]
+    for reason, count in m["rejected_total"].items():
+        lines.append(f'rag_chat_rejected_total{{reason="{reason}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def log_rejection(user_key: str, exc: AdmissionRejected) -> None:
+    logger.warning(f"🚦 Chat request rejected ({exc.status_code}) for {user_key}: {exc.reason}")
@@ -1,7 +1,10 @@
 from celery import Celery
+from celery.signals import before_task_publish, worker_process_init, worker_process_shutdown
 from app.core.config import settings
+from app.core import tracing
 
-celery_app = Celery("worker", broker=settings.CELERY_BROKER_URL)
+# result backend: 태스크 상태/진행률 조회(GET /documents/tasks/{task_id})용
+celery_app = Celery("worker", broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND)
 
 celery_app.conf.update(
     task_serializer="json",
@@ -9,7 +12,45 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Asia/Seoul",
     enable_utc=True,
+    result_expires=86400,
 )
 
 # app/worker.py에서 태스크를 찾도록 설정
 celery_app.conf.imports = ["app.worker"]
+
+TRACE_HEADERS = ("traceparent", "tracestate")
+
+
+@before_task_publish.connect
+def _inject_trace_headers(headers=None, **kwargs):
+    """태스크 발행 시 현재 trace context를 메시지 헤더에 실어 보냅니다."""
+    if headers is not None:
+        tracing.inject_context(headers)
+
+
+@worker_process_init.connect
+def _init_worker_tracing(**kwargs):
+    from app.core.database import all_engines
+    tracing.setup_tracing("rag-worker")
+    for engine in all_engines():
+        tracing.instrument_engine(engine)
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_tracing(**kwargs):
+    tracing.shutdown_tracing()
+
+
+def trace_carrier(request) -> dict:
+    """
+    Celery task.request에서 trace 헤더를 꺼냅니다.
+    메시지 프로토콜 2에서는 커스텀 헤더가 request 속성으로 병합되고,
+    일부 브로커에서는 request.headers에 남아 있으므로 둘 다 확인합니다.
+    """
+    carrier = {}
+    raw_headers = getattr(request, "headers", None) or {}
+    for key in TRACE_HEADERS:
+        value = raw_headers.get(key) or getattr(request, key, None)
+        if value:
+            carrier[key] = value
+    return carrier
@@ -23,6 +23,25 @@ class Settings(BaseSettings):
             path=self.DB_NAME,
         ))
 
+    # Connection Pools (프로세스당)
+    # 대화형(API) 풀과 적재(ingest) 풀을 분리해 대량 적재가 chat/search 커넥션을 점유하지 않도록 함
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 5.0  # 커넥션 대기 상한(초). 초과하면 오래 기다리지 않고 실패
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0이면 서버 기본값
+    INGEST_DB_POOL_SIZE: int = 4
+    INGEST_DB_MAX_OVERFLOW: int = 2
+    INGEST_DB_POOL_TIMEOUT: float = 60.0
+    INGEST_DB_STATEMENT_TIMEOUT_MS: int = 0
+    # 읽기 복제본: "host[:port],host[:port]" (사용자/비밀번호/DB명은 primary와 동일). 비어 있으면 primary에서 읽음
+    DB_READ_REPLICAS: str = ""
+    DB_REPLICA_MAX_LAG_SECONDS: float = 10.0  # 복제 지연이 이보다 크면 primary로 fallback
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    # 벡터 샤드: "host[:port][/dbname],..." — 문서 사본과 청크를 document_id 해시로 나눠 저장하고 검색은 전 샤드로 fan-out
+    # 비어 있으면 primary 단일 DB. 샤드 수를 바꾸면 재적재가 필요합니다.
+    VECTOR_SHARDS: str = ""
+    SHARD_SEARCH_TIMEOUT_SECONDS: float = 3.0  # 초과하거나 실패한 샤드는 제외하고 나머지로 응답 (부분 결과)
+
     # AI Providers
     GOOGLE_API_KEY: str
     OPENAI_API_KEY: Optional[str] = None
@@ -35,9 +54,92 @@ class Settings(BaseSettings):
 
     # App Config
     UPLOAD_DIR: str = "docs"
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 업로드 스트리밍 쓰기 단위 (bytes)
+    # 재개 업로드: 클라이언트에 권장하는 조각 크기, 갱신 없는 미완료 업로드 보관 시간
+    RESUMABLE_UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024
+    RESUMABLE_UPLOAD_TTL_HOURS: int = 24
+    # 웹 크롤링 (POST /documents/crawl): 전체/호스트별 동시 요청 수, 같은 호스트 요청 시작 간격
+    CRAWL_CONCURRENCY: int = 16
+    CRAWL_PER_HOST_CONCURRENCY: int = 2
+    CRAWL_DELAY_SECONDS: float = 0.5
+    CRAWL_TIMEOUT_SECONDS: float = 10.0
+    CRAWL_MAX_PAGES: int = 1000
+    CRAWL_MAX_BYTES: int = 10 * 1024 * 1024  # 페이지 본문 상한 (초과 시 실패 처리)
+    CRAWL_USER_AGENT: str = "enterprise-rag-core-crawler/1.0"
+    # PDF 페이지 병렬 추출: 프로세스 수(0이면 CPU 수), 작업 하나의 페이지 수, 병렬화할 최소 페이지 수
+    PDF_EXTRACT_WORKERS: int = 0
+    PDF_PAGES_PER_TASK: int = 16
+    PDF_PARALLEL_MIN_PAGES: int = 32
+    # 페이지 콘텐츠 스트림 + 리소스 해시 → 추출 텍스트 캐시 (빈 문자열이면 사용 안 함)
+    PDF_PAGE_CACHE_DIR: str = "pdf_page_cache"
+    # 캐시 크기 상한 (넘으면 오래 쓰이지 않은 페이지부터 삭제, 0이면 무제한) / 정리 주기
+    PDF_PAGE_CACHE_MAX_MB: int = 1024
+    PDF_PAGE_CACHE_PRUNE_INTERVAL_SECONDS: int = 3600
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
 
+    # Chat Latency Budget (0이면 마감 시간 없음)
+    # 각 단계는 남은 시간이 아래 값보다 작으면 건너뛰거나 축소됩니다.
+    CHAT_DEADLINE_SECONDS: float = 30.0
+    CHAT_BUDGET_EXPANSION_MIN_SECONDS: float = 8.0
+    CHAT_BUDGET_KEYWORD_MIN_SECONDS: float = 5.0
+    CHAT_BUDGET_RERANK_MIN_SECONDS: float = 4.0
+    CHAT_BUDGET_FULL_K_MIN_SECONDS: float = 3.0
+    CHAT_BUDGET_GENERATION_MIN_SECONDS: float = 1.5
+
+    # Admission Control (/chat 엔드포인트, 워커 프로세스당)
+    CHAT_MAX_CONCURRENT: int = 16  # 0이면 비활성화
+    CHAT_MAX_QUEUE: int = 64
+    CHAT_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    # x-openwebui-user-id 헤더를 신뢰할 프록시(Open WebUI 서버) IP: "10.0.0.5,10.0.0.6"
+    # 비어 있으면 헤더를 무시하고 인증 사용자 또는 클라이언트 IP 단위로 대기열 구성
+    CHAT_TRUSTED_PROXIES: str = ""
+    # GET /metrics (Prometheus). 기본 비활성화, METRICS_TOKEN을 지정하면 "Authorization: Bearer <token>" 필요
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: Optional[str] = None
+
+    # Vector Search (pgvector HNSW)
+    # 필터가 있는 검색에서 iterative index scan 사용 (pgvector 0.8+ 필요, 이전 버전은 "off")
+    HNSW_ITERATIVE_SCAN: Literal["off", "strict_order", "relaxed_order"] = "relaxed_order"
+    HNSW_MAX_SCAN_TUPLES: int = 20000
+    # 인덱스 빌드 파라미터 (변경 후 /admin/indexes/rebuild 또는 app.manage_indexes로 재생성)
+    HNSW_M: int = 16
+    HNSW_EF_CONSTRUCTION: int = 64
+    # 검색 시 후보 리스트 크기 (None이면 서버 기본값 40). 요청별 ef_search로 덮어쓸 수 있음
+    HNSW_EF_SEARCH: Optional[int] = None
+    HNSW_BUILD_MAINTENANCE_WORK_MEM: str = "1GB"
+    HNSW_BUILD_PARALLEL_WORKERS: int = 2
+    HNSW_PREWARM_ON_STARTUP: bool = False  # API 기동 시 pg_prewarm으로 인덱스를 shared_buffers에 적재
+    # 벡터 저장 방식: vector(float32) | halfvec(float16, 테이블/인덱스 약 1/2, pgvector 0.7+)
+    # halfvec 전환 시 alembic 마이그레이션으로 기존 행을 embedding_half에 백필한 뒤 변경하세요.
+    VECTOR_STORAGE: Literal["vector", "halfvec"] = "vector"
+    # 벡터 검색 모드
+    # - float: float32 HNSW 단일 단계
+    # - binary_rescore: 이진 양자화(bit) HNSW에서 해밍 거리로 넓은 후보 검색 → float 벡터로 정확한 L2 재채점
+    #   (pgvector 0.7+, 1단계 인덱스 크기 약 1/32)
+    # - matryoshka_rescore: 앞 MATRYOSHKA_DIM 차원만 잘라 재정규화한 벡터의 HNSW로 후보 검색 → 전체 차원 L2 재채점
+    VECTOR_SEARCH_MODE: Literal["float", "binary_rescore", "matryoshka_rescore"] = "float"
+    BQ_RESCORE_MULTIPLIER: int = 4  # 1단계 후보 수 = 요청 후보 수 * BQ_RESCORE_MULTIPLIER
+    # embedding_short 컬럼 차원 (변경 시 컬럼 재생성 + 백필 마이그레이션 필요)
+    MATRYOSHKA_DIM: int = 256
+    MATRYOSHKA_RESCORE_MULTIPLIER: int = 3
+    # 벡터 인덱스 백엔드: pgvector(운영) | local(프로세스 내 memmap 인덱스, numpy 필요)
+    VECTOR_INDEX_BACKEND: Literal["pgvector", "local"] = "pgvector"
+    LOCAL_VECTOR_INDEX_DIR: str = "vector_index"
+    # local 백엔드 검색 방식: exact(NumPy 전수 검색) | hnsw(hnswlib 필요)
+    LOCAL_VECTOR_INDEX_MODE: Literal["exact", "hnsw"] = "exact"
+    # 2단계 검색: 문서 요약 벡터로 상위 TWO_STAGE_TOP_DOCUMENTS개 문서를 고른 뒤 그 문서의 청크만 검색
+    TWO_STAGE_RETRIEVAL: bool = False
+    TWO_STAGE_TOP_DOCUMENTS: int = 20
+    # embeddings 파티셔닝: 0이면 일반 테이블, N이면 hash(document_id) N개 파티션 (변경 시 마이그레이션 재적용 필요)
+    EMBEDDINGS_PARTITIONS: int = 0
+    # 문서 필터가 없는 검색을 파티션별 쿼리로 나눠 병렬 실행 (파티션마다 별도 커넥션)
+    PARTITION_PARALLEL_SEARCH: bool = True
+    PARTITION_SEARCH_CONCURRENCY: int = 4
+    # 근사 중복 청크: off | flag(임베딩은 그대로, duplicate_of만 기록) | link(원본 청크 벡터 재사용, 임베딩 호출 생략)
+    NEAR_DUP_MODE: Literal["off", "flag", "link"] = "flag"
+    NEAR_DUP_MAX_DISTANCE: int = 3  # SimHash 해밍 거리 (구간 수 4보다 작아야 후보 검색에서 누락이 없음)
+
     # Security
     SECRET_KEY: str = "your-secret-key-should-be-changed-in-production"
     ALGORITHM: str = "HS256"
@@ -47,4 +149,16 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
 
+    # Tracing (OpenTelemetry)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: Literal["otlp", "file", "console"] = "otlp"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+
+    # Profiling (관리자 X-Profile 헤더 또는 1/N 샘플링)
+    PROFILING_SAMPLE_RATE: int = 0  # 0이면 샘플링 비활성화
+    PROFILING_DEFAULT_MODE: Literal["wall", "cpu"] = "wall"
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_STORED: int = 200
+
 settings = Settings()
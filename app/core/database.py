@@ -1,15 +1,84 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, List, Literal
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from app.core.config import settings
+from app.core.db_routing import ReplicaRouter, ShardRouter
 
-# 비동기 엔진 생성
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=False, # 운영 환경에서는 False 권장
-    future=True,
-    pool_pre_ping=True
+# 세션 역할
+# - primary: 쓰기/관리 작업 (기본, get_db)
+# - read: 검색/채팅 등 읽기 전용 → 지연이 작은 읽기 복제본, 없으면 primary
+# - ingest: 문서 적재 등 긴 트랜잭션 → primary의 별도 풀 (대화형 요청의 커넥션을 점유하지 않도록)
+SessionRole = Literal["primary", "read", "ingest"]
+
+
+def _create_engine(url, application_name: str, pool_size: int, max_overflow: int,
+                   pool_timeout: float, statement_timeout_ms: int) -> AsyncEngine:
+    server_settings = {"application_name": application_name}
+    if statement_timeout_ms > 0:
+        server_settings["statement_timeout"] = str(statement_timeout_ms)
+    return create_async_engine(
+        url,
+        echo=False, # 운영 환경에서는 False 권장
+        future=True,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        connect_args={"server_settings": server_settings},
+    )
+
+
+def _database_urls(spec: str) -> List:
+    """"host[:port][/dbname],..."을 primary와 같은 인증 정보의 URL 목록으로 변환 (dbname 생략 시 primary와 동일)"""
+    primary_url = make_url(settings.SQLALCHEMY_DATABASE_URI)
+    urls = []
+    for entry in filter(None, (e.strip() for e in spec.split(","))):
+        address, _, database = entry.partition("/")
+        host, _, port = address.partition(":")
+        urls.append(primary_url.set(
+            host=host, port=int(port) if port else primary_url.port, database=database or primary_url.database
+        ))
+    return urls
+
+
+# 비동기 엔진 생성 (대화형 요청용 primary)
+engine = _create_engine(
+    settings.SQLALCHEMY_DATABASE_URI, "rag-api",
+    settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT, settings.DB_STATEMENT_TIMEOUT_MS,
 )
 
+# 적재용 primary 풀 (같은 DB, 별도 크기/타임아웃)
+ingest_engine = _create_engine(
+    settings.SQLALCHEMY_DATABASE_URI, "rag-ingest",
+    settings.INGEST_DB_POOL_SIZE, settings.INGEST_DB_MAX_OVERFLOW, settings.INGEST_DB_POOL_TIMEOUT,
+    settings.INGEST_DB_STATEMENT_TIMEOUT_MS,
+)
+
+# 읽기 복제본 (복제본마다 대화형 풀 설정 사용)
+replica_engines = [
+    _create_engine(
+        url, "rag-read",
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT, settings.DB_STATEMENT_TIMEOUT_MS,
+    )
+    for url in _database_urls(settings.DB_READ_REPLICAS)
+]
+
+replica_router = ReplicaRouter(
+    engine, replica_engines,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+)
+
+# 벡터 샤드 (문서 사본 + 청크를 document_id 해시로 분산 저장)
+shard_engines = [
+    _create_engine(
+        url, f"rag-shard{i}",
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT, settings.DB_STATEMENT_TIMEOUT_MS,
+    )
+    for i, url in enumerate(_database_urls(settings.VECTOR_SHARDS))
+]
+
 # 비동기 세션 팩토리
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -18,6 +87,33 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+IngestSessionLocal = async_sessionmaker(
+    bind=ingest_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
+shard_router = ShardRouter(shard_engines, AsyncSessionLocal)
+
+
+def all_engines() -> List[AsyncEngine]:
+    return [engine, ingest_engine, *replica_engines, *shard_engines]
+
+
+@asynccontextmanager
+async def session_scope(role: SessionRole = "primary") -> AsyncIterator[AsyncSession]:
+    """역할에 맞는 엔진에 바인딩된 세션"""
+    if role == "ingest":
+        session = IngestSessionLocal()
+    elif role == "read":
+        session = AsyncSessionLocal(bind=await replica_router.pick())
+    else:
+        session = AsyncSessionLocal()
+    async with session:
+        yield session
+
+
 # Dependency Injection용 함수
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
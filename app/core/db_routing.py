@@ -0,0 +1,127 @@
+"""
+읽기 복제본(read replica) / 벡터 샤드 라우팅
+
+검색/채팅처럼 읽기만 하는 세션은 복제본으로 보내 primary의 커넥션/IO를 적재 작업에 남겨 둡니다.
+- 복제본마다 주기적으로(DB_REPLICA_CHECK_INTERVAL_SECONDS) 복제 지연을 측정해 캐시합니다.
+  측정(연결 + 쿼리)은 PROBE_TIMEOUT_SECONDS 안에 끝나지 않으면 실패로 보며, 재측정은 백그라운드에서 진행되고
+  그동안 요청은 마지막 라우팅 결과를 사용합니다 (첫 측정만 기다림).
+- 지연이 DB_REPLICA_MAX_LAG_SECONDS 이하인 복제본만 라운드로빈으로 사용합니다.
+- 측정에 실패했거나(연결 불가) 모두 지연이 크면 primary로 fallback 합니다.
+
+벡터 샤드(VECTOR_SHARDS)는 document_id로 소유 샤드를 정합니다 (ShardRouter).
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.logging import logger
+
+PROBE_TIMEOUT_SECONDS = 1.0
+
+# WAL 수신/재생 위치가 같으면 따라잡은 상태(primary에 쓰기가 없으면 replay timestamp가 계속 과거로 남으므로 0 처리)
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaRouter:
+    def __init__(self, primary: Any, replicas: Sequence[Any], max_lag_seconds: float,
+                 check_interval: float):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        # 복제본별 마지막 측정값 (None = 측정 실패)
+        self.lags: List[Optional[float]] = [None] * len(self.replicas)
+        self._healthy: List[Any] = []
+        self._checked_at: Optional[float] = None
+        self._next = 0
+        self._refreshing: Optional[asyncio.Task] = None
+        # Metrics
+        self.routed_total: Dict[str, int] = {"replica": 0, "primary_fallback": 0}
+
+    async def pick(self) -> Any:
+        """읽기 세션에 사용할 엔진. 사용할 수 있는 복제본이 없으면 primary"""
+        if not self.replicas:
+            return self.primary
+        await self._maybe_refresh()
+        if not self._healthy:
+            self.routed_total["primary_fallback"] += 1
+            return self.primary
+        engine = self._healthy[self._next % len(self._healthy)]
+        self._next += 1
+        self.routed_total["replica"] += 1
+        return engine
+
+    async def _maybe_refresh(self) -> None:
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        # 동시에 들어온 요청들은 진행 중인 측정 하나를 공유
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self.refresh())
+        if self._checked_at is None:
+            # 아직 라우팅 결과가 없을 때만 기다림 (이후에는 마지막 결과로 계속 응답)
+            await asyncio.shield(self._refreshing)
+
+    async def refresh(self) -> None:
+        self.lags = list(await asyncio.gather(*(self.lag_seconds(r) for r in self.replicas)))
+        self._healthy = [
+            replica for replica, lag in zip(self.replicas, self.lags)
+            if lag is not None and lag <= self.max_lag_seconds
+        ]
+        self._checked_at = time.monotonic()
+        if len(self._healthy) < len(self.replicas):
+            logger.warning(f"Read replicas unavailable or lagging: lags={self.lags} "
+                           f"(max {self.max_lag_seconds}s), healthy={len(self._healthy)}/{len(self.replicas)}")
+
+    async def lag_seconds(self, replica: Any) -> Optional[float]:
+        # 연결(풀 대기 포함)까지 한 번의 타임아웃 안에서 측정 → 연결할 수 없는 복제본이 측정을 붙잡지 않음
+        async def probe() -> float:
+            async with replica.connect() as conn:
+                result = await conn.execute(REPLICA_LAG_SQL)
+                return float(result.scalar() or 0)
+
+        try:
+            return await asyncio.wait_for(probe(), PROBE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Replica lag check failed ({getattr(replica, 'url', replica)!r}): {e!r}")
+            return None
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "host": getattr(getattr(replica, "url", None), "host", str(replica)),
+                "lag_seconds": lag,
+                "healthy": replica in self._healthy,
+            }
+            for replica, lag in zip(self.replicas, self.lags)
+        ]
+
+
+class ShardRouter:
+    """document_id → 샤드 번호. 샤드 수가 바뀌면 소유 샤드가 달라지므로 재적재가 필요합니다."""
+
+    def __init__(self, engines: Sequence[Any], session_factory: Callable[..., Any]):
+        self.engines = list(engines)
+        self.session_factory = session_factory
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def shard_for(self, document_id: UUID) -> int:
+        # uuid4는 무작위이므로 정수값의 나머지로 고르게 분산되고, 프로세스와 무관하게 결정적
+        return document_id.int % len(self.engines)
+
+    def session(self, shard: int) -> Any:
+        return self.session_factory(bind=self.engines[shard])
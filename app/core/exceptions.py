@@ -22,7 +22,8 @@ async def app_exception_handler(request: Request, exc: AppError):
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"error": {"code": "HTTP_ERROR", "message": exc.detail}}
+        content={"error": {"code": "HTTP_ERROR", "message": exc.detail}},
+        headers=getattr(exc, "headers", None)  # Retry-After, WWW-Authenticate 등 유지
     )
 
 async def global_exception_handler(request: Request, exc: Exception):
@@ -0,0 +1,191 @@
+"""
+요청 단위 온디맨드 프로파일링
+
+관리자가 `X-Profile` 헤더를 붙이거나 PROFILING_SAMPLE_RATE(1/N) 샘플링에 걸린 요청만
+프로파일링합니다. 꺼져 있을 때는 헤더 확인 외에 어떤 훅도 설치하지 않습니다.
+
+- wall: pyinstrument (async_mode) → await 대기 시간까지 포함한 호출 트리 (요청의 async 컨텍스트만 기록)
+- cpu : cProfile (thread_time 타이머) → 함수별 CPU 시간
+  cProfile은 이벤트 루프 스레드 전체를 기록하므로, 프로파일링 중인 요청이 await로 멈춘 사이 같은 루프에서
+  실행된 다른 요청의 코드와 CPU 시간도 함께 집계됩니다 (요청 단위가 아닌 루프 단위 프로파일, scope=event_loop).
+  동시에 하나만 실행되며, 이미 실행 중이면 이번 요청은 프로파일링하지 않습니다.
+
+결과 파일 저장은 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+"""
+import asyncio
+import contextlib
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+
+PROFILE_MODES = ("wall", "cpu")
+
+_sample_counter = itertools.count(1)
+# cProfile은 스레드(이벤트 루프)당 하나만 활성화할 수 있음
+_cprofile_lock = asyncio.Lock()
+
+
+def resolve_mode(header_value: Optional[str], is_admin: bool) -> Optional[str]:
+    """
+    이번 요청을 프로파일링할지 결정하고 모드를 반환합니다. (None이면 프로파일링 안 함)
+    헤더는 관리자에게만 허용되며, 샘플링은 사용자와 무관하게 적용됩니다.
+    """
+    if header_value and is_admin:
+        value = header_value.strip().lower()
+        return value if value in PROFILE_MODES else "wall"
+    rate = settings.PROFILING_SAMPLE_RATE
+    if rate > 0 and next(_sample_counter) % rate == 0:
+        return settings.PROFILING_DEFAULT_MODE
+    return None
+
+
+class RequestProfiler:
+    """get_answer 전체 구간을 감싸는 프로파일러 (async with). 종료 시 결과를 PROFILING_DIR에 저장합니다."""
+
+    def __init__(self, mode: str, label: str, **meta: Any):
+        self.mode = mode
+        self.label = label
+        self.meta = meta
+        self.profile_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        # 다른 cProfile 프로파일이 실행 중이라 건너뛰었으면 False (X-Profile-Id를 돌려주지 않음)
+        self.enabled = False
+        self._profiler: Any = None
+        self._engine = "cprofile"
+
+    async def __aenter__(self) -> "RequestProfiler":
+        if self.mode == "wall":
+            try:
+                from pyinstrument import Profiler
+                self._profiler = Profiler(async_mode="enabled")
+                self._engine = "pyinstrument"
+            except ImportError:
+                logger.warning("⚠️ pyinstrument가 설치되어 있지 않아 cProfile로 대체합니다.")
+        if self._profiler is None:
+            if _cprofile_lock.locked():
+                logger.info(f"🧪 Another CPU profile is running, skipping profile for {self.label}")
+                return self
+            await _cprofile_lock.acquire()
+            self._profiler = cProfile.Profile(timer=time.thread_time)
+            self.meta["scope"] = "event_loop"
+
+        self.enabled = True
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        if self._engine == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if not self.enabled:
+            return
+        if self._engine == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+            _cprofile_lock.release()
+        wall_ms = (time.perf_counter() - self._wall_start) * 1000
+        cpu_ms = (time.thread_time() - self._cpu_start) * 1000
+
+        try:
+            await asyncio.to_thread(self._save, wall_ms, cpu_ms, exc_type is not None)
+        except Exception as e:
+            # 프로파일 저장 실패가 사용자 요청을 실패시키면 안 됨
+            logger.warning(f"⚠️ Failed to store profile {self.profile_id}: {e}")
+
+    def _save(self, wall_ms: float, cpu_ms: float, failed: bool) -> None:
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        base = os.path.join(settings.PROFILING_DIR, self.profile_id)
+
+        if self._engine == "pyinstrument":
+            report = self._profiler.output_text(unicode=True, color=False, show_all=False)
+            with open(f"{base}.html", "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_html())
+        else:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=stream)
+            stats.sort_stats("cumulative").print_stats(60)
+            report = stream.getvalue()
+            # snakeviz 등 외부 도구에서 열 수 있도록 원본 통계도 보관
+            stats.dump_stats(f"{base}.prof")
+
+        record = {
+            "id": self.profile_id,
+            "label": self.label,
+            "mode": self.mode,
+            "engine": self._engine,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "wall_ms": round(wall_ms, 2),
+            "cpu_ms": round(cpu_ms, 2),
+            "failed": failed,
+            "meta": self.meta,
+            "report": report,
+        }
+        with open(f"{base}.json", "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, default=str)
+
+        logger.info(f"🧪 Profile stored: {self.profile_id} ({self.label}, wall={wall_ms:.0f}ms, cpu={cpu_ms:.0f}ms)")
+        _prune(settings.PROFILING_MAX_STORED)
+
+
+def profile_request(mode: Optional[str], label: str, **meta: Any):
+    """async with용 컨텍스트. mode가 None이면 아무 것도 하지 않는 컨텍스트(None)를 반환합니다."""
+    if mode is None:
+        return contextlib.nullcontext()
+    return RequestProfiler(mode, label, **meta)
+
+
+def _profile_paths() -> List[str]:
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    names = [n for n in os.listdir(settings.PROFILING_DIR) if n.endswith(".json")]
+    # profile_id가 시각으로 시작하므로 이름 역순 = 최신순
+    return [os.path.join(settings.PROFILING_DIR, n) for n in sorted(names, reverse=True)]
+
+
+def _prune(max_stored: int) -> None:
+    for path in _profile_paths()[max_stored:]:
+        base = path[:-len(".json")]
+        for ext in (".json", ".html", ".prof"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(base + ext)
+
+
+def list_profiles(limit: int = 50) -> List[Dict[str, Any]]:
+    """저장된 프로파일 요약 목록 (report 본문 제외, 최신순)"""
+    summaries = []
+    for path in _profile_paths()[:limit]:
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        record.pop("report", None)
+        summaries.append(record)
+    return summaries
+
+
+def load_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    base = os.path.join(settings.PROFILING_DIR, os.path.basename(profile_id))
+    if not os.path.exists(f"{base}.json"):
+        return None
+    with open(f"{base}.json", encoding="utf-8") as f:
+        record = json.load(f)
+    record["has_html"] = os.path.exists(f"{base}.html")
+    return record
+
+
+def load_profile_html(profile_id: str) -> Optional[str]:
+    path = os.path.join(settings.PROFILING_DIR, f"{os.path.basename(profile_id)}.html")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,26 @@
+"""
+Provider SDK 지연 로딩
+
+google.generativeai는 import만으로 수 초/수십 MB가 드는 의존성을 끌어오므로,
+모듈 import 시점이 아니라 처음 임베딩/생성을 호출할 때 import하고 API 키를 설정합니다.
+"""
+import threading
+
+from app.core.config import settings
+
+_genai = None
+_lock = threading.Lock()
+
+
+def get_genai():
+    """google.generativeai 모듈 (첫 호출 시 import + configure, 스레드 안전)"""
+    global _genai
+    if _genai is None:
+        with _lock:
+            if _genai is None:
+                import google.generativeai as genai
+
+                if settings.GOOGLE_API_KEY:
+                    genai.configure(api_key=settings.GOOGLE_API_KEY)
+                _genai = genai
+    return _genai
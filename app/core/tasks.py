@@ -0,0 +1,24 @@
+"""
+API 프로세스에서 Celery 태스크 발행 / 상태 조회
+
+태스크는 이름(app.worker.<함수명>)으로 발행하므로 API 프로세스는 app.worker와 그 의존성
+(IngestService, 파서, 텍스트 분할기 등)을 import하지 않습니다. celery도 처음 발행할 때 import합니다.
+"""
+from typing import Any
+
+WORKER_MODULE = "app.worker"
+
+
+def _celery_app():
+    from app.core.celery_app import celery_app
+
+    return celery_app
+
+
+def send_task(name: str, *args: Any):
+    """app.worker의 태스크를 이름으로 발행 → AsyncResult (trace context 헤더는 celery_app의 시그널이 추가)"""
+    return _celery_app().send_task(f"{WORKER_MODULE}.{name}", args=list(args))
+
+
+def task_result(task_id: str):
+    return _celery_app().AsyncResult(task_id)
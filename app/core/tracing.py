@@ -0,0 +1,172 @@
+"""
+분산 트레이싱 (OpenTelemetry)
+
+HTTP 요청 → Celery 태스크 → IngestService 단계 → Provider 호출 → SQL 문까지
+하나의 trace로 연결합니다. TRACING_ENABLED=False(기본값)이거나 opentelemetry가
+설치되어 있지 않으면 모든 함수는 아무 일도 하지 않습니다.
+"""
+import contextlib
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+
+_tracer = None
+_initialized = False
+
+
+def setup_tracing(service_name: str) -> None:
+    """
+    TracerProvider를 프로세스 전역으로 설정합니다. 프로세스당 한 번만 호출하면 됩니다.
+    """
+    global _tracer, _initialized
+    if _initialized or not settings.TRACING_ENABLED:
+        return
+    _initialized = True
+
+    provider = create_tracer_provider(service_name)
+    if provider is None:
+        return
+    from opentelemetry import trace
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("app")
+    logger.info(f"🔭 Tracing enabled: service={service_name}, exporter={settings.TRACING_EXPORTER}")
+
+
+def create_tracer_provider(service_name: str) -> Any:
+    """
+    TRACING_EXPORTER 설정으로 TracerProvider를 만듭니다 (전역 등록은 하지 않음).
+    opentelemetry-sdk가 없으면 None.
+    - otlp: 로컬 Collector(OTLP/HTTP)로 전송
+    - file: TRACING_FILE_PATH에 JSON Lines로 기록 (오프라인 테스트용)
+    - console: 표준 출력
+    """
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("⚠️ TRACING_ENABLED=True 이지만 opentelemetry-sdk가 설치되어 있지 않습니다. 트레이싱을 비활성화합니다.")
+        return None
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    elif settings.TRACING_EXPORTER == "file":
+        class FileSpanExporter(ConsoleSpanExporter):
+            """파일 핸들을 소유하고 provider.shutdown() 시 닫는 exporter"""
+            def shutdown(self) -> None:
+                super().shutdown()
+                self.out.close()
+
+        # 한 줄에 span 하나씩 기록하여 테스트/분석 도구에서 쉽게 읽을 수 있도록 함
+        exporter = FileSpanExporter(
+            out=open(settings.TRACING_FILE_PATH, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return provider
+
+
+def shutdown_tracing() -> None:
+    """남아있는 span을 flush하고 exporter를 닫습니다 (API/Celery 워커 프로세스 종료 시)."""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+@contextlib.contextmanager
+def start_span(name: str, context: Any = None, kind: Optional[str] = None, **attributes: Any) -> Iterator[Any]:
+    """
+    span을 시작합니다. 트레이싱이 꺼져 있으면 None을 yield 합니다.
+
+    with start_span("ingest.parse", filename=filename):
+        ...
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    from opentelemetry.trace import SpanKind
+    span_kind = getattr(SpanKind, kind.upper()) if kind else SpanKind.INTERNAL
+    attrs = {k: v for k, v in attributes.items() if v is not None}
+    with _tracer.start_as_current_span(name, context=context, kind=span_kind, attributes=attrs) as span:
+        yield span
+
+
+def inject_context(carrier: Dict[str, Any]) -> Dict[str, Any]:
+    """현재 trace context를 carrier(dict)에 W3C traceparent 형식으로 기록합니다."""
+    if _tracer is not None:
+        from opentelemetry import propagate
+        propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Dict[str, Any]]) -> Any:
+    """carrier에서 trace context를 복원합니다. 트레이싱이 꺼져 있으면 None."""
+    if _tracer is None or not carrier:
+        return None
+    from opentelemetry import propagate
+    return propagate.extract(carrier)
+
+
+def instrument_engine(engine: Any) -> None:
+    """
+    SQLAlchemy 엔진의 cursor 실행마다 CLIENT span을 기록합니다.
+    AsyncEngine이 넘어오면 내부 sync_engine에 이벤트를 등록합니다.
+    """
+    if _tracer is None:
+        return
+
+    from sqlalchemy import event
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if getattr(sync_engine, "_tracing_instrumented", False):
+        return
+    sync_engine._tracing_instrumented = True
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        operation = statement.split(None, 1)[0].upper() if statement else "SQL"
+        span = _tracer.start_span(
+            f"db.{operation.lower()}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                # 쿼리 벡터 등 파라미터는 기록하지 않고 SQL 원문만 남김 (길이 제한)
+                "db.statement": statement[:2000],
+                "db.executemany": executemany,
+            },
+        )
+        context._otel_span = span
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_otel_span", None)
+        if span is not None:
+            span.set_attribute("db.rowcount", cursor.rowcount if cursor.rowcount is not None else -1)
+            span.end()
+            context._otel_span = None
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        ctx = exception_context.execution_context
+        span = getattr(ctx, "_otel_span", None) if ctx is not None else None
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+            ctx._otel_span = None
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from sqlalchemy import select, text
-from app.core.database import AsyncSessionLocal, engine
+from app.core.database import AsyncSessionLocal, engine, shard_engines
 from app.models import Base
 from app.models.user import User
 from app.core.security import get_password_hash
@@ -14,12 +14,14 @@ async def init_db() -> None:
     async with AsyncSessionLocal() as db:
         try:
             # Ensure tables exist when migrations are not present
-            async with engine.begin() as conn:
-                try:
-                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-                except Exception as e:
-                    logger.warning(f"⚠️ pgvector extension check failed (continuing): {e}")
-                await conn.run_sync(Base.metadata.create_all)
+            # 벡터 샤드(VECTOR_SHARDS)도 같은 스키마 사용 (문서 사본 + 청크)
+            for db_engine in (engine, *shard_engines):
+                async with db_engine.begin() as conn:
+                    try:
+                        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                    except Exception as e:
+                        logger.warning(f"⚠️ pgvector extension check failed (continuing): {e}")
+                    await conn.run_sync(Base.metadata.create_all)
 
             # 1. 관리자 계정이 이미 있는지 확인
             result = await db.execute(select(User).where(User.email == "admin@example.com"))
@@ -1,8 +1,15 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.database import all_engines
+from app.core import tracing
+from app.core.admission import render_prometheus
+from app.core.logging import logger
 from app.core.exceptions import (
     AppError, 
     app_exception_handler, 
@@ -27,6 +34,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Tracing Setup (TRACING_ENABLED=True 일 때만 활성화)
+tracing.setup_tracing("rag-api")
+if tracing.is_enabled():
+    for db_engine in all_engines():
+        tracing.instrument_engine(db_engine)
+
+    @app.middleware("http")
+    async def tracing_middleware(request: Request, call_next):
+        parent = tracing.extract_context(dict(request.headers))
+        with tracing.start_span(
+            f"{request.method} {request.url.path}", context=parent, kind="server",
+            **{"http.method": request.method, "http.target": request.url.path}
+        ) as span:
+            response = await call_next(request)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
+    @app.on_event("shutdown")
+    def shutdown_tracing():
+        # 남은 span flush + file exporter 파일 닫기
+        tracing.shutdown_tracing()
+
+# DB 재시작/배포 직후 첫 검색이 콜드 캐시로 느려지지 않도록 인덱스를 미리 적재 (백그라운드)
+if settings.HNSW_PREWARM_ON_STARTUP:
+    @app.on_event("startup")
+    async def prewarm_indexes():
+        from app.services.index_service import IndexService
+
+        async def _prewarm():
+            try:
+                await IndexService().prewarm()
+            except Exception as e:
+                logger.warning(f"⚠️ Index prewarm failed: {e}")
+
+        asyncio.create_task(_prewarm())
+
+if settings.VECTOR_INDEX_BACKEND == "local":
+    @app.on_event("startup")
+    async def load_local_vector_index():
+        # 첫 검색 요청에서 로드 지연이 생기지 않도록 시작 시 memmap 인덱스를 연다
+        from app.services.vector_index import get_local_index
+
+        await asyncio.to_thread(get_local_index)
+
 # Include Routers
 app.include_router(api_router, prefix="/api/v1")
 
@@ -34,6 +85,17 @@ app.include_router(api_router, prefix="/api/v1")
 def health_check():
     return {"status": "ok", "message": "ICS2-Vector API is running"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics(request: Request):
+    # Prometheus scrape endpoint (워커 프로세스 단위 값). METRICS_ENABLED일 때만 노출
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN and not hmac.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return render_prometheus()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,72 @@
+"""
+인덱스 유지보수 CLI
+
+    python -m app.manage_indexes stats
+    python -m app.manage_indexes progress
+    python -m app.manage_indexes rebuild --target hnsw --m 24 --ef-construction 128
+    python -m app.manage_indexes prewarm
+    python -m app.manage_indexes local-rebuild   # VECTOR_INDEX_BACKEND=local 인덱스를 DB에서 다시 채움
+    python -m app.manage_indexes partition --partitions 8   # embeddings → hash(document_id) 파티션 테이블
+    python -m app.manage_indexes unpartition                # 파티션 테이블 → 일반 테이블
+
+rebuild는 현재 프로세스에서 동기적으로 실행됩니다 (API에서는 POST /admin/indexes/rebuild → Celery).
+partition/unpartition 후에는 모든 프로세스의 EMBEDDINGS_PARTITIONS를 같은 값으로 바꾸고 재시작하세요.
+"""
+import argparse
+import asyncio
+import json
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.index_service import IndexService, HNSW_INDEXES
+
+
+async def main(args: argparse.Namespace) -> None:
+    service = IndexService()
+    if args.command == "stats":
+        result = await service.stats()
+    elif args.command == "progress":
+        result = await service.progress()
+    elif args.command == "prewarm":
+        result = await service.prewarm()
+    elif args.command == "partition":
+        partitions = args.partitions or settings.EMBEDDINGS_PARTITIONS
+        if partitions <= 0:
+            raise SystemExit("--partitions (or EMBEDDINGS_PARTITIONS) must be > 0")
+        result = await service.convert_partitioning(partitions)
+    elif args.command == "unpartition":
+        result = await service.convert_partitioning(0)
+    elif args.command == "local-rebuild":
+        from app.services.vector_index import build_local_index
+
+        async with AsyncSessionLocal() as db:
+            result = {"vectors": await build_local_index(db)}
+    else:
+        result = {}
+        for key in HNSW_INDEXES:
+            if args.target in (key, "all"):
+                result[key] = await service.rebuild_hnsw(
+                    args.m, args.ef_construction, prewarm=not args.no_prewarm, target=key
+                )
+        if args.target in ("gin", "all"):
+            result["gin"] = await service.rebuild_gin(prewarm=not args.no_prewarm)
+    await service.engine.dispose()
+    print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HNSW/GIN index maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="index sizes and definitions")
+    sub.add_parser("progress", help="running CREATE INDEX / REINDEX progress")
+    sub.add_parser("prewarm", help="load indexes into shared_buffers")
+    sub.add_parser("local-rebuild", help="reload the local vector index from the embeddings table")
+    partition = sub.add_parser("partition", help="convert embeddings to a hash(document_id) partitioned table")
+    partition.add_argument("--partitions", type=int, default=None, help="default: EMBEDDINGS_PARTITIONS")
+    sub.add_parser("unpartition", help="convert embeddings back to a plain table")
+    rebuild = sub.add_parser("rebuild", help="rebuild indexes concurrently")
+    rebuild.add_argument("--target", choices=[*HNSW_INDEXES, "gin", "all"], default="hnsw")
+    rebuild.add_argument("--m", type=int, default=None)
+    rebuild.add_argument("--ef-construction", type=int, default=None)
+    rebuild.add_argument("--no-prewarm", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -1,4 +1,5 @@
 from app.models.base import Base
 from app.models.document import Document
 from app.models.embedding import Embedding
-from app.models.user import User
\ No newline at end of file
+from app.models.user import User
+from app.models.web_source import WebSource
\ No newline at end of file
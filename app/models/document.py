@@ -1,10 +1,12 @@
 import uuid
-from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Integer, Enum as SQLEnum
+from typing import Any, List, Optional, TYPE_CHECKING
+from sqlalchemy import String, Integer, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
+from pgvector.sqlalchemy import Vector
 import enum
 
+from app.core.config import settings
 from app.models.base import Base, TimestampMixin
 
 if TYPE_CHECKING:
@@ -25,9 +27,29 @@ class Document(Base, TimestampMixin):
     file_size: Mapped[int] = mapped_column(Integer)
     category: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
     status: Mapped[FileStatus] = mapped_column(SQLEnum(FileStatus), default=FileStatus.READY)
+    # 원본 파일 SHA-256 (업로드 시 계산) — 같은 내용이 이미 적재되어 있으면 재적재 생략
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), index=True, nullable=True)
+    # 청크 임베딩 평균(L2 정규화) — 2단계 검색(TWO_STAGE_RETRIEVAL)의 문서 단위 1단계용
+    summary_embedding: Mapped[Optional[Any]] = mapped_column(Vector(768), nullable=True)
     
     # Relationship
-    embeddings: Mapped[List["Embedding"]] = relationship(back_populates="document", cascade="all, delete-orphan")
+    # passive_deletes: 문서 삭제 시 청크를 로드하지 않고 DB의 ON DELETE CASCADE에 맡김
+    embeddings: Mapped[List["Embedding"]] = relationship(
+        back_populates="document", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (
+        # 검색 기간 필터(created_from/created_to)용
+        Index('ix_documents_created_at', 'created_at'),
+        # 문서 단위 ANN (2단계 검색 1단계)
+        Index(
+            'ix_documents_summary_embedding_hnsw',
+            'summary_embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': settings.HNSW_M, 'ef_construction': settings.HNSW_EF_CONSTRUCTION},
+            postgresql_ops={'summary_embedding': 'vector_l2_ops'}
+        ),
+    )
 
     def __repr__(self):
         return f"<Document(filename={self.filename}, status={self.status})>"
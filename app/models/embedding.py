@@ -1,16 +1,22 @@
 import uuid
 from typing import Optional, Any, TYPE_CHECKING
-from sqlalchemy import String, Integer, Text, ForeignKey, Index, Column
+from sqlalchemy import String, Integer, BigInteger, Text, ForeignKey, Index, Column, text, literal_column, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
-from pgvector.sqlalchemy import Vector
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR, ARRAY
+from pgvector.sqlalchemy import Vector, HALFVEC
 from sqlalchemy.types import TypeDecorator
 
+from app.core.config import settings
 from app.models.base import Base
 
 if TYPE_CHECKING:
     from app.models.document import Document
 
+# EMBEDDINGS_PARTITIONS > 0: embeddings를 hash(document_id)로 파티셔닝 (파티션: embeddings_p0 … p{N-1})
+# 파티션 테이블의 PK/UNIQUE는 파티션 키를 포함해야 하므로 PK가 (id, document_id)가 됩니다.
+PARTITIONED = settings.EMBEDDINGS_PARTITIONS > 0
+PARTITION_PREFIX = "embeddings_p"
+
 class TSVector(TypeDecorator):
     impl = TSVECTOR
 
@@ -18,11 +24,17 @@ class Embedding(Base):
     __tablename__ = "embeddings"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    document_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True, primary_key=PARTITIONED
+    )
     chunk_index: Mapped[int] = mapped_column(Integer)
     content: Mapped[str] = mapped_column(Text)
     # HNSW Index for fast approximate nearest neighbor search
-    embedding: Mapped[Any] = mapped_column(Vector(768))
+    # VECTOR_STORAGE에 따라 embedding(float32) 또는 embedding_half(float16) 중 하나만 채워집니다.
+    embedding: Mapped[Optional[Any]] = mapped_column(Vector(768), nullable=True)
+    embedding_half: Mapped[Optional[Any]] = mapped_column(HALFVEC(768), nullable=True)
+    # 앞 MATRYOSHKA_DIM 차원을 잘라 재정규화한 벡터 (matryoshka_rescore 1단계 검색용, 적재 시 항상 채움)
+    embedding_short: Mapped[Optional[Any]] = mapped_column(Vector(settings.MATRYOSHKA_DIM), nullable=True)
     
     # Full-Text Search Column (TSVector)
     # Note: Alembic might need explicit type definition or we use raw SQL for GIN index
@@ -30,6 +42,17 @@ class Embedding(Base):
     
     metadata_info: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
 
+    # 근사 중복 탐지 (NEAR_DUP_MODE, app.utils.simhash): 64비트 SimHash와 후보 검색용 구간 배열
+    simhash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    simhash_bands: Mapped[Optional[list]] = mapped_column(ARRAY(Integer), nullable=True)
+    # 적재 시 발견한 원본 청크 (원본이 삭제되면 NULL이 되어 독립 청크로 남음)
+    # 파티셔닝 시에는 id 단독 UNIQUE가 없어 FK를 둘 수 없으므로 원본 삭제 후에도 값이 남습니다.
+    duplicate_of: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        *([] if PARTITIONED else [ForeignKey("embeddings.id", ondelete="SET NULL")]),
+        nullable=True, index=True
+    )
+
     # Relationship
     document: Mapped["Document"] = relationship(back_populates="embeddings")
 
@@ -40,16 +63,90 @@ class Embedding(Base):
             'ix_embeddings_embedding_hnsw', 
             embedding, 
             postgresql_using='hnsw', 
-            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_with={'m': settings.HNSW_M, 'ef_construction': settings.HNSW_EF_CONSTRUCTION},
             postgresql_ops={'embedding': 'vector_l2_ops'}
         ),
+        # Binary-quantized HNSW Index (VECTOR_SEARCH_MODE=binary_rescore의 1단계 검색용)
+        # 별도 컬럼 없이 expression index로 유지되므로 적재 시 자동으로 함께 갱신됨
+        Index(
+            'ix_embeddings_embedding_bq_hnsw',
+            text("(binary_quantize(embedding)::bit(768)) bit_hamming_ops"),
+            postgresql_using='hnsw',
+            postgresql_with={'m': settings.HNSW_M, 'ef_construction': settings.HNSW_EF_CONSTRUCTION}
+        ),
+        # Half-precision HNSW Indexes (VECTOR_STORAGE=halfvec, 인덱스 크기 약 1/2)
+        # NULL은 인덱싱되지 않으므로 사용하지 않는 저장 방식의 인덱스는 비어 있음
+        Index(
+            'ix_embeddings_embedding_half_hnsw',
+            embedding_half,
+            postgresql_using='hnsw',
+            postgresql_with={'m': settings.HNSW_M, 'ef_construction': settings.HNSW_EF_CONSTRUCTION},
+            postgresql_ops={'embedding_half': 'halfvec_l2_ops'}
+        ),
+        Index(
+            'ix_embeddings_embedding_half_bq_hnsw',
+            text("(binary_quantize(embedding_half)::bit(768)) bit_hamming_ops"),
+            postgresql_using='hnsw',
+            postgresql_with={'m': settings.HNSW_M, 'ef_construction': settings.HNSW_EF_CONSTRUCTION}
+        ),
+        # Truncated-dimension HNSW Index (VECTOR_SEARCH_MODE=matryoshka_rescore)
+        Index(
+            'ix_embeddings_embedding_short_hnsw',
+            embedding_short,
+            postgresql_using='hnsw',
+            postgresql_with={'m': settings.HNSW_M, 'ef_construction': settings.HNSW_EF_CONSTRUCTION},
+            postgresql_ops={'embedding_short': 'vector_l2_ops'}
+        ),
         # GIN Index for Full-Text Search
         Index(
             'ix_embeddings_content_search_gin',
             content_search,
             postgresql_using='gin'
-        )
+        ),
+        # 근사 중복 후보 검색 (simhash_bands && :bands)
+        Index(
+            'ix_embeddings_simhash_bands_gin',
+            simhash_bands,
+            postgresql_using='gin'
+        ),
+        # 카테고리 필터용 Expression Index (metadata_info->>'category')
+        Index(
+            'ix_embeddings_category',
+            text("(metadata_info ->> 'category')")
+        ),
+        # 파티션 테이블에서는 위 인덱스가 파티션마다 로컬 인덱스로 생성됨
+        {'postgresql_partition_by': 'HASH (document_id)'} if PARTITIONED else {}
     )
 
     def __repr__(self):
-        return f"<Embedding(doc_id={self.document_id}, chunk={self.chunk_index})>"
\ No newline at end of file
+        return f"<Embedding(doc_id={self.document_id}, chunk={self.chunk_index})>"
+
+@event.listens_for(Embedding.__table__, "after_create")
+def _create_partitions(target, connection, **kw):
+    """create_all로 만든 파티션 부모 테이블에 hash 파티션 생성 (마이그레이션 설치는 alembic에서 생성)"""
+    if not PARTITIONED:
+        return
+    modulus = settings.EMBEDDINGS_PARTITIONS
+    for remainder in range(modulus):
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {PARTITION_PREFIX}{remainder} PARTITION OF embeddings "
+            f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+        ))
+
+# 카테고리 필터 표현식. ix_embeddings_category 인덱스 및 카테고리별 partial 인덱스의 조건과
+# 동일하게 렌더링되어야 플래너가 인덱스를 사용하므로 키를 바인드 파라미터가 아닌 리터럴로 둡니다.
+EMBEDDING_CATEGORY = Embedding.metadata_info.op("->>")(literal_column("'category'"))
+
+
+def active_embedding_attr() -> str:
+    """VECTOR_STORAGE 설정에 따라 적재/검색에 사용하는 벡터 컬럼 이름"""
+    return "embedding_half" if settings.VECTOR_STORAGE == "halfvec" else "embedding"
+
+
+def active_embedding_column():
+    return getattr(Embedding, active_embedding_attr())
+
+
+def active_vector_type():
+    """쿼리 벡터 바인드/캐스트 타입 (활성 컬럼과 같아야 HNSW 인덱스가 사용됨)"""
+    return HALFVEC(768) if settings.VECTOR_STORAGE == "halfvec" else Vector(768)
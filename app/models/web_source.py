@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import Base, TimestampMixin
+
+class WebSource(Base, TimestampMixin):
+    """
+    크롤링한 URL별 조건부 요청 정보.
+    재크롤링 시 ETag/Last-Modified로 If-None-Match/If-Modified-Since를 보내 304면 다운로드/재임베딩을 생략합니다.
+    문서는 documents.filename = url 로 저장됩니다.
+    """
+    __tablename__ = "web_sources"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    url: Mapped[str] = mapped_column(String, unique=True)
+    etag: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # 마지막으로 받은 본문 SHA-256 (검증자 없는 서버에서 내용이 같으면 재임베딩 생략)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    last_status: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    fetched_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<WebSource(url={self.url}, status={self.last_status})>"
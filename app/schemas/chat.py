@@ -1,11 +1,25 @@
-from pydantic import BaseModel
-from typing import List, Optional, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional, Any, Dict
 from uuid import UUID
+from app.schemas.search import SearchFilters
 
 class ChatRequest(BaseModel):
     query: str
     collection_name: Optional[str] = None # For specific category filtering
     top_k: int = 4
+    deadline_ms: Optional[int] = None # End-to-end latency budget (기본값: CHAT_DEADLINE_SECONDS)
+    filters: Optional[SearchFilters] = None # category / document_ids / 기간 필터
+    ef_search: Optional[int] = Field(None, ge=1, le=1000) # HNSW 후보 리스트 크기 (기본값: HNSW_EF_SEARCH)
+
+    def resolved_filters(self) -> Optional[SearchFilters]:
+        """collection_name은 category 필터의 하위 호환 별칭입니다."""
+        if self.filters is not None:
+            if self.collection_name and not self.filters.category:
+                return self.filters.model_copy(update={"category": self.collection_name})
+            return self.filters
+        if self.collection_name:
+            return SearchFilters(category=self.collection_name)
+        return None
 
 class SourceDocument(BaseModel):
     document_id: UUID
@@ -17,3 +31,4 @@ class SourceDocument(BaseModel):
 class ChatResponse(BaseModel):
     answer: str
     sources: List[SourceDocument] = []
+    metadata: Dict[str, Any] = {} # degradations, elapsed_ms 등
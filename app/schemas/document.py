@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 from uuid import UUID
 
 class DocumentBase(BaseModel):
@@ -23,3 +23,42 @@ class DocumentResponse(DocumentBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class ResumableUploadCreate(BaseModel):
+    filename: str
+    size: int = Field(..., ge=0) # 전체 파일 크기 (bytes)
+
+class BulkDeleteRequest(BaseModel):
+    """조건은 AND로 결합되며, 하나 이상 필요합니다."""
+    document_ids: Optional[List[UUID]] = Field(None, max_length=10000)
+    category: Optional[str] = None
+    filename_pattern: Optional[str] = None # SQL LIKE 패턴 (예: "2024_%.pdf")
+    batch_size: int = Field(50, ge=1, le=1000)
+
+    @model_validator(mode="after")
+    def require_criteria(self) -> "BulkDeleteRequest":
+        if not (self.document_ids or self.category or self.filename_pattern):
+            raise ValueError("document_ids, category or filename_pattern is required")
+        return self
+
+class CrawlRequest(BaseModel):
+    """시드 URL과 sitemap URL 중 하나 이상 필요합니다."""
+    seeds: List[str] = Field(default_factory=list, max_length=10000)
+    sitemaps: List[str] = Field(default_factory=list, max_length=100)
+    force: bool = False # True면 ETag/Last-Modified 조건부 요청 없이 모두 다시 받음
+
+    @model_validator(mode="after")
+    def require_urls(self) -> "CrawlRequest":
+        if not (self.seeds or self.sitemaps):
+            raise ValueError("seeds or sitemaps is required")
+        for url in (*self.seeds, *self.sitemaps):
+            if not url.startswith(("http://", "https://")):
+                raise ValueError(f"Only http(s) URLs are supported: {url}")
+        return self
+
+class TaskStatusResponse(BaseModel):
+    task_id: str
+    state: str # PENDING | STARTED | PROGRESS | SUCCESS | FAILURE | RETRY | REVOKED
+    progress: Optional[Any] = None # PROGRESS 상태의 meta (예: {"deleted": 120, "total": 500})
+    result: Optional[Any] = None
+    error: Optional[str] = None
@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+from uuid import UUID
+
+class SearchFilters(BaseModel):
+    category: Optional[str] = None
+    document_ids: Optional[List[UUID]] = None
+    created_from: Optional[datetime] = None # Document.created_at >= created_from
+    created_to: Optional[datetime] = None # Document.created_at < created_to
+
+class SearchRequest(BaseModel):
+    query: str
+    top_k: int = Field(10, ge=1, le=100) # Page size
+    offset: int = Field(0, ge=0, le=1000)
+    filters: Optional[SearchFilters] = None
+    rerank: bool = True
+    ef_search: Optional[int] = Field(None, ge=1, le=1000) # HNSW 후보 리스트 크기 (recall ↔ latency)
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=100)
+    top_k: int = Field(10, ge=1, le=100)
+    filters: Optional[SearchFilters] = None
+    rerank: bool = True
+    ef_search: Optional[int] = Field(None, ge=1, le=1000) # HNSW 후보 리스트 크기 (recall ↔ latency)
+
+class ChunkScores(BaseModel):
+    vector_distance: Optional[float] = None # L2 distance (lower is better)
+    vector_rank: Optional[int] = None
+    keyword_rank: Optional[int] = None
+    rrf: float
+    rerank: Optional[float] = None
+
+class SearchResultItem(BaseModel):
+    chunk_id: UUID
+    document_id: UUID
+    filename: str
+    category: Optional[str] = None
+    chunk_index: int
+    content: str
+    score: float # Final score (rerank if applied, otherwise RRF)
+    scores: ChunkScores
+    metadata: Optional[Dict[str, Any]] = None
+
+class SearchResponse(BaseModel):
+    query: str
+    offset: int
+    top_k: int
+    results: List[SearchResultItem] = []
+    missing_shards: List[int] = [] # 샤딩 시 시간 초과/실패로 제외된 샤드 (비어 있지 않으면 부분 결과)
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse] = []
@@ -1,14 +1,18 @@
 import os
-from typing import List, Tuple
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models.embedding import Embedding
-from app.models.document import Document
 from app.services.vector_service import VectorService
-from app.services.rerank_service import KeywordReranker
+from app.services.rerank_service import KeywordReranker, RerankResult
+from app.services.latency_budget import LatencyBudget
+from app.schemas.search import SearchFilters
 from app.core.config import settings
 from app.core.logging import logger
-import google.generativeai as genai
+from app.core.providers import get_genai
+from app.core.tracing import start_span
+
+RETRIEVAL_ONLY_ANSWER = "응답 시간 제한으로 답변을 생성하지 못했습니다. 아래 참고 문서를 확인해주세요."
+SEARCH_TIMEOUT_ANSWER = "응답 시간 제한으로 문서를 검색하지 못했습니다. 잠시 후 다시 시도해주세요."
 
 class ChatService:
     def __init__(self, db: AsyncSession):
@@ -16,10 +20,39 @@ class ChatService:
         self.vector_service = VectorService(db) # Inject VectorService
         # 추후 설정값에 따라 CohereReranker 등으로 교체 가능
         self.reranker = KeywordReranker(boost_weight=0.3) 
+        # 마지막 get_answer 호출의 부가 정보 (적용된 degradation, 소요 시간 등)
+        self.metadata: Dict[str, Any] = {}
 
-    async def get_answer(self, query: str, k: int = 4) -> Tuple[str, List[dict]]:
+    async def get_answer(self, query: str, k: int = 4, deadline_seconds: Optional[float] = None,
+                         filters: Optional[SearchFilters] = None,
+                         ef_search: Optional[int] = None) -> Tuple[str, List[dict]]:
+        budget = LatencyBudget(deadline_seconds if deadline_seconds is not None else settings.CHAT_DEADLINE_SECONDS)
+        try:
+            return await self._get_answer(query, k, budget, filters, ef_search)
+        finally:
+            self.metadata = {
+                "degradations": list(budget.degradations),
+                "elapsed_ms": round(budget.elapsed_ms(), 1),
+            }
+
+    async def _get_answer(self, query: str, k: int, budget: LatencyBudget,
+                          filters: Optional[SearchFilters] = None,
+                          ef_search: Optional[int] = None) -> Tuple[str, List[dict]]:
         # 0. Query Expansion (어휘 불일치 해결)
-        expanded_query = await self._expand_query(query)
+        # 남은 시간이 부족하면 확장을 건너뛰고, 확장 호출 자체도 이후 단계 몫을 남긴 시간 안에서만 기다림
+        if budget.allows(settings.CHAT_BUDGET_EXPANSION_MIN_SECONDS):
+            try:
+                expanded_query = await asyncio.wait_for(
+                    self._expand_query(query),
+                    timeout=budget.timeout(reserve_seconds=settings.CHAT_BUDGET_KEYWORD_MIN_SECONDS)
+                )
+            except asyncio.TimeoutError:
+                logger.warning("⏱️ Query expansion exceeded latency budget, using original query")
+                budget.degrade("skip_query_expansion")
+                expanded_query = query
+        else:
+            budget.degrade("skip_query_expansion")
+            expanded_query = query
 
         # 1. Hybrid Search (Vector + Keyword -> RRF)
         # 이제 VectorService.search_hybrid가 RRF된 상위 문서를 반환합니다.
@@ -27,83 +60,106 @@ class ChatService:
         # search_hybrid 인터페이스가 top_k를 받으므로, 재순위화를 위해 넉넉히 k * 3개를 요청합니다.
         rrf_limit = k * 3
         
-        # Note: search_hybrid returns List[Embedding] (entity objects)
-        # We need to fetch associated Document metadata.
-        # Ideally search_hybrid should return tuples or we lazy load.
-        # But Embedding has document relationship (lazy loading in async might be tricky without specific loader options).
-        # Let's verify search_hybrid implementation. It returns Embedding scalars.
-        # Accessing embedding.document might trigger lazy load error in async unless we use joinedload or explicit join.
-        
-        # For performance and correctness, let's modify how we call or use the results.
-        # Actually, VectorService methods just execute simple selects.
-        # We might need to fetch Document info.
-        
-        # Let's assume Embedding object has what we need or we fetch documents by ID.
-        candidate_embeddings = await self.vector_service.search_hybrid(expanded_query, top_k=rrf_limit)
+        # search_hybrid_scored는 청크와 Document를 한 번의 JOIN으로 함께 로드하므로
+        # 별도의 Document 조회(N+1 방지용 배치 조회)가 필요 없습니다.
+        use_keyword = budget.allows(settings.CHAT_BUDGET_KEYWORD_MIN_SECONDS)
+        if not use_keyword:
+            budget.degrade("skip_keyword_search")
+        # 임베딩 호출 + 벡터/키워드/샤드 검색도 생성 단계 몫을 남긴 시간 안에서만 기다림
+        # 늦은 레그는 버리고 끝난 레그 결과로 진행 (레그는 별도 세션에서 실행되어 self.db는 취소 영향 없음)
+        try:
+            candidate_hits = await self.vector_service.search_hybrid_bounded(
+                expanded_query, top_k=rrf_limit,
+                timeout=budget.timeout(reserve_seconds=settings.CHAT_BUDGET_GENERATION_MIN_SECONDS),
+                use_keyword=use_keyword, filters=filters, ef_search=ef_search
+            )
+        except asyncio.TimeoutError:
+            logger.warning("⏱️ Search exceeded latency budget, returning without results")
+            budget.degrade("search_timeout")
+            return SEARCH_TIMEOUT_ANSWER, []
+        if "keyword" in self.vector_service.missing_legs:
+            budget.degrade("skip_keyword_search")
+        if "vector" in self.vector_service.missing_legs:
+            budget.degrade("skip_vector_search")
+        if self.vector_service.missing_shards:
+            budget.degrade("partial_shard_results")
         
-        if not candidate_embeddings:
+        if not candidate_hits:
             return "관련된 문서를 찾을 수 없습니다.", []
 
-        # Fetch Documents for candidates
-        # To avoid N+1, let's fetch documents in batch
-        doc_ids = list(set([e.document_id for e in candidate_embeddings]))
-        stmt = select(Document).where(Document.id.in_(doc_ids))
-        result = await self.db.execute(stmt)
-        documents_map = {doc.id: doc for doc in result.scalars().all()}
-
         # 3. Prepare for Final Reranking (Cross-Check or Keyword Boosting again)
         # Hybrid Search already did RRF (which includes keyword match).
-        # But our KeywordReranker (in rerank_service.py) might do specific scoring or we can skip it?
-        # Hybrid Search (RRF) IS a form of reranking.
-        # If we trust RRF, we can just take top K.
-        # However, ChatService architecture uses KeywordReranker which might use different logic (e.g. precise exact match boosting).
-        # Let's keep it for fine-tuning.
-        
+        # KeywordReranker는 정확한 단어 매칭을 추가로 보정합니다.
         candidate_input = []
-        # Since RRF score is not directly attached to embedding object in the return list (it just returns list),
-        # we lose the score information unless we modify search_hybrid to return scores.
-        # Current search_hybrid returns list of Embeddings.
-        # Let's assume order is importance.
-        # We can assign mock score based on rank.
-        
-        for rank, embedding in enumerate(candidate_embeddings):
-            doc = documents_map.get(embedding.document_id)
-            if not doc: continue
-            
+        for rank, hit in enumerate(candidate_hits):
             # Reverse rank score (higher is better)
+            # KeywordReranker의 boost_weight가 이 스케일에 맞춰져 있으므로 RRF 원점수 대신 순위 점수를 사용
             mock_score = 1.0 / (rank + 1)
             
             candidate_input.append({
-                "document_id": str(doc.id),
-                "content": embedding.content,
+                "chunk_id": str(hit.chunk_id),
+                "document_id": str(hit.document.id),
+                "content": hit.embedding.content,
                 "score": mock_score,
-                "filename": doc.filename
+                "filename": hit.document.filename,
+                "page_number": (hit.embedding.metadata_info or {}).get("page_number"),
             })
 
         # 4. Final Reranking (Optional but good for robustness)
         # Using the original query for reranking to focus on user intent (not expanded one)
         # or use expanded? Usually original is better for precision.
-        reranked_results = await self.reranker.rerank(query, candidate_input)
-        
-        # 5. Top-K Slice
+        reranked_results = None
+        if budget.allows(settings.CHAT_BUDGET_RERANK_MIN_SECONDS):
+            try:
+                reranked_results = await asyncio.wait_for(
+                    self.reranker.rerank(query, candidate_input),
+                    # 시간 초과 시에도 k를 줄여 답변을 생성할 수 있도록 k 축소 기준 시간을 남김
+                    timeout=budget.timeout(reserve_seconds=settings.CHAT_BUDGET_FULL_K_MIN_SECONDS)
+                )
+            except asyncio.TimeoutError:
+                logger.warning("⏱️ Reranking exceeded latency budget, using RRF order")
+        if reranked_results is None:
+            # RRF 순서를 그대로 사용
+            budget.degrade("skip_rerank")
+            reranked_results = [
+                RerankResult(c["document_id"], c["content"], c["score"], c["filename"], c["chunk_id"])
+                for c in candidate_input
+            ]
+
+        # 5. Top-K Slice (시간이 부족하면 Context를 줄여 생성 시간을 단축)
+        if k > 1 and not budget.allows(settings.CHAT_BUDGET_FULL_K_MIN_SECONDS):
+            budget.degrade("shrink_k")
+            k = max(1, k // 2)
         final_top_k = reranked_results[:k]
 
         # 6. Construct Context
         context_texts = []
         sources = []
+        page_numbers = {c["chunk_id"]: c["page_number"] for c in candidate_input}
         for res in final_top_k:
             context_texts.append(res.content)
             sources.append({
                 "document_id": res.document_id,
                 "filename": res.filename,
                 "content": res.content[:200] + "...",
-                "score": res.score
+                "score": res.score,
+                "page_number": page_numbers.get(res.chunk_id),
             })
 
         context = "\n\n".join(context_texts)
 
-        # 7. Generate Answer using LLM
-        answer = await self._generate_llm_response(query, context)
+        # 7. Generate Answer using LLM (남은 시간 안에 끝나지 않으면 검색 결과만 반환)
+        if not budget.allows(settings.CHAT_BUDGET_GENERATION_MIN_SECONDS):
+            budget.degrade("retrieval_only")
+            return RETRIEVAL_ONLY_ANSWER, sources
+        try:
+            answer = await asyncio.wait_for(
+                self._generate_llm_response(query, context), timeout=budget.timeout()
+            )
+        except asyncio.TimeoutError:
+            logger.warning("⏱️ Answer generation exceeded latency budget, returning retrieval-only result")
+            budget.degrade("retrieval_only")
+            return RETRIEVAL_ONLY_ANSWER, sources
         
         return answer, sources
 
@@ -112,7 +168,7 @@ class ChatService:
         사용자 질문을 확장하여 동의어/유사어를 포함시킵니다.
         """
         try:
-            model = genai.GenerativeModel(settings.LLM_MODEL)
+            model = get_genai().GenerativeModel(settings.LLM_MODEL)
             prompt = f"""
 당신은 검색 쿼리 확장 전문가입니다.
 사용자의 질문을 분석하고, 같은 의미를 가진 유사어, 동의어, 관련 용어를 포함하여 확장된 검색 쿼리를 생성하세요.
@@ -121,7 +177,8 @@ class ChatService:
 사용자 질문: {query}
 확장된 쿼리 (콤마로 구분):
 """
-            response = await model.generate_content_async(prompt)
+            with start_span("provider.expand_query", kind="client", model=settings.LLM_MODEL):
+                response = await model.generate_content_async(prompt)
             expanded = response.text.strip()
             logger.info(f"🔍 Query Expansion: '{query}' → '{expanded}'")
             return expanded
@@ -130,6 +187,10 @@ class ChatService:
             return query  # 실패 시 원본 쿼리 반환
 
     async def _generate_llm_response(self, query: str, context: str) -> str:
+        with start_span("provider.generate", kind="client", provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL):
+            return await self._call_llm(query, context)
+
+    async def _call_llm(self, query: str, context: str) -> str:
         try:
             prompt = f"""
             당신은 기업 내부 문서 기반의 AI 어시스턴트입니다.
@@ -146,7 +207,7 @@ class ChatService:
             """
 
             if settings.LLM_PROVIDER == "gemini":
-                model = genai.GenerativeModel(settings.LLM_MODEL)
+                model = get_genai().GenerativeModel(settings.LLM_MODEL)
                 response = await model.generate_content_async(prompt)
                 return response.text
                 
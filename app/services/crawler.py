@@ -0,0 +1,158 @@
+"""
+비동기 웹 크롤러 (시드 URL 목록 / sitemap)
+
+- httpx.AsyncClient 하나로 커넥션을 재사용하고(keep-alive), 전체 동시 요청 수는 CRAWL_CONCURRENCY로 제한합니다.
+- 호스트별로 동시 요청 수(CRAWL_PER_HOST_CONCURRENCY)와 요청 시작 간격(CRAWL_DELAY_SECONDS)을 지킵니다.
+- validators로 이전 ETag/Last-Modified를 주면 조건부 요청을 보내며, 변경이 없으면 304(본문 없음)를 돌려줍니다.
+
+DB와 무관한 fetch 계층입니다. 적재/조건부 요청 정보 저장은 WebIngestService가 담당합니다.
+"""
+import asyncio
+import gzip
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+Validators = Tuple[Optional[str], Optional[str]]  # (ETag, Last-Modified)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int  # HTTP 상태 코드, 네트워크 오류/본문 상한 초과는 0
+    body: bytes = b""
+    content_type: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+
+class _HostGate:
+    """호스트별 동시 요청 수 + 요청 시작 간격 (politeness)"""
+
+    def __init__(self, limit: int, delay: float):
+        self._slots = asyncio.Semaphore(limit)
+        self._lock = asyncio.Lock()
+        self._delay = delay
+        self._next_start = 0.0
+
+    async def __aenter__(self) -> None:
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            wait = self._next_start - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_start = loop.time() + self._delay
+
+    async def __aexit__(self, *exc) -> None:
+        self._slots.release()
+
+
+class Crawler:
+    def __init__(self, concurrency: Optional[int] = None, per_host: Optional[int] = None,
+                 delay: Optional[float] = None, timeout: Optional[float] = None,
+                 max_bytes: Optional[int] = None, user_agent: Optional[str] = None):
+        self.concurrency = concurrency or settings.CRAWL_CONCURRENCY
+        self.per_host = per_host or settings.CRAWL_PER_HOST_CONCURRENCY
+        self.delay = settings.CRAWL_DELAY_SECONDS if delay is None else delay
+        self.timeout = timeout or settings.CRAWL_TIMEOUT_SECONDS
+        self.max_bytes = max_bytes or settings.CRAWL_MAX_BYTES
+        self.user_agent = user_agent or settings.CRAWL_USER_AGENT
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._hosts: Dict[str, _HostGate] = {}
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "Crawler":
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": self.user_agent},
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.client.aclose()
+
+    def _gate(self, url: str) -> _HostGate:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = _HostGate(self.per_host, self.delay)
+        return self._hosts[host]
+
+    async def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FetchResult:
+        """GET (etag/last_modified가 있으면 조건부). 본문이 max_bytes를 넘으면 받다가 중단합니다."""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            async with self._gate(url), self._slots:
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    body = bytearray()
+                    if response.status_code == 200:
+                        async for chunk in response.aiter_bytes():
+                            body.extend(chunk)
+                            if len(body) > self.max_bytes:
+                                return FetchResult(url, 0, error=f"Body exceeds {self.max_bytes} bytes")
+                    return FetchResult(
+                        url, response.status_code, bytes(body),
+                        content_type=response.headers.get("content-type", ""),
+                        # 304 응답에 검증자가 없으면 기존 값 유지
+                        etag=response.headers.get("etag", etag),
+                        last_modified=response.headers.get("last-modified", last_modified),
+                    )
+        except httpx.HTTPError as e:
+            return FetchResult(url, 0, error=f"{type(e).__name__}: {e}")
+
+    async def crawl(self, urls: Iterable[str],
+                    validators: Optional[Mapping[str, Validators]] = None) -> AsyncIterator[FetchResult]:
+        """URL들을 동시에 가져오며 끝나는 순서대로 반환합니다."""
+        validators = validators or {}
+        tasks = [asyncio.ensure_future(self.fetch(url, *validators.get(url, (None, None)))) for url in urls]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def sitemap_urls(self, sitemap_url: str, limit: Optional[int] = None) -> List[str]:
+        """sitemap(.xml/.xml.gz)의 <loc> 목록. sitemap index는 하위 sitemap을 따라갑니다."""
+        limit = limit or settings.CRAWL_MAX_PAGES
+        urls: List[str] = []
+        pending, seen = [sitemap_url], set()
+        while pending and len(urls) < limit:
+            current = pending.pop(0)
+            if current in seen:
+                continue
+            seen.add(current)
+            result = await self.fetch(current)
+            if not result.ok:
+                continue
+            body = gzip.decompress(result.body) if result.body[:2] == b"\x1f\x8b" else result.body
+            try:
+                root = ET.fromstring(body)
+            except ET.ParseError:
+                continue
+            locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+            if root.tag.endswith("sitemapindex"):
+                pending.extend(locs)
+            else:
+                urls.extend(locs)
+        return list(dict.fromkeys(urls))[:limit]
@@ -0,0 +1,88 @@
+"""
+문서 삭제 (set-based)
+
+documents 행만 DELETE 하고 청크(embeddings)는 DB의 ON DELETE CASCADE로 함께 지웁니다.
+ORM의 db.delete(document)는 relationship cascade 때문에 청크(벡터 포함)를 모두 세션에 로드한 뒤
+한 건씩 삭제하므로 사용하지 않습니다.
+대량 삭제는 batch_size개 문서씩 트랜잭션을 나눠 잠금 유지 시간과 한 번에 쌓이는 WAL을 제한합니다.
+"""
+from typing import Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import AppError
+from app.core.logging import logger
+from app.models.document import Document
+from app.services.sharding import delete_shard_documents
+from app.services.vector_index import get_vector_index
+
+BULK_DELETE_BATCH_SIZE = 50
+
+
+class DocumentService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def delete_documents(self, document_ids: Sequence[UUID]) -> List[UUID]:
+        """id 목록의 문서를 삭제하고 커밋합니다 → 실제로 삭제된 id"""
+        if not document_ids:
+            return []
+        result = await self.db.execute(
+            delete(Document)
+            .where(Document.id.in_(document_ids))
+            .returning(Document.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = list(result.scalars().all())
+        await self.db.commit()
+        await self.cleanup(deleted)
+        return deleted
+
+    async def cleanup(self, document_ids: Sequence[UUID]) -> None:
+        """커밋 후 DB 밖의 사본 정리: 샤드의 문서 사본/청크, local 벡터 인덱스 (해당 없으면 no-op)"""
+        if not document_ids:
+            return
+        await delete_shard_documents(document_ids)
+        await get_vector_index(self.db).delete_documents(document_ids)
+
+    @staticmethod
+    def _criteria(document_ids: Optional[Sequence[UUID]], category: Optional[str],
+                  filename_pattern: Optional[str]) -> list:
+        clauses = []
+        if document_ids:
+            clauses.append(Document.id.in_([UUID(str(document_id)) for document_id in document_ids]))
+        if category:
+            clauses.append(Document.category == category)
+        if filename_pattern:
+            clauses.append(Document.filename.like(filename_pattern))
+        return clauses
+
+    async def bulk_delete(self, document_ids: Optional[Sequence[UUID]] = None, category: Optional[str] = None,
+                          filename_pattern: Optional[str] = None, batch_size: int = BULK_DELETE_BATCH_SIZE,
+                          progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+        """
+        조건(AND)에 맞는 문서를 batch_size개씩 삭제합니다. 배치마다 커밋하고 progress(deleted, total)를 호출합니다.
+        조건이 하나도 없으면 전체 삭제를 막기 위해 오류입니다.
+        filename_pattern은 SQL LIKE 패턴입니다 (예: "2024_%.pdf").
+        """
+        clauses = self._criteria(document_ids, category, filename_pattern)
+        if not clauses:
+            raise AppError("Bulk delete requires document_ids, category or filename_pattern", "INVALID_REQUEST")
+
+        total = (await self.db.execute(select(func.count()).select_from(Document).where(*clauses))).scalar()
+        deleted = 0
+        if progress:
+            progress(deleted, total)
+        while True:
+            batch = (await self.db.execute(
+                select(Document.id).where(*clauses).order_by(Document.id).limit(batch_size)
+            )).scalars().all()
+            if not batch:
+                break
+            deleted += len(await self.delete_documents(batch))
+            logger.info(f"🗑️ Bulk delete: {deleted}/{total} documents")
+            if progress:
+                progress(deleted, total)
+        return {"deleted": deleted, "total": total}
@@ -2,42 +2,98 @@ import os
 import json
 import asyncio
 from datetime import datetime
-from typing import List, Optional
-from uuid import uuid4
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, text
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from sqlalchemy import select, delete, text, func, cast, literal, true, BigInteger, Integer, Text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import aliased
 
 from app.models.document import Document, FileStatus
-from app.models.embedding import Embedding
-from app.utils.parsers import parse_file, parse_web_content
-from app.services.vector_service import VectorService
+from app.models.embedding import Embedding, active_embedding_attr, active_embedding_column
+from app.utils.parsers import (
+    TABULAR_EXTENSIONS, parse_file, parse_pdf_pages, parse_table_chunks, parse_web_content, split_pages, text_splitter
+)
+from app.services.vector_service import VectorService, truncate_embedding
+from app.services.vector_index import as_float_list, get_vector_index, mean_embedding
+from app.services.sharding import delete_shard_documents
+from app.services.upload_service import find_indexed
+from app.utils.simhash import BAND_BITS, NEAR_DUP_BANDS, SignatureIndex, simhash, simhash_bands
 from app.core.config import settings
+from app.core.database import shard_router
 from app.core.logging import logger
 from app.core.exceptions import AppError
+from app.core.tracing import start_span
+
+# 한 번에 임베딩/INSERT 하는 청크 수 (기본 embedder는 청크별 호출을 이 수만큼 병렬 실행)
+EMBED_BATCH_SIZE = 10
+
+Embedder = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+async def embed_each(texts: List[str]) -> List[List[float]]:
+    """청크마다 임베딩 API를 호출 (병렬). 실패한 청크는 빈 리스트"""
+    return list(await asyncio.gather(*(VectorService.create_embedding_static(t) for t in texts)))
+
 
 class IngestService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, embedder: Optional[Embedder] = None,
+                 embed_batch_size: int = EMBED_BATCH_SIZE):
         self.db = db
+        # 청크 텍스트 목록 → 벡터 목록. 대량 적재(app.bulk_ingest)는 배치 API + 동시 호출 제한 embedder를 넘김
+        self.embedder = embedder or embed_each
+        self.embed_batch_size = embed_batch_size
+        # 문서/청크를 저장할 세션: 샤딩 시 문서 id의 소유 샤드, 아니면 db와 동일 (db는 카탈로그로 사용)
+        self.chunk_db = db
+        self.index = get_vector_index(db)
+        # 커밋 후 벡터 인덱스에 반영할 변경분 (pgvector 백엔드에서는 no-op)
+        self._pending_vectors: List[Tuple[UUID, List[float], UUID]] = []
+        self._replaced_documents: List[UUID] = []
+        # 이번 문서에서 적재한 청크의 SimHash → (원본 청크 id, 벡터) — 문서 내부 근사 중복 비교용
+        self._signatures = SignatureIndex()
 
-    async def process_document(self, file_path: str, source_type: str = "file") -> bool:
+    async def process_document(self, file_path: str, source_type: str = "file",
+                               content_hash: Optional[str] = None, content: Optional[str] = None,
+                               filename: Optional[str] = None, chunks: Optional[List[str]] = None,
+                               page_numbers: Optional[List[int]] = None,
+                               progress: Optional[Callable[[int, int], None]] = None) -> bool:
         """
         파일을 파싱하고, 임베딩을 생성하여 DB에 저장합니다.
         이미 존재하는 파일명일 경우 덮어씁니다 (기존 데이터 삭제).
+        같은 파일명·같은 content_hash(원본 SHA-256)의 문서가 이미 적재되어 있으면 건너뜁니다 (업로드 직후 중복 요청 대비).
+        content를 주면 파싱을 생략하고(다른 프로세스에서 파싱한 경우), filename으로 문서 이름을 지정할 수 있습니다.
+        표 형식(XLSX/XLS/CSV)은 헤더를 반복한 행 묶음이 그대로 청크가 됩니다 (chunks로 미리 줄 수도 있음).
+        PDF는 페이지별로 추출/분할해 청크 메타데이터에 page_number를 남기며, progress(완료 페이지, 전체 페이지)를 호출합니다.
         """
         
-        filename = os.path.basename(file_path)
+        filename = filename or os.path.basename(file_path)
         logger.info(f"Starting ingestion for file: {filename}")
         
         try:
+            if content_hash and await find_indexed(self.db, content_hash, filename):
+                logger.info(f"⏭️ Identical file already indexed, skipping: {filename}")
+                return True
+
             # 1. Parse Content (Run in thread pool to avoid blocking event loop)
-            if source_type == "web":
-                # Network I/O is less blocking, but parsing HTML can be CPU bound
-                content = await asyncio.to_thread(parse_web_content, file_path)
-            else:
-                # PDF/HWP parsing is heavily CPU bound
-                content = await asyncio.to_thread(parse_file, file_path)
+            with start_span("ingest.parse", filename=filename, source_type=source_type):
+                if content is not None:
+                    pass  # 이미 파싱됨 (app.bulk_ingest의 프로세스 풀)
+                elif source_type == "web":
+                    # Network I/O is less blocking, but parsing HTML can be CPU bound
+                    content = await asyncio.to_thread(parse_web_content, file_path)
+                elif os.path.splitext(file_path)[1].lower() == ".pdf":
+                    # 페이지 구간 병렬 추출 (변경되지 않은 페이지는 캐시 사용)
+                    pages = await asyncio.to_thread(parse_pdf_pages, file_path, progress)
+                    chunks, page_numbers = await asyncio.to_thread(split_pages, pages)
+                    content = "\n\n".join(pages)
+                elif os.path.splitext(file_path)[1].lower() in TABULAR_EXTENSIONS:
+                    # 스트리밍 표 파싱: 헤더를 반복한 행 묶음이 그대로 청크
+                    chunks = await asyncio.to_thread(parse_table_chunks, file_path)
+                    content = "\n\n".join(chunks)
+                else:
+                    # PDF/HWP parsing is heavily CPU bound
+                    content = await asyncio.to_thread(parse_file, file_path)
 
             if not content or len(content.strip()) < 10:
                 logger.warning(f"Content empty or too short: {filename}")
@@ -46,93 +102,152 @@ class IngestService:
             # Transaction Block
             async with self.db.begin_nested(): # Savepoint for partial rollback if needed, though we rely on main session
                 # 2. Check Duplicate & Delete Existing
-                await self._delete_existing_document(filename)
+                with start_span("ingest.delete_existing", filename=filename):
+                    await self._delete_existing_document(filename)
 
                 # 3. Classify
-                category = await VectorService.classify_content(filename, content)
+                with start_span("ingest.classify", filename=filename):
+                    category = await VectorService.classify_content(filename, content)
 
-                # 4. Create Document Record
+                # 4. Create Document Record (샤딩 시 문서 사본과 청크는 소유 샤드에 저장)
                 file_size = len(content.encode('utf-8'))
                 doc = Document(
+                    id=uuid4(),
                     filename=filename,
                     file_type=source_type,
                     file_size=file_size,
                     category=category,
+                    content_hash=content_hash,
                     status=FileStatus.PROCESSING
                 )
-                self.db.add(doc)
-                await self.db.flush() # Get ID
+                self.chunk_db = self._chunk_session(doc.id)
+                self.chunk_db.add(doc)
+                await self.chunk_db.flush()
                 
                 # 5. Chunking
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=settings.CHUNK_SIZE,
-                    chunk_overlap=settings.CHUNK_OVERLAP,
-                    separators=["\n\n", "\n", ". ", " ", ""]
-                )
-                chunks = text_splitter.split_text(content)
+                with start_span("ingest.chunk", filename=filename) as span:
+                    if chunks is None:
+                        chunks = text_splitter().split_text(content)
+                    if span is not None:
+                        span.set_attribute("ingest.chunk_count", len(chunks))
                 logger.info(f"Split {filename} into {len(chunks)} chunks")
                 
                 # 6. Embed & Save Chunks
-                await self._process_chunks(doc, chunks, content)
+                with start_span("ingest.embed_and_insert", filename=filename, chunk_count=len(chunks)):
+                    await self._process_chunks(doc, chunks, content, page_numbers)
+                doc.summary_embedding = mean_embedding([vector for _, vector, _ in self._pending_vectors])
 
                 # 7. Update Full-Text Search Vector (TSVECTOR)
                 # Note: We do this after inserting chunks. 
                 # Ideally, we update each chunk's content_search column.
                 # Since we are inside a transaction, we can execute a SQL update.
-                await self.db.flush() # Ensure embeddings are in session
-                await self._update_tsvectors(doc.id)
+                with start_span("ingest.update_tsvector", filename=filename):
+                    await self.chunk_db.flush() # Ensure embeddings are in session
+                    await self._update_tsvectors(doc.id)
 
                 # 8. Update Status
                 doc.status = FileStatus.COMPLETED
+                if self.chunk_db is not self.db:
+                    # primary에는 목록/파일명 중복 확인/삭제용 카탈로그 행만 저장
+                    self.db.add(self._catalog_row(doc))
                 logger.info(f"Ingestion completed successfully for: {filename}")
             
+            # 샤드 먼저 커밋: primary 커밋이 실패하면 카탈로그에 없는 사본이 남지만, 같은 파일 재적재 시 교체됨
+            if self.chunk_db is not self.db:
+                await self.chunk_db.commit()
             await self.db.commit()
+            await self._sync_vector_index()
             return True
 
         except Exception as e:
+            if self.chunk_db is not self.db:
+                await self.chunk_db.rollback()
             await self.db.rollback()
+            self._pending_vectors, self._replaced_documents, self._signatures = [], [], SignatureIndex()
             logger.error(f"Failed to ingest document {filename}: {str(e)}", exc_info=True)
             # Re-raise as AppError if it's not already one, or let global handler catch it
             if isinstance(e, AppError):
                 raise e
             raise AppError(f"Document processing failed: {str(e)}")
+        finally:
+            if self.chunk_db is not self.db:
+                await self.chunk_db.close()
+                self.chunk_db = self.db
+
+    def _chunk_session(self, document_id: UUID) -> AsyncSession:
+        if not shard_router.enabled:
+            return self.db
+        return shard_router.session(shard_router.shard_for(document_id))
+
+    @staticmethod
+    def _catalog_row(doc: Document) -> Document:
+        return Document(
+            id=doc.id, filename=doc.filename, file_type=doc.file_type, file_size=doc.file_size,
+            category=doc.category, status=doc.status, content_hash=doc.content_hash
+        )
 
     async def _delete_existing_document(self, filename: str):
-        result = await self.db.execute(select(Document).where(Document.filename == filename))
-        existing_doc = result.scalars().first()
-        if existing_doc:
+        # set-based DELETE (청크는 ON DELETE CASCADE) — ORM delete는 청크를 모두 로드함
+        result = await self.db.execute(
+            delete(Document)
+            .where(Document.filename == filename)
+            .returning(Document.id)
+            .execution_options(synchronize_session=False)
+        )
+        replaced = list(result.scalars().all())
+        if replaced:
             logger.info(f"Removing existing document: {filename}")
-            await self.db.delete(existing_doc)
+            self._replaced_documents.extend(replaced)
+
+    async def _sync_vector_index(self):
+        """커밋된 변경분을 샤드/벡터 인덱스에 반영 (삭제된 이전 문서 → 새 청크 순)"""
+        pending, replaced = self._pending_vectors, self._replaced_documents
+        self._pending_vectors, self._replaced_documents, self._signatures = [], [], SignatureIndex()
+        if replaced:
+            await delete_shard_documents(replaced)
+            await self.index.delete_documents(replaced)
+        if pending:
+            ids, vectors, document_ids = zip(*pending)
+            await self.index.add(ids, vectors, document_ids)
 
-    async def _process_chunks(self, doc: Document, chunks: List[str], full_content: str):
+    async def _process_chunks(self, doc: Document, chunks: List[str], full_content: str,
+                              page_numbers: Optional[List[int]] = None):
         base_metadata = {
             "document_id": str(doc.id),
             "filename": doc.filename,
             "category": doc.category,
         }
 
-        BATCH_SIZE = 10
+        batch_size = self.embed_batch_size
         total_chunks = len(chunks)
 
-        for i in range(0, total_chunks, BATCH_SIZE):
-            batch_chunks = chunks[i:i + BATCH_SIZE]
-            tasks = []
+        for i in range(0, total_chunks, batch_size):
+            batch_chunks = chunks[i:i + batch_size]
+            signatures = [simhash(chunk) for chunk in batch_chunks] if settings.NEAR_DUP_MODE != "off" else []
+            duplicates = await self._find_near_duplicates(signatures)
+            # 너무 짧은 청크는 건너뜀 (None)
+            embeddings_results: List[Optional[List[float]]] = [None] * len(batch_chunks)
+            to_embed = []
             
-            for chunk in batch_chunks:
+            for j, chunk in enumerate(batch_chunks):
                 if len(chunk.strip()) < 10: 
-                    # Placeholder to maintain index sync if needed, or just skip. 
-                    # If skipping, we just won't have an embedding for this snippet.
-                    tasks.append(asyncio.sleep(0)) 
                     continue
-                tasks.append(VectorService.create_embedding_static(chunk))
+                if settings.NEAR_DUP_MODE == "link" and duplicates.get(j, (None, None))[1] is not None:
+                    # 원본 청크 벡터 재사용 → 임베딩 호출 생략
+                    embeddings_results[j] = duplicates[j][1]
+                    continue
+                to_embed.append(j)
             
-            # Run batch in parallel
-            embeddings_results = await asyncio.gather(*tasks)
+            # Embed batch (기본: 청크별 병렬 호출)
+            if to_embed:
+                vectors = await self.embedder([batch_chunks[j] for j in to_embed])
+                for j, vector in zip(to_embed, vectors):
+                    embeddings_results[j] = vector
 
             # Process results
             for j, embedding_vector in enumerate(embeddings_results):
-                # Skip if it was a skipped chunk (asyncio.sleep result is None usually or 0, depending on sleep)
-                if embedding_vector is None or isinstance(embedding_vector, int): 
+                # Skip if it was a skipped chunk
+                if embedding_vector is None: 
                     continue
                     
                 if not embedding_vector:
@@ -144,15 +259,65 @@ class IngestService:
                 
                 chunk_metadata = base_metadata.copy()
                 chunk_metadata["chunk_index"] = chunk_idx
+                if page_numbers:
+                    chunk_metadata["page_number"] = page_numbers[chunk_idx]
+
+                near_dup = {}
+                if signatures:
+                    # 같은 배치의 앞선 청크는 조회 시점에 없었으므로 여기서 비교
+                    duplicate_of = duplicates[j][0] if j in duplicates else self._match_signature(signatures[j])
+                    near_dup = {
+                        "simhash": signatures[j],
+                        "simhash_bands": simhash_bands(signatures[j]),
+                        "duplicate_of": duplicate_of,
+                    }
 
                 embedding_entry = Embedding(
+                    id=uuid4(),
                     document_id=doc.id,
                     chunk_index=chunk_idx,
                     content=chunk_content,
-                    embedding=embedding_vector,
-                    metadata_info=chunk_metadata 
+                    metadata_info=chunk_metadata,
+                    # VECTOR_STORAGE의 활성 컬럼(embedding 또는 embedding_half)에만 저장
+                    **{active_embedding_attr(): embedding_vector},
+                    embedding_short=truncate_embedding(embedding_vector, settings.MATRYOSHKA_DIM),
+                    **near_dup
                 )
-                self.db.add(embedding_entry)
+                self.chunk_db.add(embedding_entry)
+                self._pending_vectors.append((embedding_entry.id, embedding_vector, doc.id))
+                if signatures:
+                    self._signatures.add(signatures[j], (duplicate_of or embedding_entry.id, embedding_vector))
+
+    def _match_signature(self, signature: int) -> Optional[UUID]:
+        """이번 문서에서 이미 적재한 청크 중 근사 중복의 원본 id"""
+        match = self._signatures.find(signature, settings.NEAR_DUP_MAX_DISTANCE)
+        return match[0] if match else None
+
+    async def _find_near_duplicates(self, signatures: List[int]) -> Dict[int, Tuple[UUID, Optional[List[float]]]]:
+        """
+        배치의 SimHash별로 이미 적재된 근사 중복 청크를 찾습니다 → {배치 내 위치: (원본 청크 id, 원본 벡터)}.
+        같은 문서의 앞선 배치 청크(미커밋)는 메모리 색인(SignatureIndex)에서 먼저 찾고,
+        나머지는 near_duplicate_query로 SimHash마다 DB에서 한 건씩 조회합니다.
+        원본이 이미 다른 청크의 중복이면 그 원본을 가리키며, 원본 벡터는 NEAR_DUP_MODE=link일 때만 조회합니다.
+        """
+        if not signatures:
+            return {}
+        link = settings.NEAR_DUP_MODE == "link"
+        duplicates: Dict[int, Tuple[UUID, Optional[List[float]]]] = {}
+        for j, signature in enumerate(signatures):
+            match = self._signatures.find(signature, settings.NEAR_DUP_MAX_DISTANCE)
+            if match:
+                duplicates[j] = (match[0], match[1] if link else None)
+
+        pending = [j for j in range(len(signatures)) if j not in duplicates]
+        if pending:
+            stmt = near_duplicate_query([signatures[j] for j in pending], settings.NEAR_DUP_MAX_DISTANCE, link)
+            for row in (await self.chunk_db.execute(stmt)).all():
+                vector = as_float_list(row[3]) if link and row[3] is not None else None
+                duplicates[pending[row.pos - 1]] = (row.duplicate_of or row.id, vector)
+        if duplicates:
+            logger.info(f"🔁 {len(duplicates)}/{len(signatures)} chunks are near-duplicates ({settings.NEAR_DUP_MODE})")
+        return duplicates
 
     async def _update_tsvectors(self, document_id):
         """
@@ -165,4 +330,71 @@ class IngestService:
             SET content_search = to_tsvector('simple', content)
             WHERE document_id = :doc_id
         """)
-        await self.db.execute(sql, {"doc_id": document_id})
+        await self.chunk_db.execute(sql, {"doc_id": document_id})
+
+
+def _simhash_bands_sql(signature):
+    """SQL에서 app.utils.simhash.simhash_bands와 같은 구간 배열 (bigint 산술 시프트 후 하위 비트만 사용)"""
+    mask = (1 << BAND_BITS) - 1
+    return postgresql.array([
+        cast(literal(band << BAND_BITS, BigInteger).op("|")(signature.op(">>")(band * BAND_BITS).op("&")(mask)), Integer)
+        for band in range(NEAR_DUP_BANDS)
+    ])
+
+
+def _hamming_distance_sql(a, b):
+    return func.length(func.replace(cast(cast(a.op("#")(b), postgresql.BIT(64)), Text), "0", ""))
+
+
+def near_duplicate_query(signatures: List[int], max_distance: int, with_vector: bool = False):
+    """
+    SimHash마다 해밍 거리 max_distance 이하인 적재된 청크 하나 → (pos: 1부터 시작하는 signatures 위치, id, duplicate_of[, 벡터]).
+    SimHash별 LATERAL 서브쿼리가 구간 겹침(GIN 인덱스)으로 후보를 좁히고 해밍 거리까지 DB에서 확인한 뒤 LIMIT 1로 끝나므로,
+    상용구처럼 흔한 구간 값이 있어도 다른 SimHash의 후보를 밀어내지 않습니다.
+    """
+    signature_rows = (
+        func.unnest(cast(signatures, postgresql.ARRAY(BigInteger)))
+        .table_valued("sig", with_ordinality="pos")
+        .render_derived(name="s")
+    )
+    columns = [Embedding.id, Embedding.duplicate_of]
+    if with_vector:
+        columns.append(active_embedding_column())
+    match = (
+        select(*columns)
+        .where(
+            Embedding.simhash_bands.overlap(_simhash_bands_sql(signature_rows.c.sig)),
+            _hamming_distance_sql(Embedding.simhash, signature_rows.c.sig) <= max_distance,
+        )
+        .limit(1)
+        .lateral("m")
+    )
+    return select(signature_rows.c.pos, *match.c).select_from(signature_rows).join(match, true())
+
+
+def near_duplicate_pairs_query(after: Optional[UUID], page_size: int, max_distance: int):
+    """
+    id 순서로 after 다음 page_size개 청크마다 해밍 거리 max_distance 이하이고 id가 더 큰 청크 → (id, match_id).
+    매칭이 없는 청크도 match_id=NULL로 한 행씩 나오므로 마지막 id를 다음 페이지의 after로 씁니다 (keyset).
+    각 쌍은 id가 작은 쪽 페이지에서 한 번만 나옵니다.
+    """
+    page = select(Embedding.id, Embedding.simhash, Embedding.simhash_bands).where(Embedding.simhash.is_not(None))
+    if after is not None:
+        page = page.where(Embedding.id > after)
+    page = page.order_by(Embedding.id).limit(page_size).subquery("s")
+    other = aliased(Embedding)
+    match = (
+        select(other.id)
+        .where(
+            other.simhash_bands.overlap(page.c.simhash_bands),
+            _hamming_distance_sql(other.simhash, page.c.simhash) <= max_distance,
+            other.id > page.c.id,
+        )
+        .lateral("m")
+    )
+    return (
+        select(page.c.id, match.c.id.label("match_id"))
+        .select_from(page)
+        .outerjoin(match, true())
+        .order_by(page.c.id)
+    )
@@ -0,0 +1,44 @@
+import time
+from typing import List, Optional
+
+
+class LatencyBudget:
+    """
+    요청 단위 End-to-End 마감 시간(Deadline)
+
+    ChatService의 각 단계는 시작 전에 남은 시간을 확인하고, 부족하면 정해진 순서대로
+    기능을 줄입니다 (쿼리 확장 → 키워드 검색 → 재순위화 → k 축소 → 검색 결과만 반환).
+    검색/재순위화/생성 호출 자체도 남은 시간 안에서만 기다리며, 검색은 시간 안에 끝난 레그(벡터/키워드)
+    결과만으로 진행하고 두 레그 모두 끝나지 않은 경우에만 결과 없이 응답합니다 (search_timeout).
+    적용된 강등(degradation)은 degradations에 기록되어 응답 metadata로 전달됩니다.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + seconds if seconds and seconds > 0 else None
+        self.degradations: List[str] = []
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return float("inf")
+        return self.deadline - time.monotonic()
+
+    def allows(self, required_seconds: float) -> bool:
+        """남은 시간이 required_seconds 이상이면 True"""
+        return self.remaining() >= required_seconds
+
+    def timeout(self, reserve_seconds: float = 0.0) -> Optional[float]:
+        """
+        asyncio.wait_for에 넘길 timeout. 이후 단계를 위해 reserve_seconds 만큼 남겨둡니다.
+        마감 시간이 없으면 None(무제한).
+        """
+        if self.deadline is None:
+            return None
+        return max(self.remaining() - reserve_seconds, 0.0)
+
+    def degrade(self, name: str) -> None:
+        if name not in self.degradations:
+            self.degradations.append(name)
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started_at) * 1000
@@ -0,0 +1,88 @@
+"""
+근사 중복 청크 리포트
+
+적재 시 저장한 SimHash(embeddings.simhash)로 코퍼스 전체의 근사 중복 클러스터를 계산합니다.
+적재 시점의 duplicate_of 링크와 달리 백필된 기존 청크와 NEAR_DUP_MODE=off 이후 적재분 사이의 중복도 포함됩니다.
+청크를 id 순서로 PAGE_SIZE개씩 훑으며 구간 겹침(GIN 인덱스) LATERAL 쿼리로 근사 중복 쌍만 가져오므로,
+메모리에는 코퍼스 전체가 아니라 중복 쌍만 올라갑니다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.document import Document
+from app.models.embedding import Embedding
+from app.utils.simhash import cluster_pairs
+
+PREVIEW_LENGTH = 200
+PAGE_SIZE = 1000
+
+
+class NearDupService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def cluster_report(self, limit: int = 50, max_distance: Optional[int] = None) -> Dict[str, Any]:
+        """크기순 상위 limit개 클러스터와 코퍼스 전체 중복 통계"""
+        max_distance = settings.NEAR_DUP_MAX_DISTANCE if max_distance is None else max_distance
+        # 적재 모듈(파서 등)은 쿼리 경로 콜드 스타트에 포함되지 않도록 사용할 때 import
+        from app.services.ingest_service import near_duplicate_pairs_query
+
+        pairs: List[Tuple[UUID, UUID]] = []
+        total_chunks, after = 0, None
+        while True:
+            page = (await self.db.execute(near_duplicate_pairs_query(after, PAGE_SIZE, max_distance))).all()
+            if not page:
+                break
+            page_ids = {row.id for row in page}
+            total_chunks += len(page_ids)
+            pairs.extend((row.id, row.match_id) for row in page if row.match_id is not None)
+            after = page[-1].id
+            if len(page_ids) < PAGE_SIZE:
+                break
+        clusters = cluster_pairs(pairs)
+
+        top = clusters[:limit]
+        chunk_ids = [chunk_id for cluster in top for chunk_id in cluster]
+        details = {}
+        if chunk_ids:
+            result = await self.db.execute(
+                select(
+                    Embedding.id, Embedding.chunk_index, Embedding.duplicate_of, Document.filename,
+                    func.left(Embedding.content, PREVIEW_LENGTH).label("preview"),
+                )
+                .join(Document, Embedding.document_id == Document.id)
+                .where(Embedding.id.in_(chunk_ids))
+            )
+            details = {row.id: row for row in result}
+
+        report = []
+        for cluster in top:
+            members = [details[chunk_id] for chunk_id in cluster if chunk_id in details]
+            if not members:
+                continue
+            # 대표 청크: 다른 청크의 중복으로 기록되지 않은 원본 우선
+            representative = next((m for m in members if m.duplicate_of is None), members[0])
+            report.append({
+                "size": len(cluster),
+                "documents": sorted({m.filename for m in members}),
+                "representative": {
+                    "chunk_id": representative.id,
+                    "filename": representative.filename,
+                    "chunk_index": representative.chunk_index,
+                    "preview": representative.preview,
+                },
+                "chunk_ids": cluster,
+            })
+
+        return {
+            "max_distance": max_distance,
+            "total_chunks": total_chunks,
+            "cluster_count": len(clusters),
+            # 클러스터마다 1개를 원본으로 보고 나머지를 중복으로 집계
+            "duplicate_chunks": sum(len(cluster) - 1 for cluster in clusters),
+            "clusters": report,
+        }
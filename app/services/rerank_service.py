@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.core.logging import logger
 
 class RerankResult:
-    def __init__(self, document_id: str, content: str, score: float, filename: str):
+    def __init__(self, document_id: str, content: str, score: float, filename: str, chunk_id: Optional[str] = None):
         self.document_id: str = document_id
         self.content: str = content
         self.score: float = score
         self.filename: str = filename
+        self.chunk_id: Optional[str] = chunk_id
 
 class BaseReranker(ABC):
     """
@@ -55,7 +56,8 @@ class KeywordReranker(BaseReranker):
                 document_id=str(doc.get('document_id')),
                 content=content,
                 score=final_score,
-                filename=str(doc.get('filename'))
+                filename=str(doc.get('filename')),
+                chunk_id=doc.get('chunk_id')
             ))
 
         # 4. 점수(Score) 내림차순 정렬 (점수가 높을수록 유사함)
@@ -0,0 +1,80 @@
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.search import (
+    SearchFilters, SearchResponse, SearchResultItem, ChunkScores
+)
+from app.services.vector_service import VectorService, SearchHit
+from app.services.rerank_service import KeywordReranker
+from app.core.logging import logger
+
+class SearchService:
+    """
+    Retrieval-only 검색 (쿼리 확장/답변 생성 없음)
+    VectorService의 하이브리드 검색 결과에 재순위화와 페이지네이션을 적용합니다.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.vector_service = VectorService(db)
+        self.reranker = KeywordReranker(boost_weight=0.3)
+
+    async def search(self, query: str, top_k: int = 10, offset: int = 0,
+                     filters: Optional[SearchFilters] = None, rerank: bool = True,
+                     ef_search: Optional[int] = None) -> SearchResponse:
+        # offset 이후 페이지까지 포함하도록 후보 풀을 잡은 뒤 재순위화 → 슬라이스
+        hits = await self.vector_service.search_hybrid_scored(
+            query, top_k=offset + top_k, filters=filters, ef_search=ef_search
+        )
+        items = await self._to_items(query, hits, rerank)
+        return SearchResponse(query=query, offset=offset, top_k=top_k, results=items[offset:offset + top_k],
+                              missing_shards=self.vector_service.missing_shards)
+
+    async def search_batch(self, queries: List[str], top_k: int = 10,
+                           filters: Optional[SearchFilters] = None, rerank: bool = True,
+                           ef_search: Optional[int] = None) -> List[SearchResponse]:
+        hits_per_query = await self.vector_service.search_batch(
+            queries, top_k=top_k, filters=filters, ef_search=ef_search
+        )
+        logger.info(f"Batch search: {len(queries)} queries")
+        responses = []
+        for query, hits in zip(queries, hits_per_query):
+            items = await self._to_items(query, hits, rerank)
+            responses.append(SearchResponse(query=query, offset=0, top_k=top_k, results=items[:top_k],
+                                            missing_shards=self.vector_service.missing_shards))
+        return responses
+
+    async def _to_items(self, query: str, hits: List[SearchHit], rerank: bool) -> List[SearchResultItem]:
+        rerank_scores = {}
+        if rerank and hits:
+            candidate_input = [{
+                "chunk_id": str(hit.chunk_id),
+                "document_id": str(hit.document.id),
+                "content": hit.embedding.content,
+                "score": hit.rrf_score,
+                "filename": hit.document.filename,
+            } for hit in hits]
+            reranked = await self.reranker.rerank(query, candidate_input)
+            rerank_scores = {r.chunk_id: r.score for r in reranked}
+
+        items = []
+        for hit in hits:
+            rerank_score = rerank_scores.get(str(hit.chunk_id))
+            items.append(SearchResultItem(
+                chunk_id=hit.chunk_id,
+                document_id=hit.document.id,
+                filename=hit.document.filename,
+                category=hit.document.category,
+                chunk_index=hit.embedding.chunk_index,
+                content=hit.embedding.content,
+                score=rerank_score if rerank_score is not None else hit.rrf_score,
+                scores=ChunkScores(
+                    vector_distance=hit.vector_distance,
+                    vector_rank=hit.vector_rank,
+                    keyword_rank=hit.keyword_rank,
+                    rrf=hit.rrf_score,
+                    rerank=rerank_score,
+                ),
+                metadata=hit.embedding.metadata_info,
+            ))
+        items.sort(key=lambda item: item.score, reverse=True)
+        return items
@@ -0,0 +1,71 @@
+"""
+벡터 샤드 scatter-gather
+
+VECTOR_SHARDS가 설정되면 문서(사본)와 청크는 document_id 해시로 정해진 샤드 DB 하나에 저장되고,
+primary의 documents 테이블은 목록/파일명 중복 확인/삭제용 카탈로그로 남습니다.
+검색은 모든 샤드에 동시에 레그별(벡터/키워드) 상위 후보를 요청한 뒤 전역으로 합쳐 RRF를 적용합니다.
+- 벡터 레그: 같은 거리 척도이므로 거리순으로 병합 (단일 DB에서 구한 순위와 동일)
+- 키워드 레그: 점수가 없으므로 샤드별 순위를 번갈아 병합
+- SHARD_SEARCH_TIMEOUT_SECONDS 안에 응답하지 않거나 실패한 샤드는 제외 (부분 결과)
+"""
+import asyncio
+import heapq
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import delete
+
+from app.core.logging import logger
+from app.models.document import Document
+
+T = TypeVar("T")
+
+
+async def scatter(calls: Sequence[Callable[[], Awaitable[T]]], timeout: float) -> Tuple[Dict[int, T], List[int]]:
+    """
+    샤드별 호출을 동시에 실행합니다 → ({샤드 번호: 결과}, [실패/시간 초과한 샤드 번호]).
+    timeout은 샤드마다 적용되며, 한 샤드의 실패가 다른 샤드 결과에 영향을 주지 않습니다.
+    """
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        return await asyncio.wait_for(call(), timeout) if timeout and timeout > 0 else await call()
+
+    outcomes = await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+    results: Dict[int, T] = {}
+    failed: List[int] = []
+    for shard, outcome in enumerate(outcomes):
+        if isinstance(outcome, BaseException):
+            reason = "timed out" if isinstance(outcome, asyncio.TimeoutError) else repr(outcome)
+            logger.warning(f"Vector shard {shard} {reason}, returning partial results")
+            failed.append(shard)
+        else:
+            results[shard] = outcome
+    return results, failed
+
+
+def merge_vector_results(per_shard: Iterable[List[Tuple[Hashable, float]]], limit: int) -> List[Tuple[Hashable, float]]:
+    """샤드별 (id, 거리) 목록(거리 오름차순)을 전역 거리순 상위 limit개로 병합"""
+    return list(heapq.merge(*per_shard, key=lambda item: item[1]))[:limit]
+
+
+def merge_keyword_results(per_shard: Iterable[List[Hashable]], limit: int) -> List[Hashable]:
+    """샤드별 키워드 순위를 같은 순위끼리 번갈아 병합 (샤드 0의 1위, 샤드 1의 1위, ..., 샤드 0의 2위, ...)"""
+    lists = list(per_shard)
+    merged: List[Hashable] = []
+    for rank in range(max((len(items) for items in lists), default=0)):
+        merged.extend(items[rank] for items in lists if rank < len(items))
+    return merged[:limit]
+
+
+async def delete_shard_documents(document_ids: Sequence[UUID]) -> None:
+    """카탈로그(primary)에서 삭제된 문서의 사본/청크를 각 소유 샤드에서 삭제합니다 (샤딩이 꺼져 있으면 no-op)."""
+    from app.core.database import shard_router
+
+    if not shard_router.enabled or not document_ids:
+        return
+    by_shard: Dict[int, List[UUID]] = {}
+    for document_id in document_ids:
+        by_shard.setdefault(shard_router.shard_for(document_id), []).append(document_id)
+    for shard, ids in by_shard.items():
+        async with shard_router.session(shard) as db:
+            await db.execute(delete(Document).where(Document.id.in_(ids)))
+            await db.commit()
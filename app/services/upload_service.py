@@ -0,0 +1,251 @@
+"""
+업로드 저장 / 재개 가능한(resumable) 청크 업로드
+
+- save_stream: 업로드 본문을 UPLOAD_CHUNK_SIZE 단위로 읽어 임시 파일에 쓰면서 SHA-256을 함께 계산하고,
+  끝나면 UPLOAD_DIR/파일명으로 원자적으로 교체합니다. 디스크 쓰기는 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+- 재개 업로드: 세션 생성(upload_id) → offset을 지정해 이어 쓰기 → 완료 시 해시 계산 후 UPLOAD_DIR로 이동.
+  연결이 끊기면 현재 offset을 조회해 그 위치부터 다시 보냅니다.
+  상태는 UPLOAD_DIR/.uploads 아래 파일로만 관리하므로, 같은 디렉터리를 공유하는 API 워커 어디로 보내도 됩니다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Protocol, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.models.document import Document, FileStatus
+
+PARTIAL_DIR_NAME = ".uploads"
+HASH_READ_SIZE = 8 * 1024 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, status_code: int, detail: str, offset: Optional[int] = None):
+        self.status_code = status_code
+        self.detail = detail
+        # offset 불일치 시 클라이언트가 이어서 보내야 할 위치
+        self.offset = offset
+        super().__init__(detail)
+
+
+class AsyncReadable(Protocol):
+    def read(self, size: int = -1) -> Awaitable[bytes]: ...
+
+
+def safe_filename(filename: Optional[str]) -> str:
+    """경로 구분자를 제거한 파일명 (UPLOAD_DIR 밖으로 쓰지 않도록)"""
+    name = os.path.basename((filename or "").replace("\\", "/"))
+    if name in ("", ".", "..") or name.startswith("."):
+        raise UploadError(400, f"Invalid filename: {filename!r}")
+    return name
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_READ_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def find_indexed(db: AsyncSession, content_hash: str, filename: str) -> Optional[Document]:
+    """
+    같은 파일명·같은 내용(SHA-256)으로 적재가 완료된 문서.
+    내용이 같아도 파일명이 다르면 별도 문서로 적재하고, 같은 파일명의 내용이 바뀌었으면 재적재(덮어쓰기)합니다.
+    """
+    result = await db.execute(
+        select(Document)
+        .where(
+            Document.filename == filename,
+            Document.content_hash == content_hash,
+            Document.status == FileStatus.COMPLETED,
+        )
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+class UploadService:
+    def __init__(self, upload_dir: Optional[str] = None, chunk_size: Optional[int] = None):
+        self.upload_dir = upload_dir or settings.UPLOAD_DIR
+        self.partial_dir = os.path.join(self.upload_dir, PARTIAL_DIR_NAME)
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+
+    async def save_stream(self, source: AsyncReadable, filename: str) -> Tuple[str, int, str]:
+        """source(UploadFile 등)를 UPLOAD_DIR/filename에 저장 → (경로, 크기, sha256)"""
+        path = os.path.join(self.upload_dir, safe_filename(filename))
+        os.makedirs(self.partial_dir, exist_ok=True)
+        # 같은 파일시스템의 임시 파일에 쓴 뒤 교체: 쓰는 도중에도 기존 파일은 온전함
+        tmp_path = os.path.join(self.partial_dir, f"{uuid.uuid4().hex}.stream")
+        digest = hashlib.sha256()
+        size = 0
+        f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            while chunk := await source.read(self.chunk_size):
+                await asyncio.to_thread(_write_and_hash, f, digest, chunk)
+                size += len(chunk)
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            f.close()
+            _remove(tmp_path)
+            raise
+        return path, size, digest.hexdigest()
+
+    # --- Resumable upload ---
+
+    def _paths(self, upload_id: str) -> Tuple[str, str]:
+        try:
+            upload_id = uuid.UUID(upload_id).hex
+        except (ValueError, AttributeError, TypeError):
+            raise UploadError(404, "Upload not found")
+        base = os.path.join(self.partial_dir, upload_id)
+        return f"{base}.part", f"{base}.json"
+
+    def _load_meta(self, upload_id: str) -> Dict[str, Any]:
+        data_path, meta_path = self._paths(upload_id)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            raise UploadError(404, "Upload not found or expired")
+        meta["offset"] = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+        return meta
+
+    async def create(self, filename: str, size: int) -> Dict[str, Any]:
+        """재개 업로드 세션 생성 → {upload_id, filename, size, offset, chunk_size}"""
+        if size < 0:
+            raise UploadError(400, "size must be >= 0")
+        filename = safe_filename(filename)
+        await asyncio.to_thread(self.cleanup_expired)
+        upload_id = uuid.uuid4().hex
+        data_path, meta_path = self._paths(upload_id)
+        meta = {"upload_id": upload_id, "filename": filename, "size": size, "created_at": time.time()}
+
+        def _create():
+            os.makedirs(self.partial_dir, exist_ok=True)
+            open(data_path, "wb").close()
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        await asyncio.to_thread(_create)
+        return {**meta, "offset": 0, "chunk_size": settings.RESUMABLE_UPLOAD_CHUNK_SIZE}
+
+    async def status(self, upload_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._load_meta, upload_id)
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """
+        offset 위치부터 이어 씁니다. offset은 현재까지 받은 크기와 같아야 합니다(409 + 현재 offset).
+        전송 도중 연결이 끊겨도 그때까지 받은 바이트는 남으므로, 상태 조회 후 이어서 보내면 됩니다.
+        같은 업로드에 동시에 쓰는 요청은 409로 거절합니다.
+        """
+        meta = await asyncio.to_thread(self._load_meta, upload_id)
+        data_path, _ = self._paths(upload_id)
+        f = await asyncio.to_thread(open, data_path, "r+b")
+        try:
+            try:
+                lock_nonblocking(f)
+            except BlockingIOError:
+                raise UploadError(409, "Another request is writing this upload")
+            current = os.fstat(f.fileno()).st_size
+            if offset != current:
+                raise UploadError(409, f"Offset mismatch: expected {current}", offset=current)
+            f.seek(current)
+            async for chunk in chunks:
+                if current + len(chunk) > meta["size"]:
+                    raise UploadError(413, f"Upload exceeds declared size {meta['size']}", offset=current)
+                await asyncio.to_thread(f.write, chunk)
+                current += len(chunk)
+            await asyncio.to_thread(f.flush)
+        finally:
+            f.close()
+        meta["offset"] = current
+        return meta
+
+    async def complete(self, upload_id: str) -> Tuple[str, int, str]:
+        """
+        받은 크기가 선언한 크기와 같으면 UPLOAD_DIR/파일명으로 이동 → (경로, 크기, sha256).
+        append와 같은 잠금을 잡으므로, 쓰는 중이거나 다른 요청이 완료 처리 중이면 409입니다.
+        """
+        meta = await asyncio.to_thread(self._load_meta, upload_id)
+        data_path, meta_path = self._paths(upload_id)
+        try:
+            f = await asyncio.to_thread(open, data_path, "rb")
+        except FileNotFoundError:
+            raise UploadError(404, "Upload not found or expired")
+        try:
+            try:
+                lock_nonblocking(f)
+            except BlockingIOError:
+                raise UploadError(409, "Another request is writing or completing this upload")
+            # 먼저 잠금을 잡은 요청이 이미 완료했으면 메타 파일이 없음
+            if not os.path.exists(meta_path):
+                raise UploadError(404, "Upload not found or expired")
+            received = os.fstat(f.fileno()).st_size
+            if received != meta["size"]:
+                raise UploadError(409, f"Upload incomplete: {received}/{meta['size']} bytes", offset=received)
+            content_hash = await asyncio.to_thread(file_sha256, data_path)
+            path = os.path.join(self.upload_dir, meta["filename"])
+            await asyncio.to_thread(os.replace, data_path, path)
+            _remove(meta_path)
+        finally:
+            f.close()
+        return path, meta["size"], content_hash
+
+    async def abort(self, upload_id: str) -> None:
+        for path in self._paths(upload_id):
+            _remove(path)
+
+    def cleanup_expired(self) -> int:
+        """RESUMABLE_UPLOAD_TTL_HOURS 동안 갱신되지 않은 미완료 업로드 삭제"""
+        if not os.path.isdir(self.partial_dir):
+            return 0
+        cutoff = time.time() - settings.RESUMABLE_UPLOAD_TTL_HOURS * 3600
+        removed = 0
+        for entry in os.scandir(self.partial_dir):
+            if entry.name.endswith(".json"):
+                data_path = entry.path[:-len(".json")] + ".part"
+                last_write = max(entry.stat().st_mtime, os.path.getmtime(data_path) if os.path.exists(data_path) else 0)
+                if last_write < cutoff:
+                    _remove(data_path)
+                    _remove(entry.path)
+                    removed += 1
+            elif entry.name.endswith(".stream") and entry.stat().st_mtime < cutoff:
+                _remove(entry.path)  # 중단된 프로세스가 남긴 스트리밍 임시 파일
+        if removed:
+            logger.info(f"Removed {removed} expired resumable uploads")
+        return removed
+
+
+def lock_nonblocking(f) -> None:
+    """열린 파일에 배타적 잠금 (다른 프로세스/요청이 잡고 있으면 BlockingIOError). 파일을 닫으면 풀림"""
+    try:
+        import fcntl
+    except ImportError:  # Windows: 첫 바이트 영역 잠금
+        import msvcrt
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            raise BlockingIOError("file is locked")
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _write_and_hash(f, digest, chunk: bytes) -> None:
+    f.write(chunk)
+    digest.update(chunk)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
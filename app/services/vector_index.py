@@ -0,0 +1,723 @@
+"""
+벡터 인덱스 백엔드 (VECTOR_INDEX_BACKEND)
+
+- pgvector: embeddings 테이블의 HNSW 인덱스를 SQL로 검색합니다 (기본값, 운영).
+- local: 프로세스 내 인덱스. memory-mapped float32 행렬 + chunk id 배열을 디스크에 두고
+  NumPy 전수(exact) 검색 또는 hnswlib HNSW로 검색합니다.
+  Postgres 없이 벤치마크/테스트를 돌리거나 청크 수천 개 규모의 소규모 배포에서 사용합니다.
+
+두 백엔드 모두 (chunk id, L2 거리) 목록을 반환하며, 청크 본문/키워드 검색/문서 메타데이터는
+백엔드와 무관하게 Postgres에 남습니다.
+"""
+import asyncio
+import contextlib
+import json
+import math
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import select, func, cast, bindparam, true, Column, MetaData, Table, Text, String
+from sqlalchemy.dialects.postgresql import ARRAY, BIT
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import visitors
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.models.document import Document
+from app.models.embedding import (
+    Embedding, EMBEDDING_CATEGORY, PARTITION_PREFIX, active_embedding_attr, active_embedding_column,
+    active_vector_type
+)
+from app.schemas.search import SearchFilters
+
+EMBEDDING_DIM = 768
+# pgvector hnsw.ef_search 기본값/상한
+DEFAULT_EF_SEARCH = 40
+MAX_EF_SEARCH = 1000
+
+Hit = Tuple[uuid.UUID, float]
+
+def truncate_embedding(vector: Sequence[float], dim: int) -> List[float]:
+    """Matryoshka: 앞 dim 차원만 남기고 L2 재정규화합니다 (embedding_short 컬럼 / 쿼리 공통)."""
+    head = [float(x) for x in vector[:dim]]
+    norm = math.sqrt(sum(x * x for x in head))
+    return [x / norm for x in head] if norm else head
+
+
+def as_float_list(value) -> List[float]:
+    """DB에서 읽은 벡터(numpy 배열, HalfVector, list)를 float 리스트로 변환"""
+    if hasattr(value, "to_list"):
+        value = value.to_list()
+    return [float(x) for x in value]
+
+def mean_embedding(vectors: Sequence[Sequence[float]]) -> Optional[List[float]]:
+    """청크 벡터 평균을 L2 재정규화합니다 (Document.summary_embedding). 벡터가 없으면 None."""
+    if not vectors:
+        return None
+    sums = [float(sum(column)) for column in zip(*vectors)]
+    norm = math.sqrt(sum(x * x for x in sums))
+    return [x / norm for x in sums] if norm else sums
+
+def _vector_literal(vector: Sequence[float]) -> str:
+    return "[" + ",".join(str(x) for x in vector) + "]"
+
+
+def has_filters(filters: Optional[SearchFilters]) -> bool:
+    return filters is not None and any(
+        [filters.category, filters.document_ids, filters.created_from, filters.created_to]
+    )
+
+
+def filter_clauses(filters: Optional[SearchFilters]) -> list:
+    """
+    검색 필터를 embeddings 테이블에 대한 WHERE 조건으로 변환합니다.
+    조건은 ANN 쿼리 안에 그대로 들어가며(post-filter 아님), iterative index scan이
+    조건을 만족하는 행을 LIMIT 개수만큼 찾을 때까지 HNSW 탐색을 이어갑니다.
+    """
+    clauses = []
+    if filters is None:
+        return clauses
+    if filters.category:
+        # 카테고리는 인라인 리터럴로 렌더링하여 카테고리별 partial 인덱스와 매칭될 수 있도록 함
+        clauses.append(EMBEDDING_CATEGORY == bindparam(None, filters.category, type_=String, literal_execute=True))
+    if filters.document_ids:
+        clauses.append(Embedding.document_id.in_(filters.document_ids))
+    if filters.created_from or filters.created_to:
+        doc_ids = select(Document.id)
+        if filters.created_from:
+            doc_ids = doc_ids.where(Document.created_at >= filters.created_from)
+        if filters.created_to:
+            doc_ids = doc_ids.where(Document.created_at < filters.created_to)
+        clauses.append(Embedding.document_id.in_(doc_ids))
+    return clauses
+
+
+
+_partition_tables: Dict[int, Table] = {}
+
+
+def partition_table(partition: int) -> Table:
+    """embeddings_p{partition}과 같은 컬럼을 가진 경량 Table (파티션 직접 조회용)"""
+    if partition not in _partition_tables:
+        _partition_tables[partition] = Table(
+            f"{PARTITION_PREFIX}{partition}", MetaData(),
+            *[Column(column.name, column.type) for column in Embedding.__table__.columns]
+        )
+    return _partition_tables[partition]
+
+
+def for_partition(stmt, partition: int):
+    """embeddings를 참조하는 SELECT를 특정 파티션 테이블을 직접 조회하도록 바꿉니다 (바인드 파라미터는 유지)."""
+    source, target = Embedding.__table__, partition_table(partition)
+
+    def replace(element):
+        if element is source:
+            return target
+        if isinstance(element, Column) and element.table is source:
+            return target.c[element.name]
+        return None
+
+    return visitors.replacement_traverse(stmt, {}, replace)
+
+
+class BaseVectorIndex(ABC):
+    """
+    ANN 검색 인터페이스. 검색 결과는 L2 거리 오름차순 (chunk id, distance) 목록입니다.
+    add/delete는 Postgres 커밋 이후 호출되며, embeddings 테이블 자체가 인덱스인 백엔드에서는 no-op입니다.
+    """
+    # True이면 category/기간 필터를 호출 측에서 document_ids로 변환해 전달해야 함 (문서 메타데이터를 모름)
+    requires_document_filters: bool = False
+
+    @abstractmethod
+    async def search(self, query_vector: List[float], limit: int,
+                     filters: Optional[SearchFilters] = None,
+                     ef_search: Optional[int] = None) -> List[Hit]:
+        ...
+
+    @abstractmethod
+    async def search_batch(self, query_vectors: List[List[float]], limit: int,
+                           filters: Optional[SearchFilters] = None,
+                           ef_search: Optional[int] = None) -> List[List[Hit]]:
+        ...
+
+    @abstractmethod
+    async def add(self, ids: Sequence[uuid.UUID], vectors: Sequence[Sequence[float]],
+                  document_ids: Sequence[uuid.UUID]) -> None:
+        """청크 벡터 추가 (이미 있는 id는 교체)"""
+
+    @abstractmethod
+    async def delete(self, ids: Sequence[uuid.UUID]) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_documents(self, document_ids: Sequence[uuid.UUID]) -> None:
+        ...
+
+
+class PgVectorIndex(BaseVectorIndex):
+    """embeddings 테이블의 pgvector 인덱스 (VECTOR_STORAGE / VECTOR_SEARCH_MODE를 따름)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, ids, vectors, document_ids) -> None:
+        # 행 INSERT가 곧 인덱스 갱신
+        return None
+
+    async def delete(self, ids) -> None:
+        return None
+
+    async def delete_documents(self, document_ids) -> None:
+        return None
+
+    @staticmethod
+    def _fan_out(filters: Optional[SearchFilters]) -> bool:
+        """
+        파티션 병렬 검색 여부. document_ids 필터가 있으면 hash 파티션 pruning으로 해당 파티션만 스캔되므로
+        한 쿼리로 충분합니다.
+        """
+        return (
+            settings.EMBEDDINGS_PARTITIONS > 1
+            and settings.PARTITION_PARALLEL_SEARCH
+            and not (filters is not None and filters.document_ids)
+        )
+
+    async def _execute(self, stmt, filters: Optional[SearchFilters], ef_search: Optional[int]) -> list:
+        """
+        ANN SELECT 실행. 파티션 병렬 검색이면 파티션마다 별도 커넥션에서 같은 SELECT를 실행하고 행을 합칩니다
+        (파티션별 상위 후보의 합집합 → 호출 측에서 거리순 정렬 후 limit개 사용).
+        부모 테이블 한 쿼리는 파티션 인덱스 스캔을 Merge Append로 순차 실행하므로, 파티션 수가 많으면 병렬이 빠릅니다.
+        """
+        if not self._fan_out(filters):
+            await self._apply_ann_settings(filters, ef_search)
+            return (await self.db.execute(stmt)).all()
+
+        # 호출 세션과 같은 엔진(읽기 복제본이면 같은 복제본)의 커넥션 사용
+        semaphore = asyncio.Semaphore(settings.PARTITION_SEARCH_CONCURRENCY)
+
+        async def run(partition: int) -> list:
+            async with semaphore, AsyncSession(bind=self.db.bind) as db:
+                await PgVectorIndex(db)._apply_ann_settings(filters, ef_search)
+                return (await db.execute(for_partition(stmt, partition))).all()
+
+        parts = await asyncio.gather(*(run(p) for p in range(settings.EMBEDDINGS_PARTITIONS)))
+        return [row for part in parts for row in part]
+
+    async def _apply_ann_settings(self, filters: Optional[SearchFilters],
+                                  ef_search: Optional[int] = None) -> None:
+        """
+        ANN 쿼리 직전에 HNSW 검색 파라미터를 현재 트랜잭션에만 적용합니다 (set_config(..., true)).
+        - hnsw.ef_search: 요청값 → HNSW_EF_SEARCH 순. 둘 다 없으면 서버 기본값을 그대로 사용
+          (iterative scan이 꺼져 있으면 LIMIT과 무관하게 최대 ef_search개까지만 반환됩니다)
+        - hnsw.iterative_scan: 필터가 있는 경우에만 (pgvector 0.8+).
+          끄면 HNSW가 ef_search개 후보만 본 뒤 필터링하므로 결과가 k개보다 적게 나올 수 있습니다.
+        설정할 값이 없으면 추가 round-trip 없이 반환합니다.
+        """
+        configs = []
+        ef_search = ef_search or settings.HNSW_EF_SEARCH
+        if ef_search:
+            configs.append(func.set_config("hnsw.ef_search", str(ef_search), True))
+        if has_filters(filters) and settings.HNSW_ITERATIVE_SCAN != "off":
+            configs.append(func.set_config("hnsw.iterative_scan", settings.HNSW_ITERATIVE_SCAN, True))
+            configs.append(func.set_config("hnsw.max_scan_tuples", str(settings.HNSW_MAX_SCAN_TUPLES), True))
+        if configs:
+            await self.db.execute(select(*configs))
+
+    def _vector_candidates(self, qvec, limit: int, filters: Optional[SearchFilters], qvec_short=None):
+        """
+        쿼리 벡터 하나에 대한 ANN 후보 SELECT (id, L2 distance). VECTOR_STORAGE의 활성 컬럼을 사용합니다.
+        rescore 모드에서는 1단계 인덱스로 limit * _rescore_multiplier()개를 스캔하고, 같은 SELECT에서
+        전체 차원 벡터로 L2 거리를 계산합니다 (호출 측에서 거리순 정렬 후 limit개 사용).
+        - binary_rescore: 이진 양자화 인덱스, 해밍 거리
+        - matryoshka_rescore: embedding_short 인덱스, 잘라낸 쿼리 벡터(qvec_short)와의 L2 거리
+        """
+        column = active_embedding_column()
+        distance = column.l2_distance(qvec)
+        stmt = select(Embedding.id.label("id"), distance.label("distance")).where(*filter_clauses(filters))
+        if settings.VECTOR_SEARCH_MODE == "binary_rescore":
+            bit_type = BIT(EMBEDDING_DIM)
+            hamming = cast(func.binary_quantize(column), bit_type).op("<~>")(
+                cast(func.binary_quantize(qvec), bit_type)
+            )
+            return stmt.order_by(hamming).limit(limit * self._rescore_multiplier())
+        if settings.VECTOR_SEARCH_MODE == "matryoshka_rescore":
+            coarse = Embedding.embedding_short.l2_distance(qvec_short)
+            return stmt.order_by(coarse).limit(limit * self._rescore_multiplier())
+        return stmt.order_by(distance).limit(limit)
+
+    @staticmethod
+    def _rescore_multiplier() -> int:
+        if settings.VECTOR_SEARCH_MODE == "binary_rescore":
+            return settings.BQ_RESCORE_MULTIPLIER
+        if settings.VECTOR_SEARCH_MODE == "matryoshka_rescore":
+            return settings.MATRYOSHKA_RESCORE_MULTIPLIER
+        return 1
+
+    def _ann_ef_search(self, ef_search: Optional[int], limit: int) -> Optional[int]:
+        """
+        rescore 모드의 1단계는 후보를 넓게 가져와야 하므로 ef_search를 1단계 후보 수 이상으로 올립니다.
+        (iterative scan 없이는 HNSW가 최대 ef_search개만 반환)
+        """
+        if settings.VECTOR_SEARCH_MODE == "float":
+            return ef_search
+        coarse = limit * self._rescore_multiplier()
+        return min(max(ef_search or settings.HNSW_EF_SEARCH or DEFAULT_EF_SEARCH, coarse), MAX_EF_SEARCH)
+
+    async def search(self, query_vector: List[float], limit: int,
+                     filters: Optional[SearchFilters] = None,
+                     ef_search: Optional[int] = None) -> List[Tuple[uuid.UUID, float]]:
+        qvec = bindparam("query_vector", value=query_vector, type_=active_vector_type())
+        qvec_short = None
+        if settings.VECTOR_SEARCH_MODE == "matryoshka_rescore":
+            qvec_short = bindparam(
+                "query_vector_short", value=truncate_embedding(query_vector, settings.MATRYOSHKA_DIM),
+                type_=Vector(settings.MATRYOSHKA_DIM)
+            )
+        rows = await self._execute(
+            self._vector_candidates(qvec, limit, filters, qvec_short), filters, self._ann_ef_search(ef_search, limit)
+        )
+        # relaxed_order iterative scan / rescore 모드 / 파티션 병렬 후보는 L2 순서가 아니므로 거리 기준으로 재정렬
+        return sorted(((row.id, float(row.distance)) for row in rows), key=lambda r: r[1])[:limit]
+
+    async def search_batch(self, query_vectors: List[List[float]], limit: int,
+                           filters: Optional[SearchFilters] = None,
+                           ef_search: Optional[int] = None) -> List[List[Tuple[uuid.UUID, float]]]:
+        # unnest(text[]) WITH ORDINALITY → 쿼리별 LATERAL 서브쿼리에서 HNSW 인덱스 스캔
+        vectors_literal = [_vector_literal(vec) for vec in query_vectors]
+        arrays = [bindparam("query_vectors", value=vectors_literal, type_=ARRAY(Text))]
+        columns = ["vec"]
+        if settings.VECTOR_SEARCH_MODE == "matryoshka_rescore":
+            # unnest(text[], text[]): 전체/축소 쿼리 벡터를 같은 행으로 펼침
+            shorts = [_vector_literal(truncate_embedding(vec, settings.MATRYOSHKA_DIM)) for vec in query_vectors]
+            arrays.append(bindparam("query_vectors_short", value=shorts, type_=ARRAY(Text)))
+            columns.append("vec_short")
+        q = func.unnest(*arrays).table_valued(*columns, with_ordinality="ord").render_derived(name="q")
+        qvec = cast(q.c.vec, active_vector_type())
+        qvec_short = cast(q.c.vec_short, Vector(settings.MATRYOSHKA_DIM)) if "vec_short" in columns else None
+        candidates = self._vector_candidates(qvec, limit, filters, qvec_short).lateral("c")
+        stmt = select(q.c.ord, candidates.c.id, candidates.c.distance).select_from(q).join(candidates, true()).order_by(
+            q.c.ord, candidates.c.distance
+        )
+        rows = await self._execute(stmt, filters, self._ann_ef_search(ef_search, limit))
+
+        per_query: List[List[Tuple[uuid.UUID, float]]] = [[] for _ in query_vectors]
+        for row in rows:
+            per_query[row.ord - 1].append((row.id, float(row.distance)))
+        return [sorted(items, key=lambda r: r[1])[:limit] for items in per_query]
+
+
+
+class LocalVectorIndex(BaseVectorIndex):
+    """
+    프로세스 내 벡터 인덱스 (VECTOR_INDEX_BACKEND=local)
+
+    디렉터리 구성:
+    - vectors.f32: float32 (capacity x dim) 행렬, np.memmap으로 열어 시작 시 전체를 읽지 않음
+    - rows.bin: 행별 chunk id(16바이트), 문서 코드, 삭제 표시 (capacity행 memmap)
+    - documents.npy: 문서 코드 → 문서 id 테이블
+    - meta.json: dim / count / capacity / version. 항상 마지막에 교체되어 커밋 지점 역할을 함
+    - hnsw.bin: mode="hnsw"일 때 hnswlib 그래프 (meta의 hnsw_count 행까지 반영, 이후 행은 로드 시 추가)
+
+    추가는 두 memmap 파일의 count 이후 행에 쓰므로 저장 시 바뀐 페이지만 기록됩니다.
+    HNSW 그래프는 HNSW_SAVE_INTERVAL행마다, 압축 시, save() 호출 시에만 통째로 저장합니다.
+    삭제는 tombstone으로 처리하고, 삭제 비율이 COMPACT_RATIO를 넘으면 저장 시 압축합니다.
+    쓰기는 파일 잠금으로 직렬화되며, 다른 프로세스(Celery 워커)의 쓰기는 meta.json의 version이
+    바뀐 것을 보고 검색 전에 다시 로드합니다.
+    """
+    requires_document_filters = True
+    COMPACT_RATIO = 0.2
+    MIN_CAPACITY = 1024
+    HNSW_SAVE_INTERVAL = 10000
+    ROW_DTYPE = [("id", "u1", (16,)), ("doc", "<i4"), ("deleted", "?")]
+
+    def __init__(self, path: str, dim: int = EMBEDDING_DIM, mode: str = "exact"):
+        import numpy as np  # 선택 의존성: local 백엔드에서만 필요
+
+        self._np = np
+        self.path = path
+        self.dim = dim
+        self.mode = mode
+        self._lock = threading.RLock()
+        self._meta_mtime: Optional[int] = None
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # ---- 파일 ----
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self._file("meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _replace(self, name: str, write) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 원자적으로 교체"""
+        tmp = self._file(name + ".tmp")
+        write(tmp)
+        os.replace(tmp, self._file(name))
+
+    @contextlib.contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        with self._lock, open(self._file(".lock"), "w") as lock_file:
+            try:
+                import fcntl
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except ImportError:  # Windows: 프로세스 내 잠금만 적용
+                pass
+            self._refresh()
+            yield
+
+    def _load(self) -> None:
+        np = self._np
+        meta = self._read_meta()
+        if meta is None or not meta["capacity"]:
+            self._reset_state()
+            if meta is not None:
+                self._version = meta["version"]
+                self._meta_mtime = os.stat(self._file("meta.json")).st_mtime_ns
+            if self.mode == "hnsw":
+                self._hnsw = self._load_hnsw({})
+            return
+        if meta["dim"] != self.dim:
+            raise ValueError(f"Local vector index at {self.path} has dim={meta['dim']}, expected {self.dim}")
+        count, capacity = meta["count"], meta["capacity"]
+        self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._rows = np.memmap(self._file("rows.bin"), dtype=self.ROW_DTYPE, mode="r+", shape=(capacity,))
+        self._ids = np.array(self._rows["id"][:count])
+        self._doc_codes = np.array(self._rows["doc"][:count])
+        self._deleted = np.array(self._rows["deleted"][:count])
+        documents = np.load(self._file("documents.npy"))
+        self._documents = {uuid.UUID(bytes=raw.tobytes()): code for code, raw in enumerate(documents)}
+        self._saved_documents = len(self._documents)
+        self._count, self._capacity, self._version = count, capacity, meta["version"]
+        self._norms = np.einsum("ij,ij->i", self._vectors[:count], self._vectors[:count])
+        self._positions = {uuid.UUID(bytes=raw.tobytes()): i for i, raw in enumerate(self._ids) if not self._deleted[i]}
+        self._meta_mtime = os.stat(self._file("meta.json")).st_mtime_ns
+        self._hnsw_count = meta.get("hnsw_count", 0)
+        self._hnsw = self._load_hnsw(meta) if self.mode == "hnsw" else None
+
+    def _reset_state(self) -> None:
+        np = self._np
+        self._vectors = None
+        self._rows = None
+        self._ids = np.zeros((0, 16), dtype=np.uint8)
+        self._doc_codes = np.zeros(0, dtype=np.int32)
+        self._deleted = np.zeros(0, dtype=bool)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._documents: Dict[uuid.UUID, int] = {}
+        self._positions: Dict[uuid.UUID, int] = {}
+        self._count = self._capacity = self._version = 0
+        self._saved_documents = 0
+        self._hnsw = None
+        self._hnsw_count = 0  # hnsw.bin에 반영된 행 수
+
+    def _refresh(self) -> None:
+        """다른 프로세스가 meta.json을 교체했으면 다시 로드"""
+        try:
+            mtime = os.stat(self._file("meta.json")).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._meta_mtime:
+            return
+        meta = self._read_meta()
+        if meta and meta["version"] != self._version:
+            self._load()
+        else:
+            self._meta_mtime = mtime
+
+    def _load_hnsw(self, meta: Dict):
+        import hnswlib  # 선택 의존성: LOCAL_VECTOR_INDEX_MODE=hnsw
+
+        index = hnswlib.Index(space="l2", dim=self.dim)
+        saved = meta.get("hnsw_count")
+        if os.path.exists(self._file("hnsw.bin")) and saved is not None and saved <= self._count:
+            index.load_index(self._file("hnsw.bin"), max_elements=max(self._capacity, 1))
+            # 그래프 저장 이후 추가/삭제된 행 반영
+            if saved < self._count:
+                index.add_items(self._vectors[saved:self._count], self._np.arange(saved, self._count))
+            for row in self._np.flatnonzero(self._deleted):
+                with contextlib.suppress(RuntimeError):  # 저장 전에 이미 삭제 표시된 행
+                    index.mark_deleted(int(row))
+            self._hnsw_count = saved
+            return index
+        # 그래프가 없거나 행 번호가 바뀜(압축) → 활성 행으로 재구성 (label = 행 번호)
+        self._hnsw_count = 0
+        index.init_index(max_elements=max(self._capacity, 1), M=settings.HNSW_M,
+                         ef_construction=settings.HNSW_EF_CONSTRUCTION)
+        active = self._np.flatnonzero(~self._deleted)
+        if len(active):
+            index.add_items(self._vectors[active], active)
+        return index
+
+    def _save(self, full: bool = False) -> None:
+        """
+        meta.json을 교체해 변경을 커밋합니다. memmap은 바뀐 페이지만 기록되며,
+        HNSW 그래프는 full이거나 마지막 저장 후 HNSW_SAVE_INTERVAL행 이상 추가됐을 때만 다시 씁니다.
+        """
+        np = self._np
+        if self._count and self._deleted.sum() > self._count * self.COMPACT_RATIO:
+            self._compact()
+            full = True  # 행 번호가 바뀌었으므로 그래프도 저장
+        for mapped in (self._vectors, self._rows):
+            if mapped is not None:
+                mapped.flush()
+        if len(self._documents) != self._saved_documents or not os.path.exists(self._file("documents.npy")):
+            documents = np.zeros((len(self._documents), 16), dtype=np.uint8)
+            for document_id, code in self._documents.items():
+                documents[code] = np.frombuffer(document_id.bytes, dtype=np.uint8)
+
+            def write_documents(tmp: str) -> None:
+                with open(tmp, "wb") as f:
+                    np.save(f, documents)
+
+            self._replace("documents.npy", write_documents)
+            self._saved_documents = len(self._documents)
+        if self._hnsw is not None and (full or self._count - self._hnsw_count >= self.HNSW_SAVE_INTERVAL):
+            self._replace("hnsw.bin", self._hnsw.save_index)
+            self._hnsw_count = self._count
+        meta = {"dim": self.dim, "count": self._count, "capacity": self._capacity, "version": self._version + 1,
+                "hnsw_count": self._hnsw_count}
+
+        def write_meta(tmp: str) -> None:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        self._replace("meta.json", write_meta)
+        self._version = meta["version"]
+        self._meta_mtime = os.stat(self._file("meta.json")).st_mtime_ns
+
+    def _resize_file(self, name: str, mapped, dtype, shape: tuple, capacity: int, rows=None):
+        """capacity 행짜리 새 memmap 파일을 만들어 교체 (rows: 옮겨 담을 행 번호, None이면 앞 count행)"""
+        np = self._np
+        tmp = self._file(name + ".tmp")
+        resized = np.memmap(tmp, dtype=dtype, mode="w+", shape=(capacity, *shape))
+        if mapped is not None:
+            source = mapped[:self._count] if rows is None else mapped[rows]
+            resized[:len(source)] = source
+        resized.flush()
+        del resized
+        os.replace(tmp, self._file(name))
+        return np.memmap(self._file(name), dtype=dtype, mode="r+", shape=(capacity, *shape))
+
+    def _resize(self, capacity: int, rows=None) -> None:
+        """vectors.f32 / rows.bin을 capacity행으로 교체"""
+        self._vectors = self._resize_file("vectors.f32", self._vectors, self._np.float32, (self.dim,), capacity, rows)
+        self._rows = self._resize_file("rows.bin", self._rows, self.ROW_DTYPE, (), capacity, rows)
+        self._capacity = capacity
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _compact(self) -> None:
+        """tombstone 행 제거 (행 번호가 바뀌므로 HNSW 그래프도 재구성)"""
+        np = self._np
+        keep = np.flatnonzero(~self._deleted)
+        logger.info(f"🧹 Compacting local vector index: {self._count} -> {len(keep)} rows")
+        self._ids, self._doc_codes, self._norms = self._ids[keep], self._doc_codes[keep], self._norms[keep]
+        self._hnsw = None  # 아래에서 새 행 번호로 재구성
+        self._resize(max(self.MIN_CAPACITY, len(keep) * 2), rows=keep)
+        self._count = len(keep)
+        self._deleted = np.zeros(self._count, dtype=bool)
+        self._positions = {uuid.UUID(bytes=raw.tobytes()): i for i, raw in enumerate(self._ids)}
+        if self.mode == "hnsw":
+            self._hnsw = self._load_hnsw({})
+
+    # ---- 쓰기 ----
+
+    def _mark_deleted(self, rows) -> None:
+        for row in rows:
+            if self._deleted[row]:
+                continue
+            self._deleted[row] = True
+            self._rows["deleted"][row] = True
+            self._positions.pop(uuid.UUID(bytes=self._ids[row].tobytes()), None)
+            if self._hnsw is not None:
+                self._hnsw.mark_deleted(int(row))
+
+    def add_sync(self, ids: Sequence[uuid.UUID], vectors: Sequence[Sequence[float]],
+                 document_ids: Sequence[uuid.UUID], save: bool = True) -> None:
+        """save=False면 커밋(meta.json 교체)을 미루고, 이후 save()로 한 번에 기록합니다 (일괄 적재용)."""
+        np = self._np
+        if not ids:
+            return
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        with self._write_lock():
+            self._mark_deleted([self._positions[i] for i in ids if i in self._positions])
+            start, end = self._count, self._count + len(ids)
+            if self._vectors is None or end > self._capacity:
+                self._resize(max(self.MIN_CAPACITY, self._capacity * 2, end))
+            self._vectors[start:end] = matrix
+            codes = np.asarray([self._documents.setdefault(doc_id, len(self._documents)) for doc_id in document_ids],
+                               dtype=np.int32)
+            raw_ids = np.frombuffer(b"".join(i.bytes for i in ids), dtype=np.uint8).reshape(-1, 16)
+            self._rows["id"][start:end], self._rows["doc"][start:end], self._rows["deleted"][start:end] = raw_ids, codes, False
+            self._ids = np.concatenate([self._ids, raw_ids])
+            self._doc_codes = np.concatenate([self._doc_codes, codes])
+            self._deleted = np.concatenate([self._deleted, np.zeros(len(ids), dtype=bool)])
+            self._norms = np.concatenate([self._norms, np.einsum("ij,ij->i", matrix, matrix)])
+            self._positions.update({chunk_id: start + offset for offset, chunk_id in enumerate(ids)})
+            if self._hnsw is not None:
+                self._hnsw.add_items(matrix, np.arange(start, end))
+            self._count = end
+            if save:
+                self._save()
+
+    def save(self) -> None:
+        """미뤄둔 add(save=False)와 HNSW 그래프를 디스크에 기록"""
+        with self._write_lock():
+            self._save(full=True)
+
+    def delete_sync(self, ids: Sequence[uuid.UUID]) -> None:
+        with self._write_lock():
+            self._mark_deleted([self._positions[i] for i in ids if i in self._positions])
+            self._save()
+
+    def delete_documents_sync(self, document_ids: Sequence[uuid.UUID]) -> None:
+        with self._write_lock():
+            codes = [self._documents[d] for d in document_ids if d in self._documents]
+            if not codes:
+                return
+            rows = self._np.flatnonzero(self._np.isin(self._doc_codes, codes) & ~self._deleted)
+            self._mark_deleted(rows)
+            self._save()
+
+    def reset(self) -> None:
+        """인덱스를 비웁니다 (build_local_index 재적재용)"""
+        with self._write_lock():
+            for name in ("vectors.f32", "rows.bin", "documents.npy", "hnsw.bin"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._file(name))
+            version = self._version
+            self._reset_state()
+            self._version = version
+            if self.mode == "hnsw":
+                self._hnsw = self._load_hnsw({})
+            self._save()
+
+    async def add(self, ids, vectors, document_ids, save: bool = True) -> None:
+        await asyncio.to_thread(self.add_sync, list(ids), list(vectors), list(document_ids), save)
+
+    async def delete(self, ids) -> None:
+        await asyncio.to_thread(self.delete_sync, list(ids))
+
+    async def delete_documents(self, document_ids) -> None:
+        await asyncio.to_thread(self.delete_documents_sync, list(document_ids))
+
+    # ---- 검색 ----
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _allowed_rows(self, filters: Optional[SearchFilters]):
+        """활성 행 마스크. document_ids 외의 필터는 호출 측에서 document_ids로 변환되어 있어야 함"""
+        np = self._np
+        mask = ~self._deleted
+        if filters is not None and filters.document_ids is not None:
+            codes = [self._documents[d] for d in filters.document_ids if d in self._documents]
+            mask &= np.isin(self._doc_codes, codes)
+        return mask
+
+    def search_batch_sync(self, query_vectors: Sequence[Sequence[float]], limit: int,
+                          filters: Optional[SearchFilters] = None,
+                          ef_search: Optional[int] = None) -> List[List[Hit]]:
+        np = self._np
+        with self._lock:
+            self._refresh()
+            mask = self._allowed_rows(filters)
+            k = min(limit, int(mask.sum()))
+            if k == 0:
+                return [[] for _ in query_vectors]
+            queries = np.asarray(query_vectors, dtype=np.float32).reshape(-1, self.dim)
+            if self._hnsw is not None:
+                try:
+                    return self._search_hnsw(queries, k, mask, ef_search)
+                except RuntimeError:
+                    # 필터가 좁아 HNSW가 k개를 못 찾은 경우 → 전수 검색으로 대체
+                    pass
+            return self._search_exact(queries, k, mask)
+
+    def _search_exact(self, queries, k: int, mask) -> List[List[Hit]]:
+        np = self._np
+        # ||q - x||^2 = ||x||^2 - 2 q·x + ||q||^2
+        d2 = self._norms[None, :] - 2.0 * (queries @ self._vectors[:self._count].T)
+        d2 += np.einsum("ij,ij->i", queries, queries)[:, None]
+        d2[:, ~mask] = np.inf
+        top = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        results = []
+        for qi, rows in enumerate(top):
+            rows = rows[np.argsort(d2[qi, rows])]
+            results.append([(self._row_id(row), math.sqrt(max(float(d2[qi, row]), 0.0))) for row in rows])
+        return results
+
+    def _search_hnsw(self, queries, k: int, mask, ef_search: Optional[int]) -> List[List[Hit]]:
+        self._hnsw.set_ef(max(ef_search or settings.HNSW_EF_SEARCH or DEFAULT_EF_SEARCH, k))
+        filtered = not mask[~self._deleted].all()
+        labels, d2 = self._hnsw.knn_query(queries, k=k, filter=(lambda label: bool(mask[label])) if filtered else None)
+        # hnswlib l2 공간은 제곱 거리를 반환
+        return [
+            [(self._row_id(row), math.sqrt(max(float(dist), 0.0))) for row, dist in zip(rows, dists)]
+            for rows, dists in zip(labels, d2)
+        ]
+
+    def _row_id(self, row) -> uuid.UUID:
+        return uuid.UUID(bytes=self._ids[row].tobytes())
+
+    async def search(self, query_vector: List[float], limit: int,
+                     filters: Optional[SearchFilters] = None,
+                     ef_search: Optional[int] = None) -> List[Hit]:
+        return (await self.search_batch([query_vector], limit, filters, ef_search))[0]
+
+    async def search_batch(self, query_vectors: List[List[float]], limit: int,
+                           filters: Optional[SearchFilters] = None,
+                           ef_search: Optional[int] = None) -> List[List[Hit]]:
+        # NumPy 행렬 연산은 GIL을 놓으므로 스레드에서 실행해 이벤트 루프를 막지 않음
+        return await asyncio.to_thread(self.search_batch_sync, query_vectors, limit, filters, ef_search)
+
+
+_local_index: Optional[LocalVectorIndex] = None
+_local_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalVectorIndex:
+    """프로세스 공용 LocalVectorIndex (최초 호출 시 디스크에서 로드)"""
+    global _local_index
+    with _local_index_lock:
+        if _local_index is None:
+            _local_index = LocalVectorIndex(
+                settings.LOCAL_VECTOR_INDEX_DIR, dim=EMBEDDING_DIM, mode=settings.LOCAL_VECTOR_INDEX_MODE
+            )
+            logger.info(f"📦 Loaded local vector index from {settings.LOCAL_VECTOR_INDEX_DIR} ({len(_local_index)} vectors)")
+        return _local_index
+
+
+def get_vector_index(db: AsyncSession) -> BaseVectorIndex:
+    if settings.VECTOR_INDEX_BACKEND == "local":
+        return get_local_index()
+    return PgVectorIndex(db)
+
+
+async def build_local_index(db: AsyncSession, index: Optional[LocalVectorIndex] = None,
+                            batch_size: int = 5000) -> int:
+    """embeddings 테이블의 활성 벡터 컬럼으로 로컬 인덱스를 처음부터 다시 채웁니다."""
+    index = index or get_local_index()
+    await asyncio.to_thread(index.reset)
+    column = getattr(Embedding, active_embedding_attr())
+    stmt = select(Embedding.id, Embedding.document_id, column).where(column.is_not(None)).order_by(Embedding.id)
+    total = 0
+    result = await db.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions(batch_size):
+        ids = [row[0] for row in partition]
+        vectors = [as_float_list(row[2]) for row in partition]
+        # 배치마다 커밋하면 그래프/행 테이블을 매번 다시 써서 O(N²) I/O → 마지막에 한 번만 저장
+        await index.add(ids, vectors, [row[1] for row in partition], save=False)
+        total += len(ids)
+        logger.info(f"📦 Local vector index: {total} vectors loaded")
+    await asyncio.to_thread(index.save)
+    return total
@@ -1,41 +1,93 @@
-import google.generativeai as genai
 import asyncio
-from typing import List, Optional, Dict
+import uuid
+from functools import partial
+from typing import List, Optional, Dict, Tuple
+from pgvector.sqlalchemy import Vector
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, select, or_
+from sqlalchemy import select, or_, func, cast, bindparam, literal, true, union_all, text, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import defer
 
 from app.core.config import settings
+from app.core.database import session_scope, shard_router
+from app.core.exceptions import ServiceUnavailableError
 from app.core.logging import logger
+from app.core.providers import get_genai
+from app.core.tracing import start_span
+from app.models.document import Document
 from app.models.embedding import Embedding
+from app.schemas.search import SearchFilters
+from app.services.vector_index import (  # noqa: F401 (EMBEDDING_DIM, truncate_embedding, has_filters 재노출)
+    BaseVectorIndex, DEFAULT_EF_SEARCH, EMBEDDING_DIM, MAX_EF_SEARCH, PgVectorIndex, _vector_literal,
+    filter_clauses, get_vector_index, has_filters, truncate_embedding
+)
+from app.services.sharding import merge_keyword_results, merge_vector_results, scatter
 from app.utils.nlp import extract_nouns
 
-# Configure Gemini
-if settings.GOOGLE_API_KEY:
-    genai.configure(api_key=settings.GOOGLE_API_KEY)
-
 EMBEDDING_MODEL = "models/text-embedding-004"
+# RRF 후보군 = top_k * CANDIDATE_MULTIPLIER (레그별)
+CANDIDATE_MULTIPLIER = 10
+# 2단계 검색 1단계에서 넓힌 hnsw.ef_search를 서버 기본값(RESET 시 값)으로 되돌림 (트랜잭션 한정)
+RESET_EF_SEARCH = text(
+    "SELECT set_config('hnsw.ef_search', reset_val, true) FROM pg_settings WHERE name = 'hnsw.ef_search'"
+)
 CATEGORIES = ['매뉴얼', '가이드', '포워더 질의응답', 'ENS', 'AMS', 'ACI', '웹페이지', '기술문서', '기타']
 
+class SearchHit:
+    """하이브리드 검색 결과 1건 (청크 + 문서 + 레그별 점수)"""
+    def __init__(self, chunk_id: uuid.UUID):
+        self.chunk_id: uuid.UUID = chunk_id
+        self.embedding: Optional[Embedding] = None
+        self.document: Optional[Document] = None
+        self.vector_rank: Optional[int] = None
+        self.vector_distance: Optional[float] = None
+        self.keyword_rank: Optional[int] = None
+        self.rrf_score: float = 0.0
+
 class VectorService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, index: Optional[BaseVectorIndex] = None):
         self.db = db
+        self.index = index or get_vector_index(db)
+        # 마지막 검색에서 응답하지 않아 제외된 샤드 번호 (샤딩 시 부분 결과 표시용)
+        self.missing_shards: List[int] = []
+        # 마지막 search_hybrid_bounded에서 시간 안에 끝나지 않아 제외된 레그 ("vector" / "keyword")
+        self.missing_legs: List[str] = []
 
     @staticmethod
     async def create_embedding(text: str) -> List[float]:
         """Gemini text-embedding-004를 사용하여 텍스트 임베딩 생성 (Async wrapper with Thread)"""
         try:
             # genai.embed_content는 동기 함수이므로, 이벤트 루프 차단을 막기 위해 스레드에서 실행
-            result = await asyncio.to_thread(
-                genai.embed_content,
-                model=EMBEDDING_MODEL,
-                content=text,
-                task_type="retrieval_document"
-            )
+            with start_span("provider.embed", kind="client", model=EMBEDDING_MODEL, text_length=len(text)):
+                result = await asyncio.to_thread(
+                    get_genai().embed_content,
+                    model=EMBEDDING_MODEL,
+                    content=text,
+                    task_type="retrieval_document"
+                )
             return result['embedding']
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             return []
             
+    @staticmethod
+    async def create_embeddings(texts: List[str], task_type: str = "retrieval_document") -> List[List[float]]:
+        """여러 텍스트를 Provider 호출 1회로 임베딩합니다. 실패 시 빈 리스트를 반환합니다."""
+        if not texts:
+            return []
+        try:
+            with start_span("provider.embed_batch", kind="client", model=EMBEDDING_MODEL, batch_size=len(texts)):
+                result = await asyncio.to_thread(
+                    get_genai().embed_content,
+                    model=EMBEDDING_MODEL,
+                    content=texts,
+                    task_type=task_type
+                )
+            return result['embedding']
+        except Exception as e:
+            logger.error(f"Batch embedding generation failed: {e}")
+            return []
+
     # Static method wrapper for backward compatibility or direct use
     @staticmethod
     async def create_embedding_static(text: str) -> List[float]:
@@ -46,7 +98,7 @@ class VectorService:
         """Gemini를 사용하여 콘텐츠 카테고리 자동 분류"""
         try:
             # Use the lite model for fast classification
-            model = genai.GenerativeModel(settings.LLM_MODEL)
+            model = get_genai().GenerativeModel(settings.LLM_MODEL)
             prompt = f"""
             다음 문서를 아래 카테고리 중 하나로 분류해주세요:
             {', '.join(CATEGORIES)}
@@ -58,7 +110,8 @@ class VectorService:
             위 문서가 어떤 카테고리에 속하는지 카테고리 이름만 정확히 답변해주세요.
             반드시 제공된 카테고리 중 하나를 선택해야 합니다.
             """
-            response = await model.generate_content_async(prompt)
+            with start_span("provider.classify", kind="client", model=settings.LLM_MODEL):
+                response = await model.generate_content_async(prompt)
             category = response.text.strip()
             
             if category in CATEGORIES:
@@ -71,40 +124,283 @@ class VectorService:
             logger.warning(f"Category classification failed: {e}, utilizing default '기타'")
             return "기타"
 
-    async def search_hybrid(self, query: str, top_k: int = 5) -> List[Embedding]:
+    async def search_hybrid(self, query: str, top_k: int = 5, use_keyword: bool = True,
+                            filters: Optional[SearchFilters] = None,
+                            ef_search: Optional[int] = None) -> List[Embedding]:
         """
         하이브리드 검색: Vector Search + Keyword Search (Full-Text)
         Reciprocal Rank Fusion (RRF) 알고리즘 사용
+        use_keyword=False이면 키워드 검색을 생략합니다 (지연 시간 예산 부족 시).
+        ef_search는 이번 검색에만 적용되는 HNSW 후보 리스트 크기입니다 (None이면 HNSW_EF_SEARCH).
+        """
+        hits = await self.search_hybrid_scored(
+            query, top_k=top_k, use_keyword=use_keyword, filters=filters, ef_search=ef_search
+        )
+        return [hit.embedding for hit in hits]
+
+    async def search_hybrid_scored(self, query: str, top_k: int = 5, use_keyword: bool = True,
+                                   filters: Optional[SearchFilters] = None,
+                                   query_embedding: Optional[List[float]] = None,
+                                   ef_search: Optional[int] = None) -> List[SearchHit]:
+        """
+        search_hybrid와 동일하지만, 레그별 점수(벡터 거리/순위, 키워드 순위, RRF)와
+        Document를 함께 담은 SearchHit 목록을 반환합니다.
         """
         # 1. Generate Query Embedding
-        query_embedding = await self.create_embedding(query)
+        if query_embedding is None:
+            query_embedding = await self.create_embedding(query)
         if not query_embedding:
             return []
 
+        # 2~5. Vector + Keyword Search → RRF → Top K 청크/문서 로드
+        hits_per_query = await self._search_many(
+            [query], [query_embedding], top_k, use_keyword=use_keyword, filters=filters, ef_search=ef_search
+        )
+        return hits_per_query[0]
+
+    async def search_hybrid_bounded(self, query: str, top_k: int, timeout: Optional[float],
+                                    use_keyword: bool = True, filters: Optional[SearchFilters] = None,
+                                    ef_search: Optional[int] = None) -> List[SearchHit]:
+        """
+        지연 시간 예산(chat)용 search_hybrid_scored. timeout 안에 끝난 레그만으로 RRF합니다.
+        벡터 레그(임베딩 포함)와 키워드 레그는 각자의 읽기 세션에서 동시에 실행되고, 끝나지 않은 레그는
+        취소 후 missing_legs에 기록됩니다. 취소되는 쿼리는 레그 전용 세션에서만 실행되므로
+        self.db가 execute 도중 취소된 상태로 남지 않습니다. 끝난 레그가 없으면 asyncio.TimeoutError.
+        """
+        self.missing_legs = []
+        if shard_router.enabled:
+            # 샤드 검색은 샤드별 세션에서 실행되고 늦은 샤드는 제외됨 (missing_shards)
+            return await asyncio.wait_for(self.search_hybrid_scored(
+                query, top_k=top_k, use_keyword=use_keyword, filters=filters, ef_search=ef_search
+            ), timeout)
+
+        limit = top_k * CANDIDATE_MULTIPLIER
+
+        async def vector_leg() -> List[Tuple[uuid.UUID, float]]:
+            query_embedding = await self.create_embedding(query)
+            if not query_embedding:
+                return []
+            async with session_scope("read") as db:
+                vector_results, _ = await VectorService(db)._search_legs(
+                    [query], [query_embedding], limit, False, filters, ef_search
+                )
+            return vector_results[0]
+
+        async def keyword_leg() -> List[uuid.UUID]:
+            async with session_scope("read") as db:
+                return await VectorService(db)._search_keyword(query, limit, filters)
+
+        legs = {"vector": asyncio.create_task(vector_leg())}
+        if use_keyword:
+            legs["keyword"] = asyncio.create_task(keyword_leg())
+        try:
+            await asyncio.wait(legs.values(), timeout=timeout)
+        finally:
+            for name, task in legs.items():
+                if not task.done():
+                    task.cancel()
+                    self.missing_legs.append(name)
+        if len(self.missing_legs) == len(legs):
+            raise asyncio.TimeoutError()
+        if self.missing_legs:
+            logger.warning(f"⏱️ Search legs {self.missing_legs} exceeded latency budget, using partial retrieval")
+
+        vector_results = legs["vector"].result() if "vector" not in self.missing_legs else []
+        keyword_results = legs["keyword"].result() if use_keyword and "keyword" not in self.missing_legs else []
+        fused = self._apply_rrf(vector_results, keyword_results, k=60)[:top_k]
+        if not fused:
+            return []
+        # 상위 top_k개 PK 조회는 짧으므로 호출자가 남겨둔 시간(이후 단계 몫) 안에서 실행
+        async with session_scope("read") as db:
+            rows = await VectorService(db, self.index)._load_chunks({hit.chunk_id for hit in fused})
+        return self._attach_rows(fused, rows)
+
+    async def search_batch(self, queries: List[str], top_k: int = 5,
+                           filters: Optional[SearchFilters] = None,
+                           ef_search: Optional[int] = None) -> List[List[SearchHit]]:
+        """
+        여러 쿼리를 한 번에 검색합니다.
+        - 임베딩: Provider 호출 1회 (batch embed)
+        - 벡터 검색: LATERAL JOIN 쿼리 1회
+        - 키워드 검색: UNION ALL 쿼리 1회
+        - 청크/문서 로드: 1회
+        (샤딩 시에는 샤드마다 위 쿼리를 1회씩 동시에 실행)
+        """
+        if not queries:
+            return []
+        query_embeddings = await self.create_embeddings(queries)
+        if len(query_embeddings) != len(queries):
+            return [[] for _ in queries]
+        return await self._search_many(queries, query_embeddings, top_k, filters=filters, ef_search=ef_search)
+
+    async def _search_many(self, queries: List[str], query_vectors: List[List[float]], top_k: int,
+                           use_keyword: bool = True, filters: Optional[SearchFilters] = None,
+                           ef_search: Optional[int] = None) -> List[List[SearchHit]]:
         # Retrieve significantly more candidates for RRF to ensure recall
-        limit = top_k * 10 
+        limit = top_k * CANDIDATE_MULTIPLIER
+        if shard_router.enabled:
+            return await self._search_sharded(queries, query_vectors, top_k, limit, use_keyword, filters, ef_search)
 
-        # 2. Vector Search (Semantic)
-        vector_results = await self._search_vector(query_embedding, limit)
-        
-        # 3. Keyword Search (Lexical)
-        keyword_results = await self._search_keyword(query, limit)
+        vector_results, keyword_results = await self._search_legs(
+            queries, query_vectors, limit, use_keyword, filters, ef_search
+        )
+        fused_per_query = [
+            self._apply_rrf(vector_results[i], keyword_results[i], k=60)[:top_k]
+            for i in range(len(queries))
+        ]
+        # Load chunk + document rows for the Top K only (벡터 컬럼은 로드하지 않음)
+        rows = await self._load_chunks({hit.chunk_id for fused in fused_per_query for hit in fused})
+        return [self._attach_rows(fused, rows) for fused in fused_per_query]
 
-        # 4. Apply RRF
-        combined_results = self._apply_rrf(vector_results, keyword_results, k=60)
-        
-        # 5. Return Top K sorted by RRF score
-        # Note: combined_results contains (embedding_obj, score) tuples
-        return [item[0] for item in combined_results[:top_k]]
+    async def _search_legs(self, queries: List[str], query_vectors: List[List[float]], limit: int,
+                           use_keyword: bool, filters: Optional[SearchFilters],
+                           ef_search: Optional[int]) -> Tuple[List[List[Tuple[uuid.UUID, float]]], List[List[uuid.UUID]]]:
+        """쿼리별 벡터 레그(id, 거리)와 키워드 레그(id) 후보. 쿼리가 1개면 단건 쿼리, 여러 개면 배치 쿼리 사용"""
+        if settings.TWO_STAGE_RETRIEVAL:
+            filters = await self._two_stage_filters(query_vectors, filters)
+        if len(queries) == 1:
+            vector_results = [await self._search_vector(query_vectors[0], limit, filters, ef_search)]
+            keyword_results = [await self._search_keyword(queries[0], limit, filters) if use_keyword else []]
+        else:
+            vector_results = await self._search_vector_batch(query_vectors, limit, filters, ef_search)
+            keyword_results = (await self._search_keyword_batch(queries, limit, filters) if use_keyword
+                               else [[] for _ in queries])
+        return vector_results, keyword_results
 
-    async def _search_vector(self, query_vector: List[float], limit: int) -> List[Embedding]:
-        stmt = select(Embedding).order_by(
-            Embedding.embedding.l2_distance(query_vector)
-        ).limit(limit)
-        result = await self.db.execute(stmt)
-        return result.scalars().all()
+    async def _search_sharded(self, queries: List[str], query_vectors: List[List[float]], top_k: int, limit: int,
+                              use_keyword: bool, filters: Optional[SearchFilters],
+                              ef_search: Optional[int]) -> List[List[SearchHit]]:
+        """
+        모든 샤드에 레그별 상위 limit개 후보를 동시에 요청 → 전역 병합 후 RRF → 상위 청크를 소유 샤드에서 로드.
+        응답하지 않은 샤드는 missing_shards에 기록하고 나머지로 응답합니다. 모든 샤드가 실패하면 오류입니다.
+        """
+        async def legs_on(shard: int):
+            async with shard_router.session(shard) as db:
+                return await VectorService(db, PgVectorIndex(db))._search_legs(
+                    queries, query_vectors, limit, use_keyword, filters, ef_search
+                )
+
+        timeout = settings.SHARD_SEARCH_TIMEOUT_SECONDS
+        results, self.missing_shards = await scatter(
+            [partial(legs_on, shard) for shard in range(len(shard_router))], timeout
+        )
+        if not results:
+            raise ServiceUnavailableError("All vector shards failed or timed out")
+
+        owner: Dict[uuid.UUID, int] = {}
+        for shard, (vector_results, keyword_results) in results.items():
+            for i in range(len(queries)):
+                owner.update((chunk_id, shard) for chunk_id, _ in vector_results[i])
+                owner.update((chunk_id, shard) for chunk_id in keyword_results[i])
+
+        fused_per_query = []
+        for i in range(len(queries)):
+            vector_results = merge_vector_results((legs[0][i] for legs in results.values()), limit)
+            keyword_results = merge_keyword_results((legs[1][i] for legs in results.values()), limit)
+            fused_per_query.append(self._apply_rrf(vector_results, keyword_results, k=60)[:top_k])
+
+        by_shard: Dict[int, set] = {}
+        for fused in fused_per_query:
+            for hit in fused:
+                by_shard.setdefault(owner[hit.chunk_id], set()).add(hit.chunk_id)
+
+        async def load_on(shard: int, chunk_ids: set):
+            async with shard_router.session(shard) as db:
+                return await VectorService(db, PgVectorIndex(db))._load_chunks(chunk_ids)
+
+        rows: Dict[uuid.UUID, Tuple[Embedding, Document]] = {}
+        loaded, failed = await scatter(
+            [partial(load_on, shard, chunk_ids) for shard, chunk_ids in by_shard.items()], timeout
+        )
+        for part in loaded.values():
+            rows.update(part)
+        if failed:
+            shards = list(by_shard)
+            self.missing_shards = sorted(set(self.missing_shards) | {shards[i] for i in failed})
+        return [self._attach_rows(fused, rows) for fused in fused_per_query]
+
+    @staticmethod
+    def _document_clauses(filters: Optional[SearchFilters]) -> list:
+        """검색 필터를 documents 테이블 조건으로 변환 (category는 Document.category와 청크 메타데이터가 동일)"""
+        clauses = []
+        if filters is None:
+            return clauses
+        if filters.category:
+            clauses.append(Document.category == filters.category)
+        if filters.document_ids:
+            clauses.append(Document.id.in_(filters.document_ids))
+        if filters.created_from:
+            clauses.append(Document.created_at >= filters.created_from)
+        if filters.created_to:
+            clauses.append(Document.created_at < filters.created_to)
+        return clauses
+
+    async def _two_stage_filters(self, query_vectors: List[List[float]],
+                                 filters: Optional[SearchFilters]) -> Optional[SearchFilters]:
+        """
+        2단계 검색의 1단계: 문서 요약 벡터(Document.summary_embedding)로 쿼리별 상위
+        TWO_STAGE_TOP_DOCUMENTS개 문서를 골라, 청크 검색(벡터/키워드 레그)을 그 문서들로 제한하는 필터를 반환합니다.
+        배치는 쿼리별 상위 문서의 합집합으로 제한합니다.
+        요약 벡터가 있는 문서가 없으면(백필 전) 원래 필터를 그대로 반환합니다.
+        """
+        top_n = settings.TWO_STAGE_TOP_DOCUMENTS
+        if filters is not None and filters.document_ids and len(filters.document_ids) <= top_n:
+            return filters  # 이미 문서 단위로 좁혀진 요청
+        widen = top_n > DEFAULT_EF_SEARCH
+        if widen:
+            # HNSW는 최대 ef_search개만 반환하므로 상위 문서 수만큼 넓힘 (트랜잭션 한정)
+            await self.db.execute(select(func.set_config("hnsw.ef_search", str(min(top_n, MAX_EF_SEARCH)), True)))
+        q = func.unnest(
+            bindparam("query_vectors", value=[_vector_literal(vec) for vec in query_vectors], type_=ARRAY(Text))
+        ).table_valued("vec").render_derived(name="q")
+        distance = Document.summary_embedding.l2_distance(cast(q.c.vec, Vector(EMBEDDING_DIM)))
+        top = (
+            select(Document.id.label("id"))
+            .where(Document.summary_embedding.is_not(None), *self._document_clauses(filters))
+            .order_by(distance)
+            .limit(top_n)
+            .lateral("d")
+        )
+        result = await self.db.execute(select(top.c.id).select_from(q).join(top, true()).distinct())
+        document_ids = list(result.scalars().all())
+        if widen:
+            # 같은 트랜잭션의 청크 ANN 쿼리가 넓힌 값을 물려받지 않도록 바로 되돌림
+            # (청크 검색은 요청값/HNSW_EF_SEARCH가 있으면 _apply_ann_settings에서 다시 설정)
+            await self.db.execute(RESET_EF_SEARCH)
+        if not document_ids:
+            return filters
+        # category/기간 조건은 1단계에서 이미 적용됨
+        return SearchFilters(document_ids=document_ids)
+
+    async def _index_filters(self, filters: Optional[SearchFilters]) -> Optional[SearchFilters]:
+        """
+        문서 메타데이터를 모르는 인덱스(local)에는 category/기간 필터를 document_ids로 바꿔 전달합니다.
+        조건에 맞는 문서가 없으면 document_ids=[]가 반환됩니다.
+        """
+        if not self.index.requires_document_filters or filters is None:
+            return filters
+        if not (filters.category or filters.created_from or filters.created_to):
+            return filters
+        result = await self.db.execute(select(Document.id).where(*self._document_clauses(filters)))
+        return SearchFilters(document_ids=list(result.scalars().all()))
 
-    async def _search_keyword(self, query: str, limit: int) -> List[Embedding]:
+    async def _search_vector(self, query_vector: List[float], limit: int,
+                             filters: Optional[SearchFilters] = None,
+                             ef_search: Optional[int] = None) -> List[Tuple[uuid.UUID, float]]:
+        filters = await self._index_filters(filters)
+        if filters is not None and filters.document_ids == []:
+            return []
+        return await self.index.search(query_vector, limit, filters, ef_search)
+
+    async def _search_vector_batch(self, query_vectors: List[List[float]], limit: int,
+                                   filters: Optional[SearchFilters] = None,
+                                   ef_search: Optional[int] = None) -> List[List[Tuple[uuid.UUID, float]]]:
+        filters = await self._index_filters(filters)
+        if filters is not None and filters.document_ids == []:
+            return [[] for _ in query_vectors]
+        return await self.index.search_batch(query_vectors, limit, filters, ef_search)
+
+    def _keyword_conditions(self, query: str):
         # 1. 형태소 분석을 통해 명사 추출
         nouns = extract_nouns(query)
         
@@ -113,39 +409,84 @@ class VectorService:
             conditions = [Embedding.content.ilike(f"%{noun}%") for noun in nouns]
             # 원본 쿼리도 포함 (정확도 보장)
             conditions.append(Embedding.content.ilike(f"%{query}%"))
-            
-            stmt = select(Embedding).where(
-                or_(*conditions)
-            ).limit(limit)
-        else:
-            # 명사가 없으면 기존 단순 포함 검색 (Fallback)
-            search_pattern = f"%{query}%"
-            stmt = select(Embedding).where(
-                Embedding.content.ilike(search_pattern)
-            ).limit(limit)
-        
+            return or_(*conditions)
+        # 명사가 없으면 기존 단순 포함 검색 (Fallback)
+        return Embedding.content.ilike(f"%{query}%")
+
+    async def _search_keyword(self, query: str, limit: int,
+                              filters: Optional[SearchFilters] = None) -> List[uuid.UUID]:
+        stmt = select(Embedding.id).where(
+            self._keyword_conditions(query), *filter_clauses(filters)
+        ).limit(limit)
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return list(result.scalars().all())
+
+    async def _search_keyword_batch(self, queries: List[str], limit: int,
+                                    filters: Optional[SearchFilters] = None) -> List[List[uuid.UUID]]:
+        branches = []
+        for idx, query in enumerate(queries):
+            branch = select(
+                literal(idx).label("query_idx"),
+                Embedding.id.label("id"),
+                func.row_number().over().label("rank"),
+            ).where(self._keyword_conditions(query), *filter_clauses(filters)).limit(limit).subquery()
+            branches.append(select(branch.c.query_idx, branch.c.id, branch.c.rank))
+        stmt = union_all(*branches)
+        result = await self.db.execute(stmt)
+
+        per_query: List[List[Tuple[int, uuid.UUID]]] = [[] for _ in queries]
+        for row in result:
+            per_query[row.query_idx].append((row.rank, row.id))
+        return [[chunk_id for _, chunk_id in sorted(items)] for items in per_query]
+
+    async def _load_chunks(self, chunk_ids) -> Dict[uuid.UUID, Tuple[Embedding, Document]]:
+        """청크와 소속 문서를 한 번의 JOIN 쿼리로 로드합니다 (임베딩 벡터는 제외)."""
+        chunk_ids = list(chunk_ids)
+        if not chunk_ids:
+            return {}
+        stmt = (
+            select(Embedding, Document)
+            .join(Document, Embedding.document_id == Document.id)
+            .options(
+                defer(Embedding.embedding), defer(Embedding.embedding_half), defer(Embedding.embedding_short),
+                defer(Embedding.content_search), defer(Document.summary_embedding)
+            )
+            .where(Embedding.id.in_(chunk_ids))
+        )
+        result = await self.db.execute(stmt)
+        return {embedding.id: (embedding, document) for embedding, document in result.all()}
+
+    @staticmethod
+    def _attach_rows(hits: List[SearchHit], rows: Dict[uuid.UUID, Tuple[Embedding, Document]]) -> List[SearchHit]:
+        attached = []
+        for hit in hits:
+            row = rows.get(hit.chunk_id)
+            if row is None:  # 검색과 로드 사이에 삭제된 청크
+                continue
+            hit.embedding, hit.document = row
+            attached.append(hit)
+        return attached
 
-    def _apply_rrf(self, vector_results: List[Embedding], keyword_results: List[Embedding], k: int = 60) -> List[tuple]:
+    def _apply_rrf(self, vector_results: List[Tuple[uuid.UUID, float]], keyword_results: List[uuid.UUID],
+                   k: int = 60) -> List[SearchHit]:
         """
         Reciprocal Rank Fusion
         Score = 1 / (k + rank)
         """
-        scores = {}
+        hits: Dict[uuid.UUID, SearchHit] = {}
         
         # Rank Vector Results
-        for rank, doc in enumerate(vector_results):
-            if doc.id not in scores:
-                scores[doc.id] = {"doc": doc, "score": 0.0}
-            scores[doc.id]["score"] += 1.0 / (k + rank + 1)
+        for rank, (chunk_id, distance) in enumerate(vector_results):
+            hit = hits.setdefault(chunk_id, SearchHit(chunk_id))
+            hit.vector_rank = rank + 1
+            hit.vector_distance = distance
+            hit.rrf_score += 1.0 / (k + rank + 1)
             
         # Rank Keyword Results
-        for rank, doc in enumerate(keyword_results):
-            if doc.id not in scores:
-                scores[doc.id] = {"doc": doc, "score": 0.0}
-            scores[doc.id]["score"] += 1.0 / (k + rank + 1)
+        for rank, chunk_id in enumerate(keyword_results):
+            hit = hits.setdefault(chunk_id, SearchHit(chunk_id))
+            hit.keyword_rank = rank + 1
+            hit.rrf_score += 1.0 / (k + rank + 1)
             
         # Sort by combined score descending
-        sorted_docs = sorted(scores.values(), key=lambda x: x["score"], reverse=True)
-        return [(item["doc"], item["score"]) for item in sorted_docs]
\ No newline at end of file
+        return sorted(hits.values(), key=lambda h: h.rrf_score, reverse=True)
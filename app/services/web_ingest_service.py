@@ -0,0 +1,122 @@
+"""
+웹 소스 적재 (시드 URL / sitemap 크롤링 → 변경된 페이지만 임베딩)
+
+- 이전 크롤링의 ETag/Last-Modified(web_sources)로 조건부 요청 → 304면 다운로드/재임베딩 생략
+- 200이어도 본문 SHA-256이 이전과 같으면 재임베딩 생략 (검증자를 주지 않는 서버)
+- 문서는 documents.filename = url 로 저장되며, 문서가 삭제된 URL은 조건 없이 다시 받습니다.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import IngestSessionLocal
+from app.core.logging import logger
+from app.models.document import Document, FileStatus
+from app.models.web_source import WebSource
+from app.services.crawler import Crawler, FetchResult
+from app.services.ingest_service import IngestService
+from app.utils.parsers import html_to_text
+
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+class WebIngestService:
+    def __init__(self, db: AsyncSession, session_factory: async_sessionmaker = IngestSessionLocal):
+        self.db = db
+        # 페이지별 적재 세션 (IngestService가 커밋/롤백하므로 web_sources 세션과 분리)
+        self.session_factory = session_factory
+
+    async def crawl(self, seeds: Sequence[str] = (), sitemaps: Sequence[str] = (), force: bool = False,
+                    progress: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+        """
+        seeds + sitemap의 URL을 크롤링해 변경된 페이지만 적재합니다 → 결과별 건수.
+        force=True면 조건부 요청 없이 모두 다시 받습니다 (본문이 같으면 재임베딩은 생략).
+        """
+        counts = {"total": 0, "indexed": 0, "not_modified": 0, "unchanged": 0, "failed": 0}
+        async with Crawler() as crawler:
+            urls: List[str] = list(seeds)
+            for sitemap in sitemaps:
+                urls.extend(await crawler.sitemap_urls(sitemap))
+            urls = list(dict.fromkeys(urls))[:settings.CRAWL_MAX_PAGES]
+            counts["total"] = len(urls)
+
+            sources = await self._load_sources(urls)
+            validators = {} if force else {
+                url: (source.etag, source.last_modified) for url, source in sources.items() if source.content_hash
+            }
+            async for result in crawler.crawl(urls, validators):
+                source = sources.get(result.url)
+                if source is None:
+                    source = sources[result.url] = WebSource(url=result.url)
+                    self.db.add(source)
+                status = await self._handle(result, source)
+                counts[status] += 1
+                await self.db.commit()
+                if progress:
+                    progress(counts)
+        logger.info(f"🌐 Crawl finished: {counts}")
+        return counts
+
+    async def _load_sources(self, urls: List[str]) -> Dict[str, WebSource]:
+        """URL별 web_sources 행. 문서가 없거나(삭제됨) 적재가 끝나지 않은 URL은 content_hash를 비워 다시 받게 함"""
+        if not urls:
+            return {}
+        result = await self.db.execute(select(WebSource).where(WebSource.url.in_(urls)))
+        sources = {source.url: source for source in result.scalars().all()}
+        indexed = set((await self.db.execute(
+            select(Document.filename).where(Document.filename.in_(urls), Document.status == FileStatus.COMPLETED)
+        )).scalars().all())
+        for url, source in sources.items():
+            if url not in indexed:
+                source.content_hash = None
+        return sources
+
+    async def _handle(self, result: FetchResult, source: WebSource) -> str:
+        source.last_status = result.status
+        if result.not_modified:
+            return "not_modified"
+        if not result.ok:
+            logger.warning(f"Crawl failed: {result.url} ({result.status} {result.error or ''})")
+            return "failed"
+
+        source.etag, source.last_modified = result.etag, result.last_modified
+        source.fetched_at = datetime.now(timezone.utc)
+        content_hash = hashlib.sha256(result.body).hexdigest()
+        if content_hash == source.content_hash:
+            return "unchanged"
+
+        content_type = result.content_type.split(";")[0].strip().lower()
+        if content_type and content_type not in TEXT_CONTENT_TYPES:
+            logger.warning(f"Unsupported content type, skipping: {result.url} ({content_type})")
+            return "failed"
+        text = _decode(result.body, result.content_type)
+        if content_type != "text/plain":
+            text = html_to_text(text)
+        try:
+            async with self.session_factory() as db:
+                await IngestService(db).process_document(
+                    result.url, "web", content_hash, content=text, filename=result.url
+                )
+        except Exception as e:
+            logger.warning(f"Failed to ingest {result.url}: {e}")
+            # 다음 크롤링에서 조건부 요청 없이 다시 받도록
+            source.etag = source.last_modified = source.content_hash = None
+            return "failed"
+        source.content_hash = content_hash
+        return "indexed"
+
+
+def _decode(body: bytes, content_type: str) -> str:
+    """Content-Type의 charset으로 디코딩 (없거나 알 수 없으면 UTF-8)"""
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            try:
+                return body.decode(value.strip().strip('"'), errors="replace")
+            except LookupError:
+                break
+    return body.decode("utf-8", errors="replace")
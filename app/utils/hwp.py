@@ -0,0 +1,129 @@
+"""
+HWP 5.0 본문 텍스트 추출 (레코드 스트림 파서)
+
+HWP 5.0은 OLE 복합 파일이며, 본문은 BodyText/Section{N} 스트림에 레코드 단위로 저장됩니다.
+- FileHeader의 속성 비트 0이 켜져 있으면 각 섹션 스트림은 raw deflate(zlib 헤더 없음)로 압축되어 있습니다.
+- 레코드 헤더(4바이트, little-endian): Tag ID 10비트 | Level 10비트 | Size 12비트
+  Size가 0xFFF이면 이어지는 4바이트가 실제 크기입니다.
+- 문단 텍스트는 HWPTAG_PARA_TEXT(67) 레코드의 UTF-16LE 문자열이며, 제어 문자(0~31) 일부는
+  8 WCHAR(16바이트) 크기의 인라인/확장 컨트롤입니다 (표/그림/필드 등 — 텍스트가 아니므로 제외).
+
+스트림을 READ_SIZE 단위로 읽으며 점진적으로 압축을 풀고 완성된 레코드만 처리하므로,
+압축을 푼 섹션 전체를 메모리에 만들지 않습니다 (olefile은 압축된 스트림만 메모리에 올림).
+표 셀/글상자 안의 문단도 같은 섹션 스트림의 PARA_TEXT 레코드로 들어 있어 함께 추출됩니다.
+"""
+import re
+import struct
+import zlib
+from typing import BinaryIO, Iterator
+
+READ_SIZE = 64 * 1024
+
+HWPTAG_BEGIN = 0x10
+HWPTAG_PARA_TEXT = HWPTAG_BEGIN + 51  # 67
+
+# FileHeader 속성 비트
+FLAG_COMPRESSED = 0x01
+FLAG_PASSWORD = 0x02
+FLAG_DISTRIBUTION = 0x04  # 배포용 문서: 본문이 ViewText에 암호화되어 저장됨
+
+# 8 WCHAR 크기의 인라인/확장 컨트롤 (그 외 0~31은 1 WCHAR 문자 컨트롤)
+EXTENDED_CONTROLS = frozenset([1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23])
+# 문자 컨트롤 → 텍스트 (13: 문단 끝, 그 외 표시되지 않는 컨트롤은 제거)
+CONTROL_TEXT = {10: "\n", 24: "-", 30: " ", 31: " "}
+
+_SECTION_RE = re.compile(r"^BodyText/Section(\d+)$")
+
+
+class HwpError(Exception):
+    pass
+
+
+def iter_records(stream: BinaryIO, compressed: bool) -> Iterator[tuple]:
+    """(tag_id, level, payload) 레코드를 스트림에서 순서대로 (압축 섹션은 점진적으로 풀면서)"""
+    inflater = zlib.decompressobj(-zlib.MAX_WBITS) if compressed else None
+    buffer = bytearray()
+    offset = 0
+    eof = False
+    while True:
+        # 버퍼에 있는 완성된 레코드 처리
+        while True:
+            if len(buffer) - offset < 4:
+                break
+            header, = struct.unpack_from("<I", buffer, offset)
+            tag_id, level, size = header & 0x3FF, (header >> 10) & 0x3FF, header >> 20
+            start = offset + 4
+            if size == 0xFFF:
+                if len(buffer) - start < 4:
+                    break
+                size, = struct.unpack_from("<I", buffer, start)
+                start += 4
+            if len(buffer) - start < size:
+                break
+            yield tag_id, level, bytes(buffer[start:start + size])
+            offset = start + size
+        del buffer[:offset]
+        offset = 0
+        if eof:
+            return  # 잘린 마지막 레코드는 무시
+        data = stream.read(READ_SIZE)
+        if not data:
+            eof = True
+            if inflater is not None:
+                buffer.extend(inflater.flush())
+            continue
+        buffer.extend(inflater.decompress(data) if inflater is not None else data)
+
+
+def para_text(payload: bytes) -> str:
+    """PARA_TEXT 레코드 → 문단 문자열 (컨트롤 제외)"""
+    parts = []
+    start = i = 0
+    n = len(payload) // 2
+    while i < n:
+        code = payload[2 * i] | (payload[2 * i + 1] << 8)
+        if code >= 32:
+            i += 1
+            continue
+        # 컨트롤 앞까지의 일반 문자는 한 번에 디코딩 (서로게이트 쌍 유지)
+        parts.append(payload[2 * start:2 * i].decode("utf-16-le", errors="ignore"))
+        if code in EXTENDED_CONTROLS:
+            parts.append("\t" if code == 9 else "")
+            i += 8
+        else:
+            parts.append(CONTROL_TEXT.get(code, ""))
+            i += 1
+        start = i
+    parts.append(payload[2 * start:2 * n].decode("utf-16-le", errors="ignore"))
+    return "".join(parts)
+
+
+def iter_paragraphs(stream: BinaryIO, compressed: bool) -> Iterator[str]:
+    for tag_id, _, payload in iter_records(stream, compressed):
+        if tag_id == HWPTAG_PARA_TEXT:
+            text = para_text(payload).strip()
+            if text:
+                yield text
+
+
+def iter_sections(file_path: str) -> Iterator[str]:
+    """HWP 파일의 섹션별 본문 텍스트 (섹션 번호 순)"""
+    import olefile
+
+    with olefile.OleFileIO(file_path) as ole:
+        header = ole.openstream("FileHeader").read(256)
+        if not header.startswith(b"HWP Document File"):
+            raise HwpError("Not an HWP 5.0 document")
+        flags, = struct.unpack_from("<I", header, 36)
+        if flags & (FLAG_PASSWORD | FLAG_DISTRIBUTION):
+            raise HwpError("Encrypted or distribution-only HWP document")
+        compressed = bool(flags & FLAG_COMPRESSED)
+
+        sections = []
+        for entry in ole.listdir(streams=True, storages=False):
+            match = _SECTION_RE.match("/".join(entry))
+            if match:
+                sections.append((int(match.group(1)), entry))
+        for _, entry in sorted(sections):
+            with ole.openstream(entry) as stream:
+                yield "\n".join(iter_paragraphs(stream, compressed))
@@ -1,35 +1,62 @@
+"""
+파일/웹 문서 파서
+
+파서 라이브러리(olefile, PyMuPDF, python-docx, openpyxl, BeautifulSoup, requests)와 텍스트 분할기는
+각 함수에서 처음 사용할 때 import합니다 (API 프로세스가 이 모듈을 import해도 로드되지 않도록).
+"""
 import os
-import olefile
-import fitz  # PyMuPDF
-from docx import Document
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.hwp import iter_sections
+from app.utils.pdf import ProgressCallback, extract_pages
+from app.utils.tabular import iter_table_chunks
+
+if TYPE_CHECKING:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# 행 묶음 단위로 바로 청크를 만드는 표 형식 (텍스트 분할기를 거치지 않음)
+TABULAR_EXTENSIONS = ('.xlsx', '.xls', '.csv')
 
 def parse_hwp(file_path: str) -> str:
+    # 섹션 스트림을 점진적으로 압축 해제하며 문단 텍스트(PARA_TEXT) 레코드만 추출
     try:
+        import olefile
         if not olefile.isOleFile(file_path): return ""
-        ole = olefile.OleFileIO(file_path)
-        text_parts = []
-        for stream in ole.listdir():
-            if '/'.join(stream).startswith('BodyText/Section'):
-                data = ole.openstream(stream).read()
-                text = data.decode('utf-16le', errors='ignore').replace('\x00', '').strip()
-                if text: text_parts.append(text)
-        ole.close()
-        return '\n'.join(text_parts)
+        return '\n\n'.join(section for section in iter_sections(file_path) if section)
     except Exception: return ""
 
-def parse_pdf(file_path: str) -> str:
+def parse_pdf_pages(file_path: str, progress: Optional[ProgressCallback] = None) -> List[str]:
+    """페이지별 텍스트 (페이지 구간 병렬 추출 + 페이지 캐시, 실패 시 빈 목록)"""
     try:
-        doc = fitz.open(file_path)
-        text = '\n\n'.join([page.get_text() for page in doc])
-        doc.close()
-        return text
-    except Exception: return ""
+        return extract_pages(file_path, progress=progress)
+    except Exception: return []
+
+def parse_pdf(file_path: str) -> str:
+    return '\n\n'.join(parse_pdf_pages(file_path))
+
+def text_splitter() -> "RecursiveCharacterTextSplitter":
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP,
+        separators=["\n\n", "\n", ". ", " ", ""]
+    )
+
+def split_pages(pages: List[str]) -> Tuple[List[str], List[int]]:
+    """페이지마다 따로 분할 → (청크, 청크별 페이지 번호(1부터)). 청크가 페이지 경계를 넘지 않음"""
+    splitter = text_splitter()
+    chunks, page_numbers = [], []
+    for page_number, page in enumerate(pages, start=1):
+        for chunk in splitter.split_text(page):
+            chunks.append(chunk)
+            page_numbers.append(page_number)
+    return chunks, page_numbers
 
 def parse_docx(file_path: str) -> str:
     try:
+        from docx import Document
         doc = Document(file_path)
         parts = [p.text for p in doc.paragraphs if p.text.strip()]
         for table in doc.tables:
@@ -38,26 +65,17 @@ def parse_docx(file_path: str) -> str:
         return '\n'.join(parts)
     except Exception: return ""
 
-def parse_excel(file_path: str) -> str:
+def parse_table_chunks(file_path: str, chunk_size: int = 0) -> list:
+    """XLSX/XLS/CSV → 헤더를 반복한 행 묶음 청크 목록 (스트리밍 파싱, 실패 시 빈 목록)"""
     try:
-        excel_file = pd.ExcelFile(file_path)
-        parts = []
-        for sheet in excel_file.sheet_names:
-            df = pd.read_excel(file_path, sheet_name=sheet)
-            if not df.empty:
-                parts.append(f"## 시트: {sheet}\n{df.to_markdown(index=False)}")
-        return '\n'.join(parts)
-    except Exception: return ""
+        return list(iter_table_chunks(file_path, chunk_size or settings.CHUNK_SIZE))
+    except Exception: return []
+
+def parse_excel(file_path: str) -> str:
+    return '\n\n'.join(parse_table_chunks(file_path))
 
 def parse_csv(file_path: str) -> str:
-    try:
-        for enc in ['utf-8', 'cp949', 'euc-kr']:
-            try:
-                df = pd.read_csv(file_path, encoding=enc)
-                return df.to_markdown(index=False) or ""
-            except: continue
-        return ""
-    except Exception: return ""
+    return '\n\n'.join(parse_table_chunks(file_path))
 
 def parse_text(file_path: str) -> str:
     try:
@@ -68,25 +86,30 @@ def parse_text(file_path: str) -> str:
         return ""
     except Exception: return ""
 
+def html_to_text(html: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Remove unwanted tags
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+
+    # Extract text
+    text = soup.get_text(separator='\n\n')
+    
+    # Clean text
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
 def parse_web_content(url: str) -> str:
     try:
+        import requests
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
         response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove unwanted tags
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-
-        # Extract text
-        text = soup.get_text(separator='\n\n')
-        
-        # Clean text
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        return '\n'.join(chunk for chunk in chunks if chunk)
+        return html_to_text(response.text)
     except Exception: return ""
 
 def parse_file(file_path: str) -> str:
@@ -0,0 +1,244 @@
+"""
+PDF 페이지 병렬 추출 + 페이지 텍스트 캐시
+
+- 페이지마다 콘텐츠 스트림 + 페이지가 참조하는 리소스(폰트/ToUnicode/인코딩/Form XObject …) 객체 그래프의
+  SHA-256을 키로 추출한 텍스트를 PDF_PAGE_CACHE_DIR에 저장합니다. 콘텐츠 스트림이 같아도
+  (`q /Fm0 Do Q`처럼 내용이 모두 XObject에 있거나, 글리프 코드가 같은 서브셋 폰트) 리소스가 다르면 키가 다릅니다.
+  조금 수정한 PDF를 다시 올리면 바뀐 페이지만 다시 추출합니다 (키 계산은 텍스트 추출보다 훨씬 가벼움).
+- 캐시는 모든 문서가 공유하며, PDF_PAGE_CACHE_MAX_MB를 넘으면 오래 쓰이지 않은 파일부터 지웁니다
+  (정리는 PDF_PAGE_CACHE_PRUNE_INTERVAL_SECONDS에 한 번). 캐시 디렉터리는 언제 지워도 안전합니다.
+- 캐시에 없는 페이지는 연속 구간(PDF_PAGES_PER_TASK쪽 단위)으로 나눠 프로세스 풀에서 추출합니다.
+  페이지 수가 적거나 이미 프로세스 풀 안(app.bulk_ingest)이면 현재 프로세스에서 추출합니다.
+- progress(완료 페이지 수, 전체 페이지 수)는 페이지마다 호출됩니다 (캐시 적중 포함).
+"""
+import hashlib
+import multiprocessing
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+# 추출 방식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = b"pdf-text-v2"
+
+ProgressCallback = Callable[[int, int], None]
+
+_REF_RE = re.compile(rb"(\d+) \d+ R")
+_PRUNE_MARKER = ".pruned"
+
+
+class PageCache:
+    """페이지 키 → 텍스트 (키 앞 2글자 하위 디렉터리에 파일 하나씩, 원자적 쓰기)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # 최근 사용 시각 (정리 순서 기준)
+        except OSError:
+            pass
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def prune(self, max_bytes: int) -> int:
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 쓰이지 않은 파일부터 삭제 → 삭제한 파일 수"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name == _PRUNE_MARKER:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def maybe_prune(self, max_bytes: int, interval: float) -> None:
+        """마지막 정리 후 interval초가 지났으면 정리 (디렉터리 전체를 훑으므로 적재마다 하지 않음)"""
+        marker = os.path.join(self.directory, _PRUNE_MARKER)
+        try:
+            if time.time() - os.stat(marker).st_mtime < interval:
+                return
+        except FileNotFoundError:
+            pass
+        os.makedirs(self.directory, exist_ok=True)
+        with open(marker, "w"):
+            pass
+        self.prune(max_bytes)
+
+
+def default_cache() -> Optional[PageCache]:
+    return PageCache(settings.PDF_PAGE_CACHE_DIR) if settings.PDF_PAGE_CACHE_DIR else None
+
+
+def _inherited_resources(doc, page) -> bytes:
+    """페이지의 /Resources 값 (없으면 상위 Pages 노드에서 상속)"""
+    xref = page.xref
+    seen: Set[int] = set()
+    while xref and xref not in seen:
+        seen.add(xref)
+        kind, value = doc.xref_get_key(xref, "Resources")
+        if kind != "null":
+            return value.encode()
+        kind, value = doc.xref_get_key(xref, "Parent")
+        xref = int(value.split()[0]) if kind == "xref" else 0
+    return b""
+
+
+class _ObjectHasher:
+    """
+    간접 객체의 내용 해시 (참조하는 객체의 해시를 재귀적으로 포함, 문서 안에서 xref별로 한 번만 계산).
+    객체 번호가 아니라 내용으로 해시하므로 다른 문서/다른 버전의 같은 리소스는 같은 해시가 됩니다.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.xref_count = doc.xref_length()
+        self.digests: Dict[int, bytes] = {}
+        self.active: Set[int] = set()
+
+    def source(self, source: bytes) -> bytes:
+        digest = hashlib.sha256()
+        last = 0
+        for match in _REF_RE.finditer(source):
+            digest.update(source[last:match.start()])
+            digest.update(self.xref(int(match.group(1))))
+            last = match.end()
+        digest.update(source[last:])
+        return digest.digest()
+
+    def xref(self, xref: int) -> bytes:
+        if xref in self.digests:
+            return self.digests[xref]
+        if not 0 < xref < self.xref_count or xref in self.active:
+            return b"ref:%d" % xref  # 잘못된 참조 / 순환 참조
+        self.active.add(xref)
+        source = self.doc.xref_object(xref, compressed=True).encode()
+        digest = hashlib.sha256(self.source(source))
+        # 이미지 픽셀은 텍스트 추출과 무관하므로 스트림 본문은 해시하지 않음 (폰트/Form XObject/CMap은 포함)
+        if self.doc.xref_is_stream(xref) and self.doc.xref_get_key(xref, "Subtype") != ("name", "/Image"):
+            digest.update(self.doc.xref_stream_raw(xref) or b"")
+        self.active.discard(xref)
+        self.digests[xref] = digest.digest()
+        return self.digests[xref]
+
+
+def page_key(page, hasher: Optional[_ObjectHasher] = None) -> str:
+    """콘텐츠 스트림 + 회전 + 리소스 객체 그래프의 해시 (hasher를 넘기면 문서 안의 공유 리소스는 한 번만 해시)"""
+    hasher = hasher or _ObjectHasher(page.parent)
+    digest = hashlib.sha256(CACHE_VERSION)
+    digest.update(str(page.rotation).encode())
+    digest.update(hasher.source(_inherited_resources(page.parent, page)))
+    digest.update(page.read_contents())
+    return digest.hexdigest()
+
+
+def page_ranges(pages: List[int], size: int) -> List[Tuple[int, int]]:
+    """페이지 번호 목록 → 연속 구간 [start, end) (구간 하나는 최대 size쪽)"""
+    ranges: List[Tuple[int, int]] = []
+    for page in pages:
+        if ranges and ranges[-1][1] == page and page - ranges[-1][0] < size:
+            ranges[-1] = (ranges[-1][0], page + 1)
+        else:
+            ranges.append((page, page + 1))
+    return ranges
+
+
+def extract_range(file_path: str, start: int, end: int) -> List[str]:
+    """(프로세스 풀에서 실행) start~end-1 페이지 텍스트"""
+    import fitz  # PyMuPDF
+
+    with fitz.open(file_path) as doc:
+        return [doc[i].get_text() for i in range(start, end)]
+
+
+def _workers(workers: Optional[int]) -> int:
+    workers = workers or settings.PDF_EXTRACT_WORKERS or os.cpu_count() or 1
+    # 이미 풀의 자식 프로세스(데몬 포함)라면 중첩 풀을 만들지 않음
+    if multiprocessing.parent_process() is not None or multiprocessing.current_process().daemon:
+        return 1
+    return workers
+
+
+def extract_pages(file_path: str, workers: Optional[int] = None, progress: Optional[ProgressCallback] = None,
+                  cache: Optional[PageCache] = None) -> List[str]:
+    """PDF 페이지별 텍스트 (index = 페이지 번호 - 1)"""
+    import fitz  # PyMuPDF
+
+    cache = cache if cache is not None else default_cache()
+    with fitz.open(file_path) as doc:
+        if cache:
+            hasher = _ObjectHasher(doc)
+            keys = [page_key(page, hasher) for page in doc]
+        else:
+            keys = [None] * doc.page_count
+
+    total = len(keys)
+    texts: List[Optional[str]] = [cache.get(key) if cache else None for key in keys]
+    done = 0
+    for text in texts:
+        if text is not None:
+            done += 1
+            if progress:
+                progress(done, total)
+
+    def store(start: int, extracted: List[str]) -> None:
+        nonlocal done
+        for offset, text in enumerate(extracted):
+            texts[start + offset] = text
+            if cache:
+                cache.put(keys[start + offset], text)
+            done += 1
+            if progress:
+                progress(done, total)
+
+    missing = [i for i, text in enumerate(texts) if text is None]
+    ranges = page_ranges(missing, settings.PDF_PAGES_PER_TASK)
+    workers = min(_workers(workers), len(ranges))
+    if workers <= 1 or len(missing) < settings.PDF_PARALLEL_MIN_PAGES:
+        with fitz.open(file_path) as doc:
+            for page in missing:
+                store(page, [doc[page].get_text()])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(extract_range, file_path, start, end): start for start, end in ranges}
+            for future in as_completed(futures):
+                store(futures[future], future.result())
+    if cache and missing and settings.PDF_PAGE_CACHE_MAX_MB:
+        cache.maybe_prune(settings.PDF_PAGE_CACHE_MAX_MB * 1024 * 1024, settings.PDF_PAGE_CACHE_PRUNE_INTERVAL_SECONDS)
+    return texts
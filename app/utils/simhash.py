@@ -0,0 +1,101 @@
+"""
+SimHash 기반 근사 중복(near-duplicate) 청크 탐지
+
+- simhash: 단어 3-gram shingle을 64비트로 해시해 가중 합산한 지문. 해밍 거리가 작을수록 내용이 비슷함
+- simhash_bands: 64비트를 NEAR_DUP_BANDS개 구간으로 나눈 값. 해밍 거리가 d 이하인 두 지문은
+  구간이 d+1개 이상이면 적어도 한 구간이 정확히 같으므로(비둘기집 원리), 구간 배열의 겹침(&&, GIN 인덱스)으로
+  후보를 찾고 해밍 거리로 확정합니다.
+- SignatureIndex: 메모리 안의 지문을 구간 값으로 색인해 같은 구간 값을 가진 항목만 비교합니다.
+"""
+import hashlib
+import re
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+SIMHASH_BITS = 64
+NEAR_DUP_BANDS = 4
+SHINGLE_SIZE = 3
+BAND_BITS = SIMHASH_BITS // NEAR_DUP_BANDS
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _features(text: str) -> List[str]:
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        return tokens
+    return [" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str) -> int:
+    """64비트 SimHash (Postgres bigint에 저장할 수 있도록 부호 있는 정수로 반환)"""
+    weights = [0] * SIMHASH_BITS
+    for feature in _features(text):
+        h = _hash64(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    value = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def simhash_bands(signature: int) -> List[int]:
+    """구간별 값. 같은 값이 다른 구간에서 겹치지 않도록 구간 번호를 상위 비트에 붙임"""
+    unsigned = signature & ((1 << SIMHASH_BITS) - 1)
+    mask = (1 << BAND_BITS) - 1
+    return [(band << BAND_BITS) | ((unsigned >> (band * BAND_BITS)) & mask) for band in range(NEAR_DUP_BANDS)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count("1")
+
+
+class SignatureIndex:
+    """구간 값 → (SimHash, 값) 목록. find()는 구간 값이 같은 항목만 해밍 거리로 확인합니다."""
+
+    def __init__(self):
+        self._buckets: Dict[int, List[Tuple[int, Any]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, signature: int, value: Any) -> None:
+        for band in simhash_bands(signature):
+            self._buckets.setdefault(band, []).append((signature, value))
+        self._size += 1
+
+    def find(self, signature: int, max_distance: int) -> Optional[Any]:
+        """해밍 거리가 max_distance 이하인 항목의 값 (없으면 None)"""
+        for band in simhash_bands(signature):
+            for candidate, value in self._buckets.get(band, ()):
+                if hamming_distance(signature, candidate) <= max_distance:
+                    return value
+        return None
+
+
+def cluster_pairs(pairs: Iterable[Tuple[Hashable, Hashable]]) -> List[List[Hashable]]:
+    """
+    근사 중복 쌍 (a, b) 목록을 연결 요소(클러스터)로 묶습니다 (큰 순서, 멤버는 처음 등장한 순서).
+    쌍에 등장한 id만 union-find에 올리므로 메모리는 코퍼스 크기가 아니라 중복 청크 수에 비례합니다.
+    """
+    parent: Dict[Hashable, Hashable] = {}
+
+    def find(item: Hashable) -> Hashable:
+        parent.setdefault(item, item)
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for a, b in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    clusters: Dict[Hashable, List[Hashable]] = {}
+    for item in parent:
+        clusters.setdefault(find(item), []).append(item)
+    return sorted(clusters.values(), key=len, reverse=True)
+
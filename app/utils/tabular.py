@@ -0,0 +1,122 @@
+"""
+스트리밍 표 파서 (XLSX/XLS/CSV → 행 묶음 청크)
+
+- XLSX: openpyxl read-only 모드로 행을 하나씩 읽습니다 (시트 전체를 DataFrame으로 만들지 않음).
+- CSV: 앞부분 샘플로 인코딩/구분자를 판별한 뒤 csv.reader로 한 번만 읽습니다.
+- 행들을 청크 크기(max_chars) 이하의 마크다운 표로 묶고, 묶음마다 시트 이름과 헤더를 반복합니다.
+  각 묶음이 그대로 청크가 되므로 텍스트 분할기가 표 중간을 자르지 않고, 검색된 청크만으로 열 의미를 알 수 있습니다.
+"""
+import codecs
+import csv
+import os
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SAMPLE_SIZE = 64 * 1024
+CSV_ENCODINGS = ("utf-8-sig", "cp949")  # cp949는 euc-kr의 상위 집합
+CSV_DELIMITERS = ",\t;|"
+
+Row = Sequence[object]
+
+
+def sniff_encoding(file_path: str, sample_size: int = SAMPLE_SIZE) -> str:
+    """앞부분 샘플을 디코딩해 보고 인코딩 결정 (샘플 끝에서 잘린 멀티바이트 문자는 허용)"""
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_size)
+    for encoding in CSV_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def iter_csv_rows(file_path: str) -> Iterator[Tuple[str, Iterator[Row]]]:
+    encoding = sniff_encoding(file_path)
+    with open(file_path, "r", encoding=encoding, errors="replace", newline="") as f:
+        sample = f.read(SAMPLE_SIZE)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS)
+        except csv.Error:
+            dialect = csv.excel
+        yield "", csv.reader(f, dialect)
+
+
+def iter_xlsx_rows(file_path: str) -> Iterator[Tuple[str, Iterator[Row]]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            yield sheet.title, sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_xls_rows(file_path: str) -> Iterator[Tuple[str, Iterator[Row]]]:
+    # 구형 .xls는 openpyxl 미지원 → pandas로 통합문서를 한 번만 읽음 (sheet_name=None: 모든 시트)
+    import pandas as pd
+
+    for title, df in pd.read_excel(file_path, sheet_name=None, header=None, dtype=str).items():
+        yield title, (tuple(None if pd.isna(v) else v for v in row) for row in df.itertuples(index=False))
+
+
+def _cell(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).replace("\r", " ").replace("\n", " ").replace("|", "\\|").strip()
+
+
+def _cells(row: Row) -> List[str]:
+    cells = [_cell(value) for value in row]
+    while cells and not cells[-1]:
+        cells.pop()
+    return cells
+
+
+def _line(cells: Sequence[str], width: int) -> str:
+    cells = list(cells) + [""] * (width - len(cells))
+    return "| " + " | ".join(cells) + " |"
+
+
+def row_groups(rows: Iterable[Row], max_chars: int, title: str = "") -> Iterator[str]:
+    """
+    첫 번째 비어 있지 않은 행을 헤더로 보고, 나머지 행을 max_chars 이하의 마크다운 표로 묶어 반환합니다.
+    행 하나가 max_chars보다 길면 그 행만으로 한 묶음이 됩니다.
+    """
+    header: Optional[List[str]] = None
+    prefix = ""
+    group: List[str] = []
+    size = 0
+    for row in rows:
+        cells = _cells(row)
+        if not cells:
+            continue
+        if header is None:
+            header = cells
+            width = len(header)
+            prefix = (f"## 시트: {title}\n" if title else "") + _line(header, width) + "\n" + _line(["---"] * width, width)
+            continue
+        line = _line(cells, width)
+        if group and size + len(line) + 1 > max_chars:
+            yield prefix + "\n" + "\n".join(group)
+            group = []
+        if not group:
+            size = len(prefix)
+        group.append(line)
+        size += len(line) + 1
+    if group:
+        yield prefix + "\n" + "\n".join(group)
+    elif header is not None:
+        yield prefix  # 헤더만 있는 시트
+
+
+def iter_table_chunks(file_path: str, max_chars: int) -> Iterator[str]:
+    """XLSX/XLS/CSV 파일을 행 묶음 청크로 (시트 순서대로)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    sheets = {".xlsx": iter_xlsx_rows, ".xls": iter_xls_rows, ".csv": iter_csv_rows}[ext](file_path)
+    for title, rows in sheets:
+        yield from row_groups(rows, max_chars, title)
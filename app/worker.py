@@ -1,18 +1,28 @@
 import asyncio
-from app.core.celery_app import celery_app
-from app.core.database import AsyncSessionLocal
+from typing import List, Optional
+from app.core.celery_app import celery_app, trace_carrier
+from app.core.database import IngestSessionLocal
+from app.core import tracing
 from app.services.ingest_service import IngestService
+from app.services.document_service import DocumentService, BULK_DELETE_BATCH_SIZE
+from app.services.index_service import IndexService, HNSW_INDEXES
+from app.services.web_ingest_service import WebIngestService
 from asgiref.sync import async_to_sync
 
-@celery_app.task(acks_late=True)
-def process_document_task(file_path: str, source_type: str):
+@celery_app.task(bind=True, acks_late=True)
+def process_document_task(self, file_path: str, source_type: str, content_hash: Optional[str] = None):
     """
     비동기 문서 처리 태스크 (Celery Worker에서 실행)
+    content_hash: 업로드 시 계산한 원본 SHA-256 (같은 내용이 이미 적재되어 있으면 건너뜀)
     """
+    def report(done: int, total: int):
+        # PDF 페이지 추출 진행률 (GET /documents/tasks/{task_id})
+        self.update_state(state="PROGRESS", meta={"pages_done": done, "pages_total": total})
+
     async def _process():
-        async with AsyncSessionLocal() as db:
+        async with IngestSessionLocal() as db:
             service = IngestService(db)
-            await service.process_document(file_path, source_type)
+            await service.process_document(file_path, source_type, content_hash, progress=report)
 
     # Celery는 기본적으로 동기 함수를 기대하므로, 비동기 코드를 실행하기 위해 async_to_sync 사용
     # 또는 asyncio.run(_process()) 사용
@@ -21,6 +31,90 @@ def process_document_task(file_path: str, source_type: str):
     except RuntimeError:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-    
-    loop.run_until_complete(_process())
+
+    # API 요청에서 전달된 trace context를 이어받아 하나의 trace로 기록
+    parent = tracing.extract_context(trace_carrier(self.request))
+    with tracing.start_span(
+        "celery.process_document_task", context=parent, kind="consumer",
+        file_path=file_path, source_type=source_type, task_id=self.request.id
+    ):
+        loop.run_until_complete(_process())
     return f"Processed {file_path}"
+
+@celery_app.task(bind=True, acks_late=False)
+def bulk_delete_documents_task(self, document_ids: Optional[List[str]] = None, category: Optional[str] = None,
+                               filename_pattern: Optional[str] = None, batch_size: int = BULK_DELETE_BATCH_SIZE):
+    """
+    조건에 맞는 문서를 배치 단위로 삭제 (청크는 ON DELETE CASCADE)
+    진행률은 PROGRESS 상태의 meta({"deleted", "total"})로 GET /documents/tasks/{task_id}에서 확인합니다.
+    배치마다 커밋하므로 중단되어도 이미 삭제된 배치는 유지되고, 재실행하면 남은 문서만 삭제합니다.
+    """
+    def report(deleted: int, total: int):
+        self.update_state(state="PROGRESS", meta={"deleted": deleted, "total": total})
+
+    async def _delete():
+        async with IngestSessionLocal() as db:
+            return await DocumentService(db).bulk_delete(
+                document_ids, category, filename_pattern, batch_size=batch_size, progress=report
+            )
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    parent = tracing.extract_context(trace_carrier(self.request))
+    with tracing.start_span("celery.bulk_delete_documents_task", context=parent, kind="consumer",
+                            task_id=self.request.id):
+        return loop.run_until_complete(_delete())
+
+@celery_app.task(bind=True, acks_late=False)
+def crawl_web_task(self, seeds: Optional[List[str]] = None, sitemaps: Optional[List[str]] = None, force: bool = False):
+    """
+    시드 URL / sitemap 크롤링 후 변경된 페이지만 적재
+    진행률은 PROGRESS 상태의 meta(결과별 건수)로 GET /documents/tasks/{task_id}에서 확인합니다.
+    """
+    def report(counts):
+        self.update_state(state="PROGRESS", meta=dict(counts))
+
+    async def _crawl():
+        async with IngestSessionLocal() as db:
+            return await WebIngestService(db).crawl(seeds or [], sitemaps or [], force=force, progress=report)
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    parent = tracing.extract_context(trace_carrier(self.request))
+    with tracing.start_span("celery.crawl_web_task", context=parent, kind="consumer", task_id=self.request.id):
+        return loop.run_until_complete(_crawl())
+
+@celery_app.task(acks_late=False)
+def rebuild_index_task(target: str, m: Optional[int] = None, ef_construction: Optional[int] = None,
+                       prewarm: bool = True):
+    """
+    HNSW/GIN 인덱스 온라인 재생성 (수 분~수 시간 소요 가능)
+    진행률은 GET /admin/indexes/progress (pg_stat_progress_create_index)로 확인합니다.
+    acks_late=False: 워커 재시작 시 긴 빌드가 자동으로 재실행되지 않도록 함
+    """
+    async def _rebuild():
+        service = IndexService()
+        results = {}
+        for key in HNSW_INDEXES:
+            if target in (key, "all"):
+                results[key] = await service.rebuild_hnsw(m, ef_construction, prewarm=prewarm, target=key)
+        if target in ("gin", "all"):
+            results["gin"] = await service.rebuild_gin(prewarm=prewarm)
+        return results
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    with tracing.start_span("celery.rebuild_index_task", kind="consumer", target=target):
+        return loop.run_until_complete(_rebuild())
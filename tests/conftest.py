@@ -1,7 +1,10 @@
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import pytest
+
 
 def pytest_configure() -> None:
     # pytest 실행 환경에 따라 repo root가 sys.path에 없을 수 있어 app 패키지 import가 실패할 수 있음.
@@ -13,3 +16,77 @@ def pytest_configure() -> None:
     # app.core.config.Settings 가 import 시점에 필수 env를 요구하므로,
     # CI/로컬 모두에서 최소한의 더미 값을 제공해 테스트 수집이 실패하지 않게 함.
     os.environ.setdefault("GOOGLE_API_KEY", "dummy")
+
+
+class RecordingResult:
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def scalar(self):
+        return self.rows[0] if self.rows else None
+
+    def first(self):
+        return self.scalar()
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class RecordingSession:
+    """
+    실행된 문장을 기록하는 DB 대역 (AsyncSession / AsyncConnection / AsyncEngine 자리에 사용).
+    결과 행은 respond(statement)가 정하며, 기본값은 set_config SELECT에는 빈 결과, 나머지 문장에는 rows입니다.
+    SQL 검증은 render()로 PostgreSQL 방언으로 렌더링해서 합니다.
+    """
+    def __init__(self, rows=(), respond=None):
+        self.respond = respond or (lambda statement: [] if "set_config" in str(statement) else rows)
+        self.statements = []
+        self.commits = 0
+        self.transactions = 0
+        self.options = None
+        self.closed = False
+
+    @staticmethod
+    def render(statement, literal_binds: bool = False) -> str:
+        """literal_binds=True이면 바인드 값까지 렌더링 (set_config 값 확인용)"""
+        from sqlalchemy.dialects import postgresql
+
+        kwargs = {"literal_binds": True} if literal_binds else {"render_postcompile": True}
+        return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs=kwargs))
+
+    def sql(self, index: int = -1, literal_binds: bool = False) -> str:
+        return self.render(self.statements[index], literal_binds)
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return RecordingResult(self.respond(statement))
+
+    async def commit(self):
+        self.commits += 1
+
+    @asynccontextmanager
+    async def begin(self):
+        self.transactions += 1
+        yield self
+
+    async def connect(self):
+        return self
+
+    async def execution_options(self, **options):
+        self.options = options
+        return self
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def recording_session():
+    """RecordingSession 클래스 (recording_session(rows)로 세션을 만들고, recording_session.render로 SQL 렌더링)"""
+    return RecordingSession
@@ -0,0 +1,328 @@
+"""
+ANN 파라미터 Recall / Latency 스윕
+
+embeddings 테이블 스냅샷에서 정확한(brute-force) Top-K를 정답으로 계산한 뒤,
+ANN 설정(ef_search, HNSW m, 후보 배수 CANDIDATE_MULTIPLIER, 검색 모드)을 바꿔가며
+recall@k, nDCG@k, 후보군 recall, 지연 시간 p50/p95/p99를 표와 JSON으로 출력합니다.
+외부 API 호출 없이 동작합니다 (쿼리 벡터는 스냅샷에서 샘플링).
+
+사용법:
+    # 1) 로컬 Postgres에서 스냅샷 추출
+    PYTHONPATH=. python tests/evaluation/ann_sweep.py snapshot --output tests/reports/embeddings.npz
+
+    # 2-a) Postgres(HNSW)에서 스윕 — 실제 검색 쿼리(VectorService._search_vector) 사용
+    PYTHONPATH=. python tests/evaluation/ann_sweep.py sweep --backend pg \\
+        --snapshot tests/reports/embeddings.npz --ef-search 10,20,40,80,160 --multipliers 1,4,10
+
+    # 2-b) In-process(hnswlib)에서 스윕 — DB 없이 m/ef_construction까지 빠르게 비교
+    PYTHONPATH=. python tests/evaluation/ann_sweep.py sweep --backend local \\
+        --snapshot tests/reports/embeddings.npz --m 8,16,32 --ef-search 10,40,160
+
+pg 백엔드에서 --m 을 주면 인덱스를 재생성하므로 --allow-rebuild 가 필요합니다 (로컬 DB 전용).
+--modes float,binary_rescore,matryoshka_rescore 로 VECTOR_SEARCH_MODE별 결과를 함께 비교할 수 있습니다
+(local 백엔드의 rescore 모드는 1단계 거리 전수 검색 → L2 재채점으로 표현 손실만 측정).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_REPORT = "tests/reports/ann_sweep.json"
+
+
+# --- Metrics ---
+
+def exact_topk(vectors: np.ndarray, queries: np.ndarray, k: int,
+               exclude: Optional[np.ndarray] = None) -> np.ndarray:
+    """L2 거리 기준 정확한 Top-K 인덱스 (쿼리 자신은 exclude로 제외)"""
+    sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+    truth = np.empty((len(queries), k), dtype=np.int64)
+    for start in range(0, len(queries), 256):
+        batch = queries[start:start + 256]
+        # ||x - q||^2 = ||x||^2 - 2 x·q + ||q||^2 (쿼리별 상수항은 순위에 영향 없음)
+        dists = sq_norms[None, :] - 2.0 * batch @ vectors.T
+        if exclude is not None:
+            dists[np.arange(len(batch)), exclude[start:start + 256]] = np.inf
+        part = np.argpartition(dists, k, axis=1)[:, :k]
+        order = np.take_along_axis(dists, part, axis=1).argsort(axis=1)
+        truth[start:start + len(batch)] = np.take_along_axis(part, order, axis=1)
+    return truth
+
+
+def recall_at_k(truth: Sequence[int], retrieved: Sequence[int], k: int) -> float:
+    return len(set(truth[:k]) & set(retrieved[:k])) / k
+
+
+def ndcg_at_k(truth: Sequence[int], retrieved: Sequence[int], k: int) -> float:
+    """정답 순위에 따른 graded relevance (1위 = k, k위 = 1)"""
+    gains = {item: k - rank for rank, item in enumerate(truth[:k])}
+    dcg = sum(gains.get(item, 0) / math.log2(pos + 2) for pos, item in enumerate(retrieved[:k]))
+    idcg = sum((k - rank) / math.log2(rank + 2) for rank in range(k))
+    return dcg / idcg
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return float(np.percentile(values, pct)) if values else float("nan")
+
+
+def evaluate_setting(search: Callable[[int], List[int]], truth: np.ndarray, k: int) -> Dict[str, float]:
+    """search(query_idx) → 후보 인덱스 목록(거리순). 후보 전체와 상위 k개를 각각 평가합니다."""
+    recalls, ndcgs, candidate_recalls, latencies = [], [], [], []
+    for qi in range(len(truth)):
+        started = time.perf_counter()
+        candidates = search(qi)
+        latencies.append((time.perf_counter() - started) * 1000)
+        recalls.append(recall_at_k(truth[qi], candidates, k))
+        ndcgs.append(ndcg_at_k(truth[qi], candidates, k))
+        # 후보군 recall: RRF/재순위화가 볼 수 있는 풀에 정답이 얼마나 들어있는지
+        candidate_recalls.append(len(set(truth[qi]) & set(candidates)) / k)
+    return {
+        "recall": float(np.mean(recalls)),
+        "ndcg": float(np.mean(ndcgs)),
+        "candidate_recall": float(np.mean(candidate_recalls)),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+# --- Snapshot ---
+
+async def export_snapshot(output: str, limit: Optional[int]) -> None:
+    from sqlalchemy import select
+    from app.core.database import AsyncSessionLocal, engine
+    from app.models.embedding import Embedding, active_embedding_column
+
+    # VECTOR_STORAGE의 활성 컬럼 (halfvec이면 HalfVector로 반환됨)
+    column = active_embedding_column()
+    stmt = select(Embedding.id, column.label("vec")).where(column.is_not(None)).order_by(Embedding.id)
+    if limit:
+        stmt = stmt.limit(limit)
+    ids, vectors = [], []
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=5000))
+        async for row in result:
+            ids.append(str(row.id))
+            vec = row.vec.to_numpy() if hasattr(row.vec, "to_numpy") else row.vec
+            vectors.append(np.asarray(vec, dtype=np.float32))
+    await engine.dispose()
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    np.savez(output, ids=np.array(ids), vectors=np.vstack(vectors))
+    print(f"✅ Snapshot saved: {output} ({len(ids)} vectors)")
+
+
+def load_snapshot(path: str):
+    data = np.load(path)
+    return list(data["ids"]), data["vectors"].astype(np.float32)
+
+
+# --- Backends ---
+
+def sweep_rescore_local(mode: str, coarse_distances: Callable[[int], np.ndarray], vectors: np.ndarray,
+                        query_idx: np.ndarray, truth: np.ndarray, args) -> List[Dict]:
+    """rescore 모드의 1단계 표현 손실: 1단계 거리 전수 검색 Top-(limit*rescore) → 전체 차원 L2 재채점"""
+    rows = []
+    for rescore in args.rescore_multipliers:
+        for mult in args.multipliers:
+            limit = args.k * mult + 1
+
+            def search(qi: int) -> List[int]:
+                vi = query_idx[qi]
+                coarse_dists = coarse_distances(vi)
+                coarse = np.argpartition(coarse_dists, min(limit * rescore, len(coarse_dists) - 1))[:limit * rescore]
+                dists = np.linalg.norm(vectors[coarse] - vectors[vi], axis=1)
+                ranked = coarse[np.argsort(dists)]
+                return [int(x) for x in ranked if x != vi][:limit - 1]
+
+            rows.append({"backend": "local", "mode": mode, "m": None, "ef_search": None,
+                         "multiplier": mult, "rescore": rescore, **evaluate_setting(search, truth, args.k)})
+    return rows
+
+
+def binary_distances(vectors: np.ndarray) -> Callable[[int], np.ndarray]:
+    """binary_quantize와 동일한 부호 비트의 해밍 거리"""
+    codes = np.packbits(vectors > 0, axis=1)
+    popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+    return lambda vi: popcount[np.bitwise_xor(codes, codes[vi])].sum(axis=1)
+
+
+def matryoshka_distances(vectors: np.ndarray, dim: int) -> Callable[[int], np.ndarray]:
+    """truncate_embedding과 동일하게 앞 dim 차원을 잘라 재정규화한 벡터의 L2 거리"""
+    short = vectors[:, :dim]
+    short = short / np.maximum(np.linalg.norm(short, axis=1, keepdims=True), 1e-12)
+    return lambda vi: np.linalg.norm(short - short[vi], axis=1)
+
+
+def sweep_local(vectors: np.ndarray, query_idx: np.ndarray, truth: np.ndarray, args) -> List[Dict]:
+    rows = []
+    if "binary_rescore" in args.modes:
+        rows.extend(sweep_rescore_local("binary_rescore", binary_distances(vectors), vectors, query_idx, truth, args))
+    if "matryoshka_rescore" in args.modes:
+        rows.extend(sweep_rescore_local("matryoshka_rescore", matryoshka_distances(vectors, args.matryoshka_dim),
+                                        vectors, query_idx, truth, args))
+    if "float" not in args.modes:
+        return rows
+    try:
+        import hnswlib
+    except ImportError:
+        raise SystemExit("hnswlib가 필요합니다: pip install hnswlib (requirements-dev.txt)")
+
+    queries = vectors[query_idx]
+    for m in args.m or [16]:
+        index = hnswlib.Index(space="l2", dim=vectors.shape[1])
+        index.init_index(max_elements=len(vectors), M=m, ef_construction=args.ef_construction, random_seed=42)
+        started = time.perf_counter()
+        index.add_items(vectors, np.arange(len(vectors)), num_threads=-1)
+        build_seconds = time.perf_counter() - started
+
+        for ef in args.ef_search:
+            for mult in args.multipliers:
+                limit = args.k * mult + 1  # +1: 쿼리 자신 제외용
+                index.set_ef(max(ef, limit))  # hnswlib는 ef < k를 허용하지 않음
+
+                def search(qi: int) -> List[int]:
+                    labels, _ = index.knn_query(queries[qi], k=limit)
+                    return [int(x) for x in labels[0] if x != query_idx[qi]][:limit - 1]
+
+                rows.append({"backend": "local", "mode": "float", "m": m, "ef_construction": args.ef_construction,
+                             "ef_search": ef, "multiplier": mult, "build_seconds": round(build_seconds, 2),
+                             **evaluate_setting(search, truth, args.k)})
+    return rows
+
+
+async def sweep_pg(ids: List[str], vectors: np.ndarray, query_idx: np.ndarray,
+                   truth: np.ndarray, args) -> List[Dict]:
+    import uuid
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal, engine
+    from app.services.index_service import IndexService
+    from app.services.vector_service import VectorService
+
+    position = {uuid.UUID(chunk_id): i for i, chunk_id in enumerate(ids)}
+    rows = []
+    for m in args.m or [None]:
+        if m is not None:
+            if not args.allow_rebuild:
+                raise SystemExit("--m 스윕은 인덱스를 재생성합니다. 로컬 DB라면 --allow-rebuild 를 추가하세요.")
+            print(f"🏗️ Rebuilding HNSW index with m={m} ...")
+            targets = ["hnsw"]
+            targets += ["bq"] if "binary_rescore" in args.modes else []
+            targets += ["short"] if "matryoshka_rescore" in args.modes else []
+            for target in targets:
+                await IndexService().rebuild_hnsw(m, args.ef_construction, prewarm=True, target=target)
+
+        grid = [(mode, ef, mult, rescore)
+                for mode in args.modes for ef in args.ef_search for mult in args.multipliers
+                for rescore in (args.rescore_multipliers if mode != "float" else [None])]
+        for mode, ef, mult, rescore in grid:
+            # VectorService가 검색 시점에 settings를 읽으므로 이 프로세스 안에서만 모드를 바꿔 측정
+            settings.VECTOR_SEARCH_MODE = mode
+            if rescore:
+                settings.BQ_RESCORE_MULTIPLIER = settings.MATRYOSHKA_RESCORE_MULTIPLIER = rescore
+            limit = args.k * mult + 1
+            results: Dict[int, List[int]] = {}
+            latencies: List[float] = []
+            async with AsyncSessionLocal() as db:
+                service = VectorService(db)
+                for qi, vi in enumerate(query_idx):
+                    started = time.perf_counter()
+                    hits = await service._search_vector(vectors[vi].tolist(), limit, None, ef)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    # 트랜잭션 한정 set_config이 다음 쿼리에 남지 않도록 매번 종료
+                    await db.rollback()
+                    results[qi] = [position[h] for h, _ in hits if h in position and position[h] != vi][:limit - 1]
+
+            # 비동기 검색은 미리 수집하고, 지연 시간은 실제 측정값으로 교체
+            metrics = evaluate_setting(lambda qi: results[qi], truth, args.k)
+            metrics.update(p50_ms=percentile(latencies, 50), p95_ms=percentile(latencies, 95),
+                           p99_ms=percentile(latencies, 99))
+            rows.append({"backend": "pg", "mode": mode, "m": m, "ef_construction": args.ef_construction,
+                         "ef_search": ef, "multiplier": mult, "rescore": rescore, **metrics})
+    await engine.dispose()
+    return rows
+
+
+# --- Report ---
+
+COLUMNS = ["backend", "mode", "m", "ef_search", "multiplier", "rescore", "recall", "ndcg", "candidate_recall",
+           "p50_ms", "p95_ms", "p99_ms"]
+
+
+def format_table(rows: List[Dict], columns: Optional[List[str]] = None) -> str:
+    columns = columns or COLUMNS
+
+    def cell(value) -> str:
+        if isinstance(value, float):
+            return f"{value:.3f}" if value < 10 else f"{value:.1f}"
+        return "-" if value is None else str(value)
+
+    table = [columns] + [[cell(row.get(col)) for col in columns] for row in rows]
+    widths = [max(len(r[i]) for r in table) for i in range(len(columns))]
+    lines = ["  ".join(v.rjust(w) for v, w in zip(r, widths)) for r in table]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ANN recall/latency sweep")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    snap = sub.add_parser("snapshot", help="export embeddings to .npz")
+    snap.add_argument("--output", default="tests/reports/embeddings.npz")
+    snap.add_argument("--limit", type=int, default=None)
+
+    sweep = sub.add_parser("sweep", help="run the parameter sweep")
+    sweep.add_argument("--backend", choices=["pg", "local"], default="local")
+    sweep.add_argument("--snapshot", required=True)
+    sweep.add_argument("--queries", type=int, default=200, help="number of sampled query vectors")
+    sweep.add_argument("--k", type=int, default=10)
+    sweep.add_argument("--ef-search", type=int_list, default=[10, 20, 40, 80, 160])
+    sweep.add_argument("--multipliers", type=int_list, default=[1, 4, 10])
+    sweep.add_argument("--m", type=int_list, default=None)
+    sweep.add_argument("--modes", type=lambda v: v.split(","), default=["float"],
+                       help="float,binary_rescore,matryoshka_rescore")
+    sweep.add_argument("--matryoshka-dim", type=int, default=256, help="local backend only")
+    sweep.add_argument("--rescore-multipliers", type=int_list, default=[4])
+    sweep.add_argument("--ef-construction", type=int, default=64)
+    sweep.add_argument("--allow-rebuild", action="store_true")
+    sweep.add_argument("--seed", type=int, default=42)
+    sweep.add_argument("--output", default=DEFAULT_REPORT)
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        asyncio.run(export_snapshot(args.output, args.limit))
+        return
+
+    ids, vectors = load_snapshot(args.snapshot)
+    rng = np.random.default_rng(args.seed)
+    query_idx = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    print(f"📐 Computing exact ground truth: {len(query_idx)} queries × {len(vectors)} vectors")
+    truth = exact_topk(vectors, vectors[query_idx], args.k, exclude=query_idx)
+
+    if args.backend == "local":
+        rows = sweep_local(vectors, query_idx, truth, args)
+    else:
+        rows = asyncio.run(sweep_pg(ids, vectors, query_idx, truth, args))
+
+    print("\n================ ANN SWEEP REPORT ================")
+    print(f"k={args.k}, queries={len(query_idx)}, vectors={len(vectors)}")
+    print(format_table(rows))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"k": args.k, "queries": len(query_idx), "vectors": len(vectors), "results": rows}, f, indent=2)
+    print(f"\n✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+embeddings 파티셔닝 벤치마크: 일반 테이블 vs hash(document_id) 파티션
+
+합성 데이터(무작위 벡터)를 스크래치 테이블에 적재해 레이아웃별로 다음을 측정합니다.
+- 적재 / HNSW 인덱스 빌드 / VACUUM ANALYZE 시간, 테이블+인덱스 크기
+- 검색 지연 시간 p50/p95
+  - unfiltered: 단일 쿼리(파티션이면 Merge Append) / 파티션별 병렬 쿼리(fan-out, PARTITION_PARALLEL_SEARCH와 동일 방식)
+  - document filter: document_id IN (...) → 스캔된 파티션 수(EXPLAIN)로 pruning 확인
+- 문서 1건 삭제 시간 (cascade 삭제와 같은 document_id 조건)
+
+운영 테이블은 건드리지 않습니다 (bench_embeddings_* 테이블 생성 후 --keep이 없으면 삭제).
+10M+ 행은 768차원 기준 수십 GB이므로 --dim을 줄여 경향을 먼저 확인하는 것을 권장합니다.
+
+사용법:
+    PYTHONPATH=. python tests/evaluation/partition_benchmark.py --rows 10000000 --dim 128 --partitions 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from tests.evaluation.ann_sweep import format_table, percentile
+
+DEFAULT_REPORT = "tests/reports/partition_benchmark.json"
+LOAD_BATCH = 200_000
+LAYOUTS = ("plain", "hash")
+COLUMNS = [
+    "layout", "partitions", "load_s", "index_build_s", "vacuum_s", "total_gb",
+    "unfiltered_p50_ms", "unfiltered_p95_ms", "fanout_p50_ms", "fanout_p95_ms",
+    "doc_filter_p50_ms", "doc_filter_partitions", "delete_doc_p50_ms",
+]
+
+
+def _table(layout: str) -> str:
+    return f"bench_embeddings_{layout}"
+
+
+def _doc_id_sql(column: str, documents: int) -> str:
+    # 결정적인 문서 id: 0000…-{n % documents:012x}
+    return f"('00000000-0000-0000-0000-' || lpad(to_hex({column} % {documents}), 12, '0'))::uuid"
+
+
+def _doc_id(n: int) -> str:
+    return f"00000000-0000-0000-0000-{n:012x}"
+
+
+async def _autocommit():
+    conn = await engine.connect()
+    return await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+
+async def _timed(conn, sql: str, params: Dict = None) -> float:
+    started = time.perf_counter()
+    await conn.execute(text(sql), params or {})
+    return time.perf_counter() - started
+
+
+async def build(layout: str, args) -> Dict:
+    table = _table(layout)
+    conn = await _autocommit()
+    try:
+        await conn.execute(text("SET statement_timeout = 0"))
+        await conn.execute(text("SELECT set_config('maintenance_work_mem', '2GB', false)"))
+        await conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        partition_by = " PARTITION BY HASH (document_id)" if layout == "hash" else ""
+        await conn.execute(text(
+            f"CREATE TABLE {table} (id uuid NOT NULL DEFAULT gen_random_uuid(), document_id uuid NOT NULL, "
+            f"embedding vector({args.dim}), PRIMARY KEY (id, document_id)){partition_by}"
+        ))
+        if layout == "hash":
+            for remainder in range(args.partitions):
+                await conn.execute(text(
+                    f"CREATE TABLE {table}_p{remainder} PARTITION OF {table} "
+                    f"FOR VALUES WITH (MODULUS {args.partitions}, REMAINDER {remainder})"
+                ))
+
+        load_seconds = 0.0
+        for start in range(0, args.rows, LOAD_BATCH):
+            end = min(start + LOAD_BATCH, args.rows)
+            # 상관 서브쿼리(s.n 참조)로 행마다 다른 무작위 벡터 생성
+            load_seconds += await _timed(conn, (
+                f"INSERT INTO {table} (document_id, embedding) "
+                f"SELECT {_doc_id_sql('s.n', args.documents)}, "
+                f"(SELECT array_agg(random()::real) FROM generate_series(1, {args.dim}) WHERE s.n IS NOT NULL)::vector "
+                f"FROM generate_series({start}, {end - 1}) AS s(n)"
+            ))
+            print(f"  {layout}: loaded {end:,}/{args.rows:,} rows")
+
+        index_seconds = await _timed(conn, (
+            f"CREATE INDEX ON {table} USING hnsw (embedding vector_l2_ops) "
+            f"WITH (m = {args.m}, ef_construction = {args.ef_construction})"
+        ))
+        await conn.execute(text(f"CREATE INDEX ON {table} (document_id)"))
+        vacuum_seconds = await _timed(conn, f"VACUUM ANALYZE {table}")
+        total_bytes = (await conn.execute(text(
+            "SELECT COALESCE(sum(pg_total_relation_size(c.oid)), 0) FROM pg_class c "
+            "WHERE c.relname = :t OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:t))"
+        ), {"t": table})).scalar()
+    finally:
+        await conn.close()
+    return {"load_s": round(load_seconds, 1), "index_build_s": round(index_seconds, 1),
+            "vacuum_s": round(vacuum_seconds, 1), "total_gb": round(total_bytes / 2**30, 2)}
+
+
+async def _query(sql: str, params: Dict, ef_search: int) -> List:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT set_config('hnsw.ef_search', :ef, true)"), {"ef": str(ef_search)})
+        return (await conn.execute(text(sql), params)).all()
+
+
+async def search(layout: str, args, queries: List[str]) -> Dict:
+    table = _table(layout)
+    knn = "SELECT id, embedding <-> CAST(:q AS vector) AS distance FROM {table} {where} ORDER BY 2 LIMIT :k"
+    rng = random.Random(0)
+    result: Dict = {}
+
+    async def measure(run) -> List[float]:
+        latencies = []
+        for vec in queries:
+            started = time.perf_counter()
+            await run(vec)
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    single = await measure(lambda vec: _query(knn.format(table=table, where=""), {"q": vec, "k": args.k}, args.ef_search))
+    result["unfiltered_p50_ms"], result["unfiltered_p95_ms"] = percentile(single, 50), percentile(single, 95)
+
+    if layout == "hash":
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one_partition(vec: str, remainder: int) -> List:
+            async with semaphore:
+                return await _query(knn.format(table=f"{table}_p{remainder}", where=""),
+                                    {"q": vec, "k": args.k}, args.ef_search)
+
+        async def fan_out(vec: str) -> List:
+            parts = await asyncio.gather(*(one_partition(vec, r) for r in range(args.partitions)))
+            return sorted((row for part in parts for row in part), key=lambda row: row.distance)[:args.k]
+
+        fanned = await measure(fan_out)
+        result["fanout_p50_ms"], result["fanout_p95_ms"] = percentile(fanned, 50), percentile(fanned, 95)
+
+    doc_ids = [_doc_id(rng.randrange(args.documents)) for _ in range(args.filter_documents)]
+    where = "WHERE document_id IN (" + ", ".join(f"'{d}'::uuid" for d in doc_ids) + ")"
+    filtered = await measure(lambda vec: _query(knn.format(table=table, where=where), {"q": vec, "k": args.k},
+                                                args.ef_search))
+    result["doc_filter_p50_ms"], result["doc_filter_p95_ms"] = percentile(filtered, 50), percentile(filtered, 95)
+    async with engine.connect() as conn:
+        plan = (await conn.execute(text(
+            "EXPLAIN (FORMAT JSON) " + knn.format(table=table, where=where)
+        ), {"q": queries[0], "k": args.k})).scalar()
+    plan_text = json.dumps(plan)
+    result["doc_filter_partitions"] = plan_text.count(f'"{table}_p') if layout == "hash" else 1
+
+    conn = await _autocommit()
+    try:
+        deletes = []
+        for _ in range(args.deletes):
+            deletes.append(await _timed(conn, f"DELETE FROM {table} WHERE document_id = :d",
+                                        {"d": _doc_id(rng.randrange(args.documents))}) * 1000)
+    finally:
+        await conn.close()
+    result["delete_doc_p50_ms"] = percentile(deletes, 50)
+    return result
+
+
+async def run(args) -> List[Dict]:
+    rng = random.Random(42)
+    queries = ["[" + ",".join(f"{rng.random():.6f}" for _ in range(args.dim)) + "]" for _ in range(args.queries)]
+    rows = []
+    for layout in LAYOUTS:
+        print(f"🏗️ {layout}: {args.rows:,} rows x {args.dim} dims")
+        row = {"layout": layout, "partitions": args.partitions if layout == "hash" else 1}
+        if not args.skip_load:
+            row.update(await build(layout, args))
+        row.update(await search(layout, args, queries))
+        rows.append(row)
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {_table(layout)}"))
+    await engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="embeddings partitioning benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--documents", type=int, default=20_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=64)
+    parser.add_argument("--ef-search", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4, help="fan-out connections (PARTITION_SEARCH_CONCURRENCY)")
+    parser.add_argument("--filter-documents", type=int, default=5)
+    parser.add_argument("--deletes", type=int, default=20)
+    parser.add_argument("--skip-load", action="store_true", help="reuse tables kept by a previous --keep run")
+    parser.add_argument("--keep", action="store_true")
+    parser.add_argument("--output", default=DEFAULT_REPORT)
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args))
+    print("\n================ PARTITION BENCHMARK ================")
+    print(format_table(rows, COLUMNS))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"args": vars(args), "results": rows}, f, indent=2)
+    print(f"\n✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
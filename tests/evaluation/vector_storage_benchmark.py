@@ -0,0 +1,142 @@
+"""
+벡터 저장 방식 벤치마크: vector(float32) vs halfvec(float16)
+
+로컬 Postgres의 embeddings 테이블에서 저장 방식별로 다음을 측정합니다.
+- 컬럼 데이터 크기 (sum(pg_column_size))
+- HNSW 인덱스 빌드 시간 / 크기 (임시 인덱스를 CONCURRENTLY로 만든 뒤 삭제)
+- 검색 지연 시간 p50/p95/p99 및 recall@k (VectorService._search_vector, 운영 인덱스 사용)
+  recall 정답은 float32 컬럼의 정확한(인덱스 미사용) Top-K입니다.
+
+사전 조건: halfvec 마이그레이션(8e2b6f1c9d37)으로 embedding_half가 백필되어 있어야 하며,
+두 컬럼이 모두 채워진 행만 대상으로 합니다.
+
+사용법:
+    PYTHONPATH=. python tests/evaluation/vector_storage_benchmark.py --queries 50 --k 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.services.vector_service import VectorService
+from tests.evaluation.ann_sweep import format_table, percentile, recall_at_k
+
+DEFAULT_REPORT = "tests/reports/vector_storage_benchmark.json"
+STORAGES = {
+    # storage -> (컬럼, operator class)
+    "vector": ("embedding", "vector_l2_ops"),
+    "halfvec": ("embedding_half", "halfvec_l2_ops"),
+}
+
+
+async def measure_build(storage: str, m: int, ef_construction: int) -> Dict:
+    column, opclass = STORAGES[storage]
+    name = f"ix_bench_{column}_hnsw"
+    conn = await engine.connect()
+    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        await conn.execute(text("SELECT set_config('maintenance_work_mem', :mem, false)"),
+                           {"mem": settings.HNSW_BUILD_MAINTENANCE_WORK_MEM})
+        await conn.execute(text("SET statement_timeout = 0"))
+        started = time.perf_counter()
+        await conn.execute(text(
+            f"CREATE INDEX CONCURRENTLY {name} ON embeddings USING hnsw ({column} {opclass}) "
+            f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+        ))
+        build_seconds = time.perf_counter() - started
+        index_bytes = (await conn.execute(text(f"SELECT pg_relation_size('{name}')"))).scalar()
+        column_bytes = (await conn.execute(text(f"SELECT sum(pg_column_size({column})) FROM embeddings"))).scalar()
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    finally:
+        await conn.close()
+    return {"build_seconds": round(build_seconds, 2), "index_mb": round(index_bytes / 2**20, 1),
+            "column_mb": round((column_bytes or 0) / 2**20, 1)}
+
+
+async def sample_queries(n: int) -> List[List[float]]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text(
+            "SELECT embedding FROM embeddings "
+            "WHERE embedding IS NOT NULL AND embedding_half IS NOT NULL "
+            "ORDER BY random() LIMIT :n"
+        ), {"n": n})
+        # text()로 조회하면 pgvector 타입 변환이 적용되지 않아 '[..]' 문자열로 반환됨
+        return [json.loads(row[0]) if isinstance(row[0], str) else list(row[0]) for row in result]
+
+
+async def exact_ground_truth(queries: List[List[float]], k: int) -> List[List]:
+    truth = []
+    async with AsyncSessionLocal() as db:
+        for vec in queries:
+            await db.execute(text("SET LOCAL enable_indexscan = off"))
+            result = await db.execute(text(
+                "SELECT id FROM embeddings WHERE embedding IS NOT NULL AND embedding_half IS NOT NULL "
+                "ORDER BY embedding <-> CAST(:q AS vector) LIMIT :k"
+            ), {"q": str(vec), "k": k})
+            truth.append([row[0] for row in result])
+            await db.rollback()
+    return truth
+
+
+async def measure_search(storage: str, queries: List[List[float]], truth: List[List], k: int) -> Dict:
+    # VectorService는 검색 시점에 settings를 읽으므로 이 프로세스 안에서만 저장 방식을 바꿔 측정
+    settings.VECTOR_STORAGE = storage
+    latencies, recalls = [], []
+    async with AsyncSessionLocal() as db:
+        service = VectorService(db)
+        for vec, expected in zip(queries, truth):
+            started = time.perf_counter()
+            hits = await service._search_vector(vec, k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            await db.rollback()
+            recalls.append(recall_at_k(expected, [chunk_id for chunk_id, _ in hits], k))
+    return {"recall": sum(recalls) / len(recalls), "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95), "p99_ms": percentile(latencies, 99)}
+
+
+async def run(args) -> List[Dict]:
+    queries = await sample_queries(args.queries)
+    if not queries:
+        raise SystemExit("embedding과 embedding_half가 모두 채워진 행이 없습니다. 마이그레이션을 먼저 실행하세요.")
+    print(f"📐 Computing exact ground truth for {len(queries)} queries (sequential scan)")
+    truth = await exact_ground_truth(queries, args.k)
+
+    rows = []
+    for storage in STORAGES:
+        print(f"🏗️ Building scratch HNSW index for {storage} ...")
+        row = {"storage": storage, **await measure_build(storage, args.m, args.ef_construction)}
+        row.update(await measure_search(storage, queries, truth, args.k))
+        rows.append(row)
+    await engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="vector vs halfvec storage benchmark")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=settings.HNSW_M)
+    parser.add_argument("--ef-construction", type=int, default=settings.HNSW_EF_CONSTRUCTION)
+    parser.add_argument("--output", default=DEFAULT_REPORT)
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args))
+    columns = ["storage", "column_mb", "index_mb", "build_seconds", "recall", "p50_ms", "p95_ms", "p99_ms"]
+    print("\n================ VECTOR STORAGE BENCHMARK ================")
+    print(format_table(rows, columns))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"k": args.k, "queries": args.queries, "results": rows}, f, indent=2)
+    print(f"\n✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionRejected
+
+
+def test_queue_full_rejects_with_429_and_round_robin_between_users():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=3, queue_timeout=5)
+        await controller.acquire("user:a")  # 실행 중
+
+        order = []
+
+        async def waiter(user_key):
+            await controller.acquire(user_key)
+            order.append(user_key)
+
+        # user a가 대기열에 2건을 먼저 넣어도 user b가 중간에 슬롯을 받아야 함
+        tasks = [asyncio.create_task(waiter(k)) for k in ("user:a", "user:a", "user:b")]
+        await asyncio.sleep(0)
+        assert controller.queued == 3
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire("user:c")
+        assert exc_info.value.status_code == 429
+
+        for _ in range(3):
+            controller.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order, controller
+
+    order, controller = asyncio.run(scenario())
+    assert order == ["user:a", "user:b", "user:a"]
+    assert controller.active == 1
+    assert controller.rejected_total["queue_full"] == 1
+
+
+def test_queue_timeout_rejects_with_503():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=3, queue_timeout=0.01)
+        await controller.acquire("user:a")
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire("user:b")
+        return exc_info.value, controller
+
+    exc, controller = asyncio.run(scenario())
+    assert exc.status_code == 503
+    assert exc.retry_after >= 1
+    assert controller.queued == 0
+
+
+def _request(host, headers=None):
+    from starlette.requests import Request
+
+    return Request({
+        "type": "http", "client": (host, 50000),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    })
+
+
+def test_admission_key_trusts_the_webui_header_only_from_configured_proxies(monkeypatch):
+    pytest.importorskip("fastapi")
+    from app.api import deps
+
+    monkeypatch.setattr(deps.settings, "CHAT_TRUSTED_PROXIES", "10.0.0.5, 10.0.0.6")
+    spoofed = {"x-openwebui-user-id": "alice"}
+    # 신뢰하지 않는 클라이언트는 헤더를 바꿔도 자기 IP 대기열
+    assert deps.admission_key(_request("203.0.113.9", spoofed), None) == "ip:203.0.113.9"
+    assert deps.admission_key(_request("10.0.0.6", spoofed), None) == "webui:alice"
+    assert deps.admission_key(_request("10.0.0.6"), None) == "ip:10.0.0.6"
+
+    monkeypatch.setattr(deps, "decode_token_subject", lambda token: "7" if token == "valid" else None)
+    assert deps.admission_key(_request("10.0.0.6", spoofed), "valid") == "user:7"
+
+
+def test_metrics_endpoint_is_gated_by_settings(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from app.main import app, settings
+
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape"})
+    assert response.status_code == 200 and "rag_chat_queue_depth" in response.text
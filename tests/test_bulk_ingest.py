@@ -0,0 +1,38 @@
+import os
+
+from app.bulk_ingest import Checkpoint, Progress, discover_files
+
+
+def test_discover_files_skips_hidden_and_unsupported(tmp_path):
+    for rel in ["a.pdf", "sub/b.HWP", "sub/c.png", ".uploads/x.pdf", "sub/.hidden.txt", "z/d.md"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x")
+
+    found = [os.path.relpath(p, tmp_path) for p in discover_files(str(tmp_path))]
+    assert found == ["a.pdf", os.path.join("sub", "b.HWP"), os.path.join("z", "d.md")]
+
+
+def test_checkpoint_resumes_done_files_and_retries_failed(tmp_path):
+    path = str(tmp_path / "ckpt.jsonl")
+    checkpoint = Checkpoint(path)
+    checkpoint.record("a.pdf", "h1", "done")
+    checkpoint.record("b.pdf", "h2", "failed", error="quota")
+    checkpoint.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"path": "c.pdf", "sha')  # 기록 도중 중단
+
+    resumed = Checkpoint(path)
+    assert resumed.done_hash("a.pdf") == "h1"
+    assert resumed.done_hash("b.pdf") is None
+    assert resumed.done_hash("c.pdf") is None
+    resumed.record("c.pdf", "h3", "done")
+    resumed.close()
+    assert Checkpoint(path).done_hash("c.pdf") == "h3"
+
+    progress = Progress(total_files=3, total_bytes=300)
+    progress.update("skipped", 100)
+    progress.update("done", 100)
+    snapshot = progress.snapshot()
+    assert (snapshot["files"], snapshot["done"], snapshot["skipped"]) == (2, 1, 1)
+    assert snapshot["eta_seconds"] is not None
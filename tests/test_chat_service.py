@@ -0,0 +1,179 @@
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import chat_service
+from app.services.chat_service import RETRIEVAL_ONLY_ANSWER, SEARCH_TIMEOUT_ANSWER, ChatService
+from app.services import vector_service
+from app.services.rerank_service import RerankResult
+from app.services.vector_service import VectorService
+
+DEADLINE = 1.0
+
+
+def _hit(i):
+    document = SimpleNamespace(id=uuid.uuid4(), filename=f"doc{i}.pdf")
+    embedding = SimpleNamespace(content=f"chunk {i} content", metadata_info={"page_number": i + 1})
+    return SimpleNamespace(chunk_id=uuid.uuid4(), document=document, embedding=embedding)
+
+
+class FakeVectorService:
+    def __init__(self, delay=0.0, missing_legs=()):
+        self.delay = delay
+        self.missing_shards = []
+        self.missing_legs = []
+        self.late_legs = list(missing_legs)
+        self.calls = []
+
+    async def search_hybrid_bounded(self, query, top_k, timeout, use_keyword, filters=None, ef_search=None):
+        self.calls.append({"query": query, "use_keyword": use_keyword})
+        if timeout is not None and self.delay > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(self.delay)
+        self.missing_legs = self.late_legs
+        return [_hit(i) for i in range(3)]
+
+
+class SlowReranker:
+    async def rerank(self, query, documents):
+        await asyncio.sleep(10)
+        return [RerankResult(d["document_id"], d["content"], 1.0, d["filename"], d["chunk_id"]) for d in documents]
+
+
+@pytest.fixture(autouse=True)
+def budget_settings(monkeypatch):
+    for name, value in {
+        "CHAT_BUDGET_EXPANSION_MIN_SECONDS": 0.5,
+        "CHAT_BUDGET_KEYWORD_MIN_SECONDS": 0.5,
+        "CHAT_BUDGET_RERANK_MIN_SECONDS": 0.4,
+        "CHAT_BUDGET_FULL_K_MIN_SECONDS": 0.3,
+        "CHAT_BUDGET_GENERATION_MIN_SECONDS": 0.1,
+    }.items():
+        monkeypatch.setattr(chat_service.settings, name, value)
+
+
+def _service(vector_service, expand_delay=0.0, generate_delay=0.0):
+    service = ChatService.__new__(ChatService)
+    service.vector_service = vector_service
+    service.reranker = chat_service.KeywordReranker(boost_weight=0.3)
+    service.metadata = {}
+
+    async def expand(query):
+        await asyncio.sleep(expand_delay)
+        return query + " expanded"
+
+    async def generate(query, context):
+        await asyncio.sleep(generate_delay)
+        return "answer"
+
+    service._expand_query = expand
+    service._generate_llm_response = generate
+    return service
+
+
+def _run(service):
+    started = time.monotonic()
+    answer, sources = asyncio.run(service.get_answer("ENS 신고 기한", k=2, deadline_seconds=DEADLINE))
+    return answer, sources, time.monotonic() - started
+
+
+def test_slow_expansion_and_generation_return_retrieval_only_answer():
+    vectors = FakeVectorService()
+    service = _service(vectors, expand_delay=10, generate_delay=10)
+    answer, sources, elapsed = _run(service)
+
+    assert answer == RETRIEVAL_ONLY_ANSWER
+    assert [s["filename"] for s in sources] == ["doc0.pdf", "doc1.pdf"]
+    assert service.metadata["degradations"][0] == "skip_query_expansion"
+    assert service.metadata["degradations"][-1] == "retrieval_only"
+    assert vectors.calls[0]["query"] == "ENS 신고 기한"  # 확장 없이 원본 질의로 검색
+    assert elapsed < DEADLINE + 0.3
+
+
+def test_slow_search_returns_empty_result_within_deadline():
+    service = _service(FakeVectorService(delay=10))
+    answer, sources, elapsed = _run(service)
+
+    assert (answer, sources) == (SEARCH_TIMEOUT_ANSWER, [])
+    assert service.metadata["degradations"] == ["search_timeout"]
+    assert elapsed < DEADLINE + 0.3
+
+
+def test_late_keyword_leg_answers_from_the_vector_leg():
+    service = _service(FakeVectorService(missing_legs=["keyword"]))
+    answer, sources, elapsed = _run(service)
+
+    assert answer == "answer" and len(sources) == 2
+    assert service.metadata["degradations"] == ["skip_keyword_search"]
+
+
+def test_bounded_search_fuses_finished_legs_on_their_own_sessions(monkeypatch, recording_session):
+    sessions, cancelled = [], []
+
+    @asynccontextmanager
+    async def session_scope(role):
+        session = recording_session()
+        sessions.append((role, session))
+        yield session
+
+    async def embed(text):
+        return [0.0]
+
+    async def vector_legs(self, queries, query_vectors, limit, use_keyword, filters, ef_search):
+        return [[(chunk_id, 0.1 * i) for i, chunk_id in enumerate(chunk_ids)]], [[]]
+
+    async def slow_keyword(self, query, limit, filters=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(self.db)
+            raise
+
+    async def load(self, ids):
+        return {chunk_id: ("embedding", "document") for chunk_id in ids}
+
+    chunk_ids = [uuid.uuid4() for _ in range(3)]
+    monkeypatch.setattr(vector_service, "session_scope", session_scope)
+    monkeypatch.setattr(VectorService, "create_embedding", staticmethod(embed))
+    monkeypatch.setattr(VectorService, "_search_legs", vector_legs)
+    monkeypatch.setattr(VectorService, "_search_keyword", slow_keyword)
+    monkeypatch.setattr(VectorService, "_load_chunks", load)
+
+    request_db = recording_session()
+    service = VectorService(request_db)
+    hits = asyncio.run(service.search_hybrid_bounded("ENS", top_k=2, timeout=0.2))
+
+    assert [hit.chunk_id for hit in hits] == chunk_ids[:2]
+    assert all(hit.keyword_rank is None for hit in hits)
+    assert service.missing_legs == ["keyword"]
+    # 취소된 키워드 쿼리는 레그 전용 세션에서 실행됨 (요청 세션은 사용하지 않음)
+    assert cancelled and cancelled[0] is not request_db
+    assert [role for role, _ in sessions] == ["read", "read", "read"]
+    assert request_db.statements == []
+
+
+def test_bounded_search_times_out_when_no_leg_finishes(monkeypatch):
+    async def slow_embed(text):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(VectorService, "create_embedding", staticmethod(slow_embed))
+    service = VectorService(None, index=object())
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(service.search_hybrid_bounded("ENS", top_k=2, timeout=0.05, use_keyword=False))
+    assert service.missing_legs == ["vector"]
+
+
+def test_slow_rerank_falls_back_to_rrf_order():
+    service = _service(FakeVectorService())
+    service.reranker = SlowReranker()
+    answer, sources, elapsed = _run(service)
+
+    assert answer == "answer"
+    assert [(s["filename"], s["page_number"]) for s in sources] == [("doc0.pdf", 1)]
+    assert service.metadata["degradations"] == ["skip_rerank", "shrink_k"]
+    assert elapsed < DEADLINE + 0.3
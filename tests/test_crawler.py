@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from app.services.crawler import Crawler
+
+PAGES = {f"/page{i}": f"<html><body>page {i}</body></html>".encode() for i in range(6)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    log = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+            cls.log.append((self.path, self.headers.get("If-None-Match")))
+        try:
+            time.sleep(0.05)
+            if self.path == "/sitemap.xml":
+                port = self.server.server_address[1]
+                locs = "".join(f"<url><loc>http://127.0.0.1:{port}{path}</loc></url>" for path in PAGES)
+                self._send(200, f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'.encode())
+                return
+            body = PAGES.get(self.path)
+            if body is None:
+                self._send(404, b"")
+                return
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", etag)
+            else:
+                self._send(200, body, etag)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    _Handler.log, _Handler.max_active = [], 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+async def _crawl(base, validators=None):
+    async with Crawler(concurrency=8, per_host=2, delay=0) as crawler:
+        urls = await crawler.sitemap_urls(f"{base}/sitemap.xml")
+        return urls, [result async for result in crawler.crawl(urls + [f"{base}/missing"], validators)]
+
+
+def test_crawl_sitemap_with_per_host_limit(server):
+    urls, results = asyncio.run(_crawl(server))
+
+    assert urls == [f"{server}{path}" for path in PAGES]
+    by_url = {result.url: result for result in results}
+    assert all(by_url[url].ok and by_url[url].body == PAGES[url[len(server):]] for url in urls)
+    assert by_url[f"{server}/missing"].status == 404
+    assert _Handler.max_active <= 2
+
+
+def test_recrawl_sends_conditional_requests(server):
+    _, first = asyncio.run(_crawl(server))
+    validators = {result.url: (result.etag, result.last_modified) for result in first if result.ok}
+
+    _Handler.log = []
+    _, second = asyncio.run(_crawl(server, validators))
+    pages = [result for result in second if result.url in validators]
+    assert pages and all(result.not_modified and result.body == b"" for result in pages)
+    # 304에도 검증자 유지 → 다음 크롤링에서도 조건부 요청
+    assert all(result.etag == validators[result.url][0] for result in pages)
+    assert all(etag is not None for path, etag in _Handler.log if path in PAGES)
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from app.core import db_routing
+from app.core.db_routing import ReplicaRouter
+
+
+class FakeRouter(ReplicaRouter):
+    """lag_seconds를 DB 대신 고정 값으로 응답 (None = 연결 실패)"""
+
+    def __init__(self, lags, **kwargs):
+        super().__init__("primary", [f"replica{i}" for i in range(len(lags))], **kwargs)
+        self.fake_lags = dict(zip(self.replicas, lags))
+        self.probes = 0
+
+    async def lag_seconds(self, replica):
+        self.probes += 1
+        return self.fake_lags[replica]
+
+
+def test_routes_round_robin_to_replicas_within_lag_and_falls_back_to_primary():
+    router = FakeRouter([0.5, 30.0, None, 0.0], max_lag_seconds=5.0, check_interval=60.0)
+
+    picks = asyncio.run(_pick(router, 4))
+    assert picks == ["replica0", "replica3", "replica0", "replica3"]
+    assert router.probes == 4  # check_interval 내에서는 다시 측정하지 않음
+    assert [r["healthy"] for r in router.status()] == [True, False, False, True]
+
+    router.fake_lags.update({"replica0": 12.0, "replica3": None})
+    asyncio.run(router.refresh())
+    assert asyncio.run(router.pick()) == "primary"
+    assert router.routed_total == {"replica": 4, "primary_fallback": 1}
+
+
+def test_without_replicas_reads_go_to_primary():
+    router = FakeRouter([], max_lag_seconds=5.0, check_interval=0.0)
+    assert asyncio.run(router.pick()) == "primary"
+    assert router.probes == 0
+
+
+def test_probe_times_out_while_connecting(monkeypatch):
+    monkeypatch.setattr(db_routing, "PROBE_TIMEOUT_SECONDS", 0.05)
+
+    class UnreachableReplica:
+        @asynccontextmanager
+        async def connect(self):
+            await asyncio.sleep(10)  # 연결/풀 대기가 끝나지 않음
+            yield None
+
+    router = ReplicaRouter("primary", [UnreachableReplica()], max_lag_seconds=5.0, check_interval=60.0)
+    started = time.monotonic()
+    assert asyncio.run(router.lag_seconds(router.replicas[0])) is None
+    assert time.monotonic() - started < 1.0
+
+
+def test_stale_decision_is_served_while_refresh_runs():
+    class SlowRouter(FakeRouter):
+        async def lag_seconds(self, replica):
+            if self.probes >= len(self.replicas):
+                await asyncio.sleep(0.2)  # 두 번째 측정부터 느림
+            return await super().lag_seconds(replica)
+
+    async def scenario():
+        router = SlowRouter([0.0], max_lag_seconds=5.0, check_interval=0.0)
+        first = await router.pick()
+        router.fake_lags["replica0"] = None
+        started = time.monotonic()
+        second = await router.pick()  # 재측정은 백그라운드, 마지막 결과로 바로 응답
+        waited = time.monotonic() - started
+        await router._refreshing
+        return first, second, waited, await router.pick()
+
+    first, second, waited, after = asyncio.run(scenario())
+    assert (first, second) == ("replica0", "replica0")
+    assert waited < 0.1
+    assert after == "primary"
+
+
+async def _pick(router, n):
+    return [await router.pick() for _ in range(n)]
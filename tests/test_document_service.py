@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.sql import Delete
+
+from app.core.exceptions import AppError
+from app.schemas.document import BulkDeleteRequest
+from app.services import document_service
+from app.services.document_service import DocumentService
+
+
+def _documents_session(recording_session, document_ids):
+    """documents 테이블 대신 id 목록을 두고 COUNT / 배치 SELECT / DELETE ... RETURNING에 응답하는 세션"""
+    remaining = list(document_ids)
+
+    def respond(statement):
+        if isinstance(statement, Delete):
+            ids = statement.compile().params["id_1"]
+            remaining[:] = [i for i in remaining if i not in ids]
+            return ids
+        if "count(*)" in str(statement):
+            return [len(remaining)]
+        return remaining[:statement.compile().params["param_1"]]
+
+    return recording_session(respond=respond)
+
+
+@pytest.fixture
+def cleaned(monkeypatch):
+    calls = []
+
+    async def delete_shard_documents(document_ids):
+        calls.append(("shards", list(document_ids)))
+
+    class Index:
+        async def delete_documents(self, document_ids):
+            calls.append(("index", list(document_ids)))
+
+    monkeypatch.setattr(document_service, "delete_shard_documents", delete_shard_documents)
+    monkeypatch.setattr(document_service, "get_vector_index", lambda db: Index())
+    return calls
+
+
+def test_delete_documents_issues_one_set_based_delete_then_cleans_up(cleaned, recording_session):
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    session = _documents_session(recording_session, ids)
+    deleted = asyncio.run(DocumentService(session).delete_documents(ids))
+
+    assert deleted == ids and session.commits == 1
+    assert len(session.statements) == 1
+    sql = session.sql(0)
+    # 청크는 ON DELETE CASCADE로 삭제되므로 embeddings는 건드리지 않음
+    assert sql.startswith("DELETE FROM documents WHERE documents.id IN (")
+    assert sql.endswith("RETURNING documents.id") and "embeddings" not in sql
+    assert cleaned == [("shards", ids), ("index", ids)]
+
+
+def test_bulk_delete_combines_criteria_and_commits_per_batch(cleaned, recording_session):
+    ids = [uuid.uuid4() for _ in range(5)]
+    session = _documents_session(recording_session, ids)
+    progress = []
+    result = asyncio.run(DocumentService(session).bulk_delete(
+        category="ENS", filename_pattern="2024_%.pdf", batch_size=2,
+        progress=lambda deleted, total: progress.append((deleted, total))
+    ))
+
+    assert result == {"deleted": 5, "total": 5}
+    assert progress == [(0, 5), (2, 5), (4, 5), (5, 5)]
+    assert session.commits == 3
+    count, first_batch = session.sql(0), session.sql(1)
+    for sql in (count, first_batch):
+        assert "WHERE documents.category = %(category_1)s AND documents.filename LIKE %(filename_1)s" in sql
+    assert "ORDER BY documents.id" in first_batch
+
+
+def test_bulk_delete_requires_at_least_one_criterion(cleaned, recording_session):
+    session = _documents_session(recording_session, [uuid.uuid4()])
+    with pytest.raises(AppError):
+        asyncio.run(DocumentService(session).bulk_delete())
+    assert session.statements == []
+
+    with pytest.raises(ValidationError):
+        BulkDeleteRequest(batch_size=10)
+    assert BulkDeleteRequest(category="ENS").batch_size == 50
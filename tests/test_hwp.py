@@ -0,0 +1,54 @@
+import io
+import struct
+import zlib
+
+from app.utils import hwp
+from app.utils.hwp import HWPTAG_PARA_TEXT, iter_paragraphs, para_text
+
+HWPTAG_PARA_HEADER = 66
+
+
+def _record(tag_id: int, payload: bytes, level: int = 0) -> bytes:
+    if len(payload) >= 0xFFF:
+        return struct.pack("<II", tag_id | (level << 10) | (0xFFF << 20), len(payload)) + payload
+    return struct.pack("<I", tag_id | (level << 10) | (len(payload) << 20)) + payload
+
+
+def _text(*parts) -> bytes:
+    """문자열은 UTF-16LE, 정수는 컨트롤 코드 (8 WCHAR 컨트롤은 나머지 7 WCHAR를 0으로 채움)"""
+    out = b""
+    for part in parts:
+        if isinstance(part, str):
+            out += part.encode("utf-16-le")
+        elif part in hwp.EXTENDED_CONTROLS:
+            out += struct.pack("<8H", part, 0x6c74, 0x6274, 0, 0, 0, 0, part)
+        else:
+            out += struct.pack("<H", part)
+    return out
+
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def test_para_text_drops_controls_and_keeps_surrogate_pairs():
+    payload = _text("제", 11, "1조", 9, "목적 😀", 10, "끝", 13)
+    assert para_text(payload) == "제1조\t목적 😀\n끝"
+
+
+def test_compressed_section_streams_paragraph_records(monkeypatch):
+    long_paragraph = "가나다라마바사 " * 400  # 0xFFF 이상 → 확장 크기 헤더
+    stream = b"".join([
+        _record(HWPTAG_PARA_HEADER, b"\x00" * 22),
+        _record(HWPTAG_PARA_TEXT, _text("대한민국 정부 문서", 13)),
+        _record(HWPTAG_PARA_HEADER, b"\x00" * 22, level=1),
+        _record(HWPTAG_PARA_TEXT, _text(11, "표 셀 내용", 13), level=2),
+        _record(HWPTAG_PARA_TEXT, _text(2, 13)),  # 구역 정의 컨트롤만 있는 문단
+        _record(HWPTAG_PARA_TEXT, _text(long_paragraph, 13)),
+    ])
+    monkeypatch.setattr(hwp, "READ_SIZE", 7)  # 레코드 헤더/본문이 읽기 경계에 걸리는 경우
+
+    paragraphs = list(iter_paragraphs(io.BytesIO(_deflate(stream)), compressed=True))
+    assert paragraphs == ["대한민국 정부 문서", "표 셀 내용", long_paragraph.strip()]
+    assert list(iter_paragraphs(io.BytesIO(stream), compressed=False)) == paragraphs
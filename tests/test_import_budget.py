@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("asyncpg")
+
+# 콜드 스타트 예산 (느린 CI에서는 환경 변수로 조정)
+IMPORT_BUDGET_SECONDS = float(os.environ.get("IMPORT_BUDGET_SECONDS", "3.0"))
+RSS_BUDGET_MB = float(os.environ.get("IMPORT_RSS_BUDGET_MB", "200"))
+
+# 쿼리 경로에 필요 없는 모듈: 파서/적재/워커/Provider SDK는 처음 사용할 때 import
+LAZY_MODULES = [
+    "app.worker", "app.services.ingest_service", "app.utils.parsers", "celery",
+    "langchain_text_splitters", "pandas", "fitz", "docx", "bs4", "olefile", "openpyxl",
+    "google.generativeai", "openai", "anthropic", "kiwipiepy", "httpx",
+]
+
+SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def test_app_main_import_stays_within_budget():
+    env = {**os.environ, "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "dummy")}
+    repo_root = Path(__file__).resolve().parents[1]
+    proc = subprocess.run([sys.executable, "-c", SCRIPT], cwd=repo_root, env=env, capture_output=True, text=True)
+    if proc.returncode != 0 and "ModuleNotFoundError" in proc.stderr:
+        pytest.skip(proc.stderr.strip().splitlines()[-1])
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert result["loaded"] == []
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS
+    assert result["rss_mb"] < RSS_BUDGET_MB
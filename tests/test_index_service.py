@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+
+import pytest
+
+from app import manage_indexes
+from app.services.index_service import HNSW_INDEXES, IndexService, partitioning_statements
+
+COLUMNS = ["id", "document_id", "chunk_index", "content", "embedding"]
+INDEXES = [
+    ("ix_embeddings_embedding_hnsw",
+     "CREATE INDEX ix_embeddings_embedding_hnsw ON public.embeddings USING hnsw (embedding vector_l2_ops)"),
+    ("ix_embeddings_content_search_gin",
+     "CREATE INDEX ix_embeddings_content_search_gin ON ONLY public.embeddings USING gin (content_search)"),
+]
+
+
+def test_partitioning_statements_copy_explicit_columns_and_swap_indexes():
+    statements = partitioning_statements(COLUMNS, INDEXES, partitions=2)
+    columns = '"id", "document_id", "chunk_index", "content", "embedding"'
+    assert f"INSERT INTO embeddings_convert ({columns}) SELECT {columns} FROM embeddings" in statements
+    assert "PARTITION BY HASH (document_id)" in statements[0]
+    assert "PRIMARY KEY (id, document_id)" in statements[1]
+    assert ("CREATE INDEX ix_embeddings_content_search_gin_convert ON public.embeddings_convert USING gin "
+            "(content_search)") in statements
+    # 인덱스는 DROP 전에 새 테이블에 만들고, 이름 교체는 DROP 후
+    drop = statements.index("DROP TABLE embeddings")
+    assert all(i < drop for i, s in enumerate(statements) if s.startswith("CREATE INDEX"))
+    assert statements[-1] == "ALTER INDEX ix_embeddings_content_search_gin_convert RENAME TO ix_embeddings_content_search_gin"
+    assert not any("duplicate_of" in s for s in statements)
+
+
+def test_unpartition_restores_self_reference():
+    statements = partitioning_statements(COLUMNS, INDEXES, partitions=0)
+    assert "PARTITION BY" not in statements[0]
+    assert "PRIMARY KEY (id)" in statements[1]
+    assert statements[-1].startswith("ALTER TABLE embeddings ADD CONSTRAINT embeddings_duplicate_of_fkey")
+
+
+def _catalog_session(recording_session):
+    """파티션 없음 / COLUMNS / INDEXES[:1]로 카탈로그 조회에 응답하는 엔진 겸 커넥션"""
+    def respond(statement):
+        sql = str(statement)
+        if "FROM pg_attribute" in sql:
+            return COLUMNS
+        if "FROM pg_index" in sql:
+            return INDEXES[:1]
+        return []
+
+    return recording_session(respond=respond)
+
+
+def test_convert_partitioning_locks_before_reading_and_runs_in_one_transaction(recording_session):
+    engine = _catalog_session(recording_session)
+    result = asyncio.run(IndexService(engine).convert_partitioning(4))
+    statements = [str(statement) for statement in engine.statements]
+    assert engine.transactions == 1
+    lock = statements.index("LOCK TABLE embeddings IN EXCLUSIVE MODE")
+    copy = next(i for i, s in enumerate(statements) if s.startswith("INSERT INTO embeddings_convert"))
+    assert lock < copy
+    assert all(i > lock for i, s in enumerate(statements) if "pg_attribute" in s)
+    assert result == {"partitions": 4, "changed": True, "indexes": ["ix_embeddings_embedding_hnsw"]}
+
+
+def test_rebuild_hnsw_builds_concurrently_then_swaps_names(recording_session):
+    engine = recording_session()
+    result = asyncio.run(IndexService(engine).rebuild_hnsw(m=24, ef_construction=128, prewarm=False))
+    statements = [str(statement) for statement in engine.statements]
+    assert engine.options == {"isolation_level": "AUTOCOMMIT"} and engine.closed
+    build = statements.index(
+        "CREATE INDEX CONCURRENTLY ix_embeddings_embedding_hnsw_new ON embeddings "
+        "USING hnsw (embedding vector_l2_ops) WITH (m = 24, ef_construction = 128)"
+    )
+    swap = statements.index("ALTER INDEX ix_embeddings_embedding_hnsw_new RENAME TO ix_embeddings_embedding_hnsw")
+    # 이전 인덱스는 이름 교체 후에 삭제 (시작 시 남은 _old 정리와 별개)
+    assert statements[-1] == "DROP INDEX CONCURRENTLY IF EXISTS ix_embeddings_embedding_hnsw_old"
+    assert build < swap < len(statements) - 1
+    assert engine.transactions == 1
+    assert result == {"index": "ix_embeddings_embedding_hnsw", "m": 24, "ef_construction": 128}
+
+
+class _RecordingIndexService:
+    calls = []
+
+    def __init__(self):
+        self.engine = self
+
+    async def dispose(self):
+        pass
+
+    async def rebuild_hnsw(self, m, ef_construction, prewarm=True, target="hnsw"):
+        self.calls.append(("rebuild_hnsw", target, m, ef_construction, prewarm))
+        return {}
+
+    async def rebuild_gin(self, prewarm=True):
+        self.calls.append(("rebuild_gin", prewarm))
+        return {}
+
+    async def convert_partitioning(self, partitions):
+        self.calls.append(("convert_partitioning", partitions))
+        return {}
+
+
+def test_manage_indexes_dispatches_commands(monkeypatch, capsys):
+    monkeypatch.setattr(manage_indexes, "IndexService", _RecordingIndexService)
+    monkeypatch.setattr(manage_indexes.settings, "EMBEDDINGS_PARTITIONS", 8)
+    _RecordingIndexService.calls = []
+
+    def run(command, **kwargs):
+        asyncio.run(manage_indexes.main(argparse.Namespace(command=command, **kwargs)))
+
+    run("rebuild", target="all", m=32, ef_construction=None, no_prewarm=True)
+    run("partition", partitions=None)
+    run("unpartition")
+    assert _RecordingIndexService.calls == [
+        *[("rebuild_hnsw", key, 32, None, False) for key in HNSW_INDEXES],
+        ("rebuild_gin", False),
+        ("convert_partitioning", 8),
+        ("convert_partitioning", 0),
+    ]
+
+    monkeypatch.setattr(manage_indexes.settings, "EMBEDDINGS_PARTITIONS", 0)
+    with pytest.raises(SystemExit):
+        run("partition", partitions=None)
@@ -0,0 +1,88 @@
+import pytest
+
+from app.utils.pdf import PageCache, extract_pages, page_ranges
+
+
+def test_page_ranges_split_contiguous_runs():
+    assert page_ranges([0, 1, 2, 3, 4, 7, 8, 10], size=3) == [(0, 3), (3, 5), (7, 9), (10, 11)]
+
+
+def _make_pdf(path, texts):
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    for text in texts:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_reingest_extracts_only_changed_pages(tmp_path, monkeypatch):
+    from app.utils import pdf
+
+    texts = [f"page {i} text" for i in range(40)]
+    path = tmp_path / "report.pdf"
+    _make_pdf(path, texts)
+    cache = PageCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(pdf.settings, "PDF_PARALLEL_MIN_PAGES", 8)
+    monkeypatch.setattr(pdf.settings, "PDF_PAGES_PER_TASK", 10)
+
+    progress = []
+    pages = extract_pages(str(path), workers=2, progress=lambda done, total: progress.append((done, total)),
+                          cache=cache)
+    assert [page.strip() for page in pages] == texts
+    assert progress == [(i, 40) for i in range(1, 41)]
+
+    texts[5] = "page 5 edited"
+    _make_pdf(path, texts)
+    written = []
+    monkeypatch.setattr(cache, "put", lambda key, text: written.append(text) or PageCache.put(cache, key, text))
+    pages = extract_pages(str(path), workers=2, cache=cache)
+    assert [page.strip() for page in pages] == texts
+    assert [text.strip() for text in written] == ["page 5 edited"]
+
+
+def test_same_content_stream_with_different_fonts_gets_different_keys(tmp_path):
+    fitz = pytest.importorskip("fitz")
+    from app.utils.pdf import page_key
+
+    doc = fitz.open()
+    doc.new_page()
+    doc.new_page()
+    content = doc.get_new_xref()
+    doc.update_object(content, "<<>>")
+    doc.update_stream(content, b"BT /F1 24 Tf 72 720 Td (ABC) Tj ET")
+    fonts = [
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding"
+        " << /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences [65 /X /Y /Z] >> >>",
+    ]
+    for number, font in enumerate(fonts):
+        font_xref = doc.get_new_xref()
+        doc.update_object(font_xref, font)
+        page_xref = doc.page_xref(number)
+        doc.xref_set_key(page_xref, "Contents", f"{content} 0 R")
+        doc.xref_set_key(page_xref, "Resources", f"<< /Font << /F1 {font_xref} 0 R >> >>")
+    path = tmp_path / "fonts.pdf"
+    doc.save(str(path))
+    doc.close()
+
+    with fitz.open(str(path)) as doc:
+        assert doc[0].read_contents() == doc[1].read_contents()
+        assert page_key(doc[0]) != page_key(doc[1])
+
+    pages = extract_pages(str(path), cache=PageCache(str(tmp_path / "cache")))
+    assert [page.strip() for page in pages] == ["ABC", "XYZ"]
+
+
+def test_prune_removes_least_recently_used_pages(tmp_path):
+    import os
+
+    cache = PageCache(str(tmp_path / "cache"))
+    for i, key in enumerate(["aa01", "bb02", "cc03"]):
+        cache.put(key, "x" * 100)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    cache.get("aa01")  # 최근 사용
+
+    assert cache.prune(max_bytes=250) == 1
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") is not None and cache.get("cc03") is not None
@@ -0,0 +1,188 @@
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from pgvector.sqlalchemy import HALFVEC
+
+from app.models.embedding import active_embedding_attr
+from app.schemas.search import SearchFilters
+from app.services.index_service import HALF_BQ_INDEX, active_vector_index
+from app.services import vector_index
+from app.services.vector_index import PgVectorIndex, truncate_embedding
+from app.services.vector_service import VectorService
+
+DIM = 768
+
+
+@pytest.fixture(autouse=True)
+def default_settings(monkeypatch):
+    for name, value in {
+        "VECTOR_STORAGE": "vector",
+        "VECTOR_SEARCH_MODE": "float",
+        "HNSW_EF_SEARCH": None,
+        "HNSW_ITERATIVE_SCAN": "relaxed_order",
+        "EMBEDDINGS_PARTITIONS": 0,
+    }.items():
+        monkeypatch.setattr(vector_index.settings, name, value)
+
+
+def test_filters_are_pushed_into_the_ann_query(recording_session):
+    document_id = uuid.uuid4()
+    filters = SearchFilters(category="ENS", document_ids=[document_id], created_from=datetime(2024, 1, 1))
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search([0.0] * DIM, 10, filters))
+
+    sql = session.sql()
+    where, order_by = sql.index("WHERE"), sql.index("ORDER BY embeddings.embedding <->")
+    # 카테고리는 partial/expression 인덱스와 매칭되도록 리터럴로 렌더링
+    assert "(embeddings.metadata_info ->> 'category') = 'ENS'" in sql[where:order_by]
+    assert "embeddings.document_id IN (%(document_id_1_1)s::UUID)" in sql[where:order_by]
+    assert "embeddings.document_id IN (SELECT documents.id" in sql[where:order_by]
+    # 필터는 ANN SELECT 자체의 WHERE에 있음 (LIMIT 이후 post-filter가 아님)
+    assert sql.count("SELECT") == 2 and sql.rstrip().endswith("LIMIT %(param_2)s")
+
+
+def test_batch_query_filters_each_lateral_candidate_list(recording_session):
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search_batch([[0.0] * DIM] * 2, 5, SearchFilters(category="ENS")))
+
+    sql = session.sql()
+    lateral = sql.index("LATERAL")
+    assert "(embeddings.metadata_info ->> 'category') = 'ENS'" in sql[lateral:]
+
+
+def test_iterative_scan_is_enabled_only_for_filtered_searches(recording_session):
+    unfiltered = recording_session()
+    asyncio.run(PgVectorIndex(unfiltered).search([0.0] * DIM, 10))
+    assert len(unfiltered.statements) == 1  # 설정할 값이 없으면 set_config round-trip 없음
+
+    filtered = recording_session()
+    asyncio.run(PgVectorIndex(filtered).search([0.0] * DIM, 10, SearchFilters(category="ENS")))
+    config = filtered.sql(0, literal_binds=True)
+    assert "set_config('hnsw.iterative_scan', 'relaxed_order', true)" in config
+    assert "set_config('hnsw.max_scan_tuples', '20000', true)" in config
+    assert "hnsw.ef_search" not in config
+
+
+def test_document_clauses_cover_every_filter_field(recording_session):
+    filters = SearchFilters(category="ENS", document_ids=[uuid.uuid4()],
+                            created_from=datetime(2024, 1, 1), created_to=datetime(2025, 1, 1))
+    clauses = [recording_session.render(clause) for clause in VectorService._document_clauses(filters)]
+    assert clauses[0] == "documents.category = %(category_1)s"
+    assert clauses[1].startswith("documents.id IN (")
+    assert clauses[2:] == ["documents.created_at >= %(created_at_1)s", "documents.created_at < %(created_at_1)s"]
+    assert VectorService._document_clauses(None) == []
+
+
+def test_ef_search_is_set_for_the_transaction_before_the_ann_query(monkeypatch, recording_session):
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search([0.0] * DIM, 10, ef_search=120))
+    assert len(session.statements) == 2
+    assert session.sql(0, literal_binds=True) == "SELECT set_config('hnsw.ef_search', '120', true) AS set_config_1"
+    assert "<->" in session.sql(1)
+
+    # 요청값이 없으면 HNSW_EF_SEARCH
+    monkeypatch.setattr(vector_index.settings, "HNSW_EF_SEARCH", 64)
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search_batch([[0.0] * DIM], 10))
+    assert "set_config('hnsw.ef_search', '64', true)" in session.sql(0, literal_binds=True)
+
+
+def _rows(distances):
+    return [SimpleNamespace(id=uuid.uuid4(), distance=d) for d in distances]
+
+
+def _params(statement) -> dict:
+    return {k: v for k, v in statement.compile().params.items() if not k.startswith("query_vector")}
+
+
+def test_binary_rescore_scans_hamming_candidates_and_rescores_by_l2(monkeypatch, recording_session):
+    monkeypatch.setattr(vector_index.settings, "VECTOR_SEARCH_MODE", "binary_rescore")
+    monkeypatch.setattr(vector_index.settings, "BQ_RESCORE_MULTIPLIER", 4)
+    rows = _rows([0.9, 0.2, 0.5, 0.1, 0.7])  # 해밍 거리 순서 (L2 순서 아님)
+    session = recording_session(rows)
+    hits = asyncio.run(PgVectorIndex(session).search([0.0] * DIM, 3))
+
+    sql = session.sql(1)
+    assert "embeddings.embedding <-> %(query_vector)s AS distance" in sql
+    assert ("ORDER BY CAST(binary_quantize(embeddings.embedding) AS BIT(768)) <~> "
+            "CAST(binary_quantize(%(query_vector)s) AS BIT(768))") in sql
+    assert _params(session.statements[1]) == {"param_1": 12}  # limit * BQ_RESCORE_MULTIPLIER
+    assert hits == [(rows[3].id, 0.1), (rows[1].id, 0.2), (rows[2].id, 0.5)]
+
+
+def test_rescore_raises_ef_search_to_the_coarse_candidate_count(monkeypatch, recording_session):
+    monkeypatch.setattr(vector_index.settings, "VECTOR_SEARCH_MODE", "binary_rescore")
+    monkeypatch.setattr(vector_index.settings, "BQ_RESCORE_MULTIPLIER", 4)
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search_batch([[0.0] * DIM] * 2, 50))
+    assert "set_config('hnsw.ef_search', '200', true)" in session.sql(0, literal_binds=True)
+    assert "LIMIT %(param_1)s" in session.sql(1) and _params(session.statements[1])["param_1"] == 200
+
+    # 요청 ef_search가 더 크면 유지, 상한은 MAX_EF_SEARCH
+    index = PgVectorIndex(None)
+    assert index._ann_ef_search(400, 50) == 400
+    assert index._ann_ef_search(None, 500) == vector_index.MAX_EF_SEARCH
+
+
+def test_halfvec_storage_searches_the_half_precision_column(monkeypatch, recording_session):
+    monkeypatch.setattr(vector_index.settings, "VECTOR_STORAGE", "halfvec")
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search([0.0] * DIM, 10))
+    sql = session.sql()
+    assert "embeddings.embedding_half <-> %(query_vector)s AS distance" in sql
+    assert "ORDER BY embeddings.embedding_half <-> %(query_vector)s" in sql
+    # 쿼리 벡터도 halfvec으로 바인드해야 halfvec_l2_ops 인덱스가 사용됨
+    assert isinstance(session.statements[-1].compile().binds["query_vector"].type, HALFVEC)
+
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search_batch([[0.0] * DIM] * 2, 10))
+    assert "embeddings.embedding_half <-> CAST(q.vec AS HALFVEC(768))" in session.sql()
+
+
+def test_halfvec_binary_rescore_uses_the_half_bq_index(monkeypatch, recording_session):
+    monkeypatch.setattr(vector_index.settings, "VECTOR_STORAGE", "halfvec")
+    monkeypatch.setattr(vector_index.settings, "VECTOR_SEARCH_MODE", "binary_rescore")
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search([0.0] * DIM, 10))
+    assert "ORDER BY CAST(binary_quantize(embeddings.embedding_half) AS BIT(768))" in session.sql()
+    assert active_embedding_attr() == "embedding_half"
+    assert active_vector_index() == HALF_BQ_INDEX
+
+
+def test_truncate_embedding_keeps_the_head_and_renormalizes():
+    assert truncate_embedding([3.0, 4.0, 12.0], 2) == pytest.approx([0.6, 0.8])
+    assert truncate_embedding([0.0, 0.0, 1.0], 2) == [0.0, 0.0]
+
+
+def test_matryoshka_rescore_scans_short_vectors_and_rescores_full_dimension(monkeypatch, recording_session):
+    monkeypatch.setattr(vector_index.settings, "VECTOR_SEARCH_MODE", "matryoshka_rescore")
+    monkeypatch.setattr(vector_index.settings, "MATRYOSHKA_RESCORE_MULTIPLIER", 3)
+    rows = _rows([0.4, 0.3, 0.8])
+    session = recording_session(rows)
+    query = [1.0] * DIM
+    hits = asyncio.run(PgVectorIndex(session).search(query, 2))
+
+    statement = session.statements[-1]
+    sql = recording_session.render(statement)
+    assert "embeddings.embedding <-> %(query_vector)s AS distance" in sql
+    assert "ORDER BY embeddings.embedding_short <-> %(query_vector_short)s" in sql
+    params = statement.compile().params
+    short_dim = vector_index.settings.MATRYOSHKA_DIM
+    assert params["query_vector_short"] == pytest.approx(truncate_embedding(query, short_dim))
+    assert params["param_1"] == 6  # limit * MATRYOSHKA_RESCORE_MULTIPLIER
+    assert hits == [(rows[1].id, 0.3), (rows[0].id, 0.4)]
+
+
+def test_matryoshka_batch_unnests_full_and_short_vectors_together(monkeypatch, recording_session):
+    monkeypatch.setattr(vector_index.settings, "VECTOR_SEARCH_MODE", "matryoshka_rescore")
+    session = recording_session()
+    asyncio.run(PgVectorIndex(session).search_batch([[1.0] * DIM, [2.0] * DIM], 10))
+    sql = session.sql()
+    short_dim = vector_index.settings.MATRYOSHKA_DIM
+    assert "unnest(%(query_vectors)s::TEXT[], %(query_vectors_short)s::TEXT[]) WITH ORDINALITY" in sql
+    assert f"ORDER BY embeddings.embedding_short <-> CAST(q.vec_short AS VECTOR({short_dim}))" in sql
+    shorts = session.statements[-1].compile().params["query_vectors_short"]
+    assert len(shorts) == 2 and shorts[0].count(",") == short_dim - 1
@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.core import profiling  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.chat_service import ChatService  # noqa: E402
+
+
+def test_resolve_mode_honours_header_only_for_admins(monkeypatch):
+    monkeypatch.setattr(profiling.settings, "PROFILING_SAMPLE_RATE", 0)
+    assert profiling.resolve_mode("cpu", is_admin=False) is None
+    assert profiling.resolve_mode(" CPU ", is_admin=True) == "cpu"
+    assert profiling.resolve_mode("flamegraph", is_admin=True) == "wall"
+    assert profiling.resolve_mode(None, is_admin=True) is None
+
+    monkeypatch.setattr(profiling.settings, "PROFILING_SAMPLE_RATE", 1)
+    monkeypatch.setattr(profiling.settings, "PROFILING_DEFAULT_MODE", "cpu")
+    assert profiling.resolve_mode("wall", is_admin=False) == "cpu"  # 샘플링은 헤더와 무관
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling.settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling.settings, "PROFILING_SAMPLE_RATE", 0)
+
+    async def no_db():
+        yield None
+
+    async def admin_from_token(db, token):
+        return type("User", (), {"is_superuser": token == "admin"})()
+
+    async def get_answer(self, query, k=4, **kwargs):
+        self.metadata = {"degradations": []}
+        return "answer", []
+
+    monkeypatch.setattr(deps, "user_from_token", admin_from_token)
+    monkeypatch.setattr(ChatService, "__init__", lambda self, db: None)
+    monkeypatch.setattr(ChatService, "get_answer", get_answer)
+    app.dependency_overrides[deps.admit_chat_request] = lambda: None
+    app.dependency_overrides[deps.get_read_db] = no_db
+    app.dependency_overrides[deps.get_current_active_superuser] = lambda: object()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _query(client, token):
+    return client.post("/api/v1/chat/query", json={"query": "ENS 신고 기한"},
+                       headers={"X-Profile": "cpu", "Authorization": f"Bearer {token}"})
+
+
+def test_profile_id_round_trip(client):
+    response = _query(client, "admin")
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    record = client.get(f"/api/v1/admin/profiles/{profile_id}").json()
+    assert record["id"] == profile_id
+    assert record["engine"] == "cprofile"
+    assert record["meta"]["scope"] == "event_loop"
+    assert "function calls" in record["report"]
+    assert [p["id"] for p in client.get("/api/v1/admin/profiles").json()] == [profile_id]
+
+
+def test_non_admin_profile_header_is_ignored(client, tmp_path):
+    response = _query(client, "user")
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_only_one_cpu_profile_runs_at_a_time(tmp_path, monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(profiling.settings, "PROFILING_DIR", str(tmp_path))
+
+    async def scenario():
+        async with profiling.profile_request("cpu", "first") as first:
+            async with profiling.profile_request("cpu", "second") as second:
+                pass
+        return first.enabled, second.enabled
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert len(list(tmp_path.glob("*.json"))) == 1
@@ -0,0 +1,124 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import search_service, vector_service  # noqa: E402
+from app.services.search_service import SearchService  # noqa: E402
+from app.services.vector_service import SearchHit, VectorService  # noqa: E402
+
+
+def _hit(query, i):
+    hit = SearchHit(uuid.uuid4())
+    hit.document = SimpleNamespace(id=uuid.uuid4(), filename=f"{query}-{i}.pdf", category="ENS")
+    hit.embedding = SimpleNamespace(chunk_index=i, content=f"{query} chunk {i}", metadata_info={"page_number": i})
+    hit.vector_rank, hit.vector_distance = i + 1, 0.1 * (i + 1)
+    hit.keyword_rank = 1 if i == 0 else None
+    hit.rrf_score = 1.0 / (61 + i)
+    return hit
+
+
+class FakeVectorService:
+    def __init__(self, db):
+        self.missing_shards = []
+        self.calls = []
+
+    async def search_hybrid_scored(self, query, top_k, filters=None, ef_search=None):
+        self.calls.append(("single", top_k))
+        return [_hit(query, i) for i in range(top_k)]
+
+    async def search_batch(self, queries, top_k, filters=None, ef_search=None):
+        self.calls.append(("batch", len(queries), top_k, ef_search))
+        return [[_hit(query, i) for i in range(top_k + 2)] for query in queries]
+
+
+@pytest.fixture(autouse=True)
+def fake_vector_service(monkeypatch):
+    monkeypatch.setattr(search_service, "VectorService", FakeVectorService)
+
+
+@pytest.fixture
+def client():
+    async def no_db():
+        yield None
+
+    app.dependency_overrides[deps.get_read_db] = no_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_batch_endpoint_returns_one_response_per_query_in_order(client):
+    response = client.post("/api/v1/search/batch", json={
+        "queries": ["ENS 신고", "AMS 정정"], "top_k": 3, "rerank": False, "ef_search": 80
+    })
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["query"] for r in results] == ["ENS 신고", "AMS 정정"]
+    for result in results:
+        assert (result["offset"], result["top_k"], result["missing_shards"]) == (0, 3, [])
+        assert len(result["results"]) == 3
+        item = result["results"][0]
+        assert item["filename"] == f"{result['query']}-0.pdf"
+        assert item["scores"] == {
+            "vector_distance": pytest.approx(0.1), "vector_rank": 1, "keyword_rank": 1,
+            "rrf": pytest.approx(1 / 61), "rerank": None,
+        }
+        assert item["score"] == item["scores"]["rrf"]  # 재순위화하지 않으면 RRF 점수
+
+
+def test_batch_search_runs_one_vector_search_for_all_queries():
+    service = SearchService(None)
+    responses = asyncio.run(service.search_batch(["a", "b", "c"], top_k=2, rerank=True, ef_search=64))
+    assert service.vector_service.calls == [("batch", 3, 2, 64)]
+    assert [len(r.results) for r in responses] == [2, 2, 2]
+    assert all(item.scores.rerank is not None and item.score == item.scores.rerank
+               for r in responses for item in r.results)
+
+
+def test_search_pages_after_reranking_the_whole_candidate_pool():
+    service = SearchService(None)
+    response = asyncio.run(service.search("ENS", top_k=2, offset=3, rerank=False))
+    assert service.vector_service.calls == [("single", 5)]
+    assert (response.offset, response.top_k) == (3, 2)
+    assert [item.chunk_index for item in response.results] == [3, 4]
+
+
+class RecordingIndex:
+    requires_document_filters = False
+
+    def __init__(self):
+        self.calls = []
+
+    async def search(self, query_vector, limit, filters=None, ef_search=None):
+        self.calls.append(("search", limit))
+        return []
+
+    async def search_batch(self, query_vectors, limit, filters=None, ef_search=None):
+        self.calls.append(("search_batch", len(query_vectors), limit))
+        return [[] for _ in query_vectors]
+
+
+def test_vector_service_batches_both_legs_for_several_queries(monkeypatch):
+    monkeypatch.setattr(vector_service.settings, "TWO_STAGE_RETRIEVAL", False)
+    index = RecordingIndex()
+    service = VectorService(None, index)
+    keyword_calls = []
+
+    async def keyword_batch(queries, limit, filters=None):
+        keyword_calls.append(len(queries))
+        return [[] for _ in queries]
+
+    monkeypatch.setattr(service, "_search_keyword_batch", keyword_batch)
+    vector_results, keyword_results = asyncio.run(
+        service._search_legs(["a", "b", "c"], [[0.0], [1.0], [2.0]], 20, True, None, None)
+    )
+    assert index.calls == [("search_batch", 3, 20)]
+    assert keyword_calls == [3]
+    assert len(vector_results) == len(keyword_results) == 3
@@ -0,0 +1,50 @@
+import asyncio
+import random
+import uuid
+
+from app.core.db_routing import ShardRouter
+from app.services.sharding import merge_keyword_results, merge_vector_results, scatter
+
+SHARDS = 3
+
+
+def _corpus(n=60, dim=4, seed=0):
+    rng = random.Random(seed)
+    return {uuid.uuid4(): [rng.random() for _ in range(dim)] for _ in range(n)}
+
+
+def _top_k(chunks, query, k):
+    distances = ((chunk_id, sum((a - b) ** 2 for a, b in zip(vec, query)) ** 0.5) for chunk_id, vec in chunks.items())
+    return sorted(distances, key=lambda item: item[1])[:k]
+
+
+def test_scatter_gather_matches_single_node_top_k():
+    corpus = _corpus()
+    router = ShardRouter([f"shard{i}" for i in range(SHARDS)], session_factory=None)
+    shards = [{} for _ in range(SHARDS)]
+    for chunk_id, vec in corpus.items():
+        shards[router.shard_for(chunk_id)][chunk_id] = vec
+    assert all(shards)
+
+    query = [0.5] * 4
+    per_shard = [_top_k(chunks, query, 10) for chunks in shards]
+    assert merge_vector_results(per_shard, 10) == _top_k(corpus, query, 10)
+
+    keyword = merge_keyword_results([["a1", "a2", "a3"], [], ["c1"]], limit=3)
+    assert keyword == ["a1", "c1", "a2"]
+
+
+def test_slow_or_failing_shards_are_dropped_as_partial_results():
+    async def ok():
+        return "ok"
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "late"
+
+    async def broken():
+        raise ConnectionError("shard down")
+
+    results, failed = asyncio.run(scatter([ok, slow, broken, ok], timeout=0.05))
+    assert results == {0: "ok", 3: "ok"}
+    assert failed == [1, 2]
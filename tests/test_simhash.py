@@ -0,0 +1,100 @@
+from app.utils.simhash import (
+    NEAR_DUP_BANDS, SignatureIndex, cluster_pairs, hamming_distance, simhash, simhash_bands
+)
+
+MANUAL_V1 = (
+    "ENS 신고는 선박 출항 24시간 전까지 제출해야 합니다. 신고 항목에는 화주 정보, 품목 코드, "
+    "컨테이너 번호가 포함되며 누락 시 적재가 거부될 수 있습니다. 정정 신고는 도착 전까지 가능합니다."
+)
+MANUAL_V2 = MANUAL_V1.replace("정정 신고는 도착 전까지 가능합니다.", "정정 신고는 도착 전까지 가능합니다!")
+UNRELATED = "AMS 필수 항목과 ACI 전송 절차, 하우스 B/L 분할 기준, 수수료 정산 일정에 대한 안내 문서입니다."
+
+
+def test_near_identical_texts_have_small_hamming_distance():
+    a, b, c = simhash(MANUAL_V1), simhash(MANUAL_V2), simhash(UNRELATED)
+    assert -(1 << 63) <= a < (1 << 63)  # bigint 범위
+    assert hamming_distance(a, b) <= 3
+    assert hamming_distance(a, c) > 10
+
+
+def test_bands_share_a_value_within_max_distance():
+    signature = simhash(MANUAL_V1)
+    flipped = signature ^ 0b1011  # 3비트 차이 → 적어도 한 구간은 같아야 함
+    bands = simhash_bands(signature)
+    assert len(bands) == NEAR_DUP_BANDS
+    assert set(bands) & set(simhash_bands(flipped))
+
+
+def test_cluster_pairs_groups_transitively():
+    assert cluster_pairs([("a", "b"), ("d", "e"), ("c", "b")]) == [["a", "b", "c"], ["d", "e"]]
+    assert cluster_pairs([]) == []
+
+
+def test_signature_index_compares_only_shared_bands(monkeypatch):
+    base = simhash(MANUAL_V1)
+    index = SignatureIndex()
+    index.add(base, "original")
+    index.add(simhash(UNRELATED), "other")
+
+    compared = []
+    monkeypatch.setattr("app.utils.simhash.hamming_distance",
+                        lambda a, b: compared.append(b) or hamming_distance(a, b))
+    assert index.find(base ^ 0b111, max_distance=3) == "original"
+    assert index.find(base ^ 0b1111, max_distance=3) is None
+    assert set(compared) == {base}  # 구간 값이 다른 항목은 비교하지 않음
+    assert len(index) == 2
+
+
+def test_near_duplicate_query_checks_each_signature_in_sql():
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.ingest_service import near_duplicate_query
+
+    sql = str(near_duplicate_query([1, 2], max_distance=3).compile(dialect=postgresql.dialect()))
+    assert "WITH ORDINALITY AS s(sig, pos) JOIN LATERAL" in sql
+    assert "embeddings.simhash_bands && ARRAY[" in sql
+    assert "embeddings.simhash # s.sig AS BIT(64)" in sql
+    assert sql.count("LIMIT") == 1 and "m.embedding" not in sql
+
+
+def test_near_duplicate_pairs_query_pages_by_id_and_pairs_each_match_once():
+    import uuid
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.ingest_service import near_duplicate_pairs_query
+
+    sql = str(near_duplicate_pairs_query(uuid.uuid4(), 1000, max_distance=3).compile(dialect=postgresql.dialect()))
+    assert "WHERE embeddings.simhash IS NOT NULL AND embeddings.id > %(id_1)s::UUID ORDER BY embeddings.id" in sql
+    assert "LEFT OUTER JOIN LATERAL" in sql and "embeddings_1.simhash_bands && s.simhash_bands" in sql
+    assert "embeddings_1.id > s.id" in sql  # 쌍은 id가 작은 쪽에서 한 번만
+
+
+def test_cluster_report_pages_through_the_corpus(monkeypatch, recording_session):
+    import asyncio
+    import uuid
+    from types import SimpleNamespace
+
+    from app.services import near_dup_service
+    from app.services.near_dup_service import NearDupService
+
+    monkeypatch.setattr(near_dup_service, "PAGE_SIZE", 2)
+    a, b, c, d = sorted(uuid.uuid4() for _ in range(4))
+    pages = [
+        [SimpleNamespace(id=a, match_id=c), SimpleNamespace(id=b, match_id=None)],
+        [SimpleNamespace(id=c, match_id=d), SimpleNamespace(id=d, match_id=None)],
+        [],
+    ]
+
+    def respond(statement):
+        if "LATERAL" in str(statement):
+            return pages.pop(0)
+        return [SimpleNamespace(id=i, chunk_index=0, duplicate_of=None, filename="a.pdf", preview="...")
+                for i in (a, c, d)]
+
+    session = recording_session(respond=respond)
+    report = asyncio.run(NearDupService(session).cluster_report(limit=10, max_distance=3))
+    assert (report["total_chunks"], report["cluster_count"], report["duplicate_chunks"]) == (4, 1, 2)
+    assert report["clusters"][0]["chunk_ids"] == [a, c, d]
+    # 두 번째 페이지는 첫 페이지의 마지막 id 이후부터
+    assert session.statements[1].compile().params["id_1"] == b
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+
+from app.utils.tabular import iter_table_chunks, row_groups, sniff_encoding
+
+HEADER = ["신고번호", "품명", "수량"]
+
+
+def test_csv_encoding_sniffed_and_header_repeated_per_row_group(tmp_path):
+    path = tmp_path / "declarations.csv"
+    lines = [",".join(HEADER)] + [f"2024-{i:05d},전자부품 {i},{i * 10}" for i in range(200)]
+    path.write_bytes("\n".join(lines).encode("cp949"))
+
+    assert sniff_encoding(str(path)) == "cp949"
+    chunks = list(iter_table_chunks(str(path), max_chars=300))
+
+    assert len(chunks) > 5
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert all(chunk.startswith("| 신고번호 | 품명 | 수량 |\n| --- | --- | --- |\n") for chunk in chunks)
+    rows = [line for chunk in chunks for line in chunk.splitlines()[2:]]
+    assert rows == [f"| 2024-{i:05d} | 전자부품 {i} | {i * 10} |" for i in range(200)]
+
+
+def test_row_groups_skip_blank_rows_and_escape_cells():
+    rows = [(None, None), ("a", "b", None), ("x|y", 1.0), (None,), ("line\nbreak", None)]
+    assert list(row_groups(rows, max_chars=1000, title="Sheet1")) == [
+        "## 시트: Sheet1\n| a | b |\n| --- | --- |\n| x\\|y | 1 |\n| line break |  |"
+    ]
+
+
+def test_xlsx_streams_every_sheet(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    first = workbook.active
+    first.title = "수입"
+    first.append(HEADER)
+    first.append(["2024-00001", "반도체", 3])
+    second = workbook.create_sheet("수출")
+    second.append(HEADER)
+    second.append(["2024-00002", "배터리", 5])
+    path = tmp_path / "customs.xlsx"
+    workbook.save(path)
+
+    chunks = list(iter_table_chunks(str(path), max_chars=1000))
+    assert [chunk.splitlines()[0] for chunk in chunks] == ["## 시트: 수입", "## 시트: 수출"]
+    assert chunks[1].endswith("| 2024-00002 | 배터리 | 5 |")
+
+
+def test_xls_reads_every_sheet_with_xlrd():
+    pytest.importorskip("xlrd")
+    path = Path(__file__).parent / "data" / "customs.xls"  # xlwt로 만든 BIFF8 통합문서
+
+    chunks = list(iter_table_chunks(str(path), max_chars=1000))
+    assert [chunk.splitlines()[0] for chunk in chunks] == ["## 시트: 수입", "## 시트: 수출"]
+    assert chunks[0].endswith("| 2024-00001 | 반도체 | 3 |")
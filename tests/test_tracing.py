@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+
+from app.core import tracing  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """전역 TracerProvider 대신 테스트 전용 provider의 tracer를 사용 (모듈 상태는 monkeypatch가 복원)"""
+    provider = TracerProvider()
+    memory = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer("test"))
+    monkeypatch.setattr(tracing, "_initialized", True)
+    yield memory
+    provider.shutdown()
+
+
+def test_context_propagates_from_api_to_worker_spans(exporter):
+    # API 측: 요청 span 안에서 Celery 헤더로 context 주입
+    with tracing.start_span("POST /api/v1/documents/upload", kind="server"):
+        headers = tracing.inject_context({})
+    assert "traceparent" in headers
+
+    # Worker 측: 헤더에서 context를 복원해 같은 trace에 child span 생성
+    with tracing.start_span("celery.process_document_task", context=tracing.extract_context(headers)):
+        with tracing.start_span("ingest.parse", filename="a.pdf", source_type=None):
+            pass
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {"POST /api/v1/documents/upload", "celery.process_document_task", "ingest.parse"}
+    assert len({span.context.trace_id for span in spans.values()}) == 1
+    assert spans["celery.process_document_task"].parent.span_id == spans["POST /api/v1/documents/upload"].context.span_id
+    assert dict(spans["ingest.parse"].attributes) == {"filename": "a.pdf"}
+
+
+def test_file_exporter_writes_json_lines(monkeypatch, tmp_path):
+    trace_file = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", "file")
+    monkeypatch.setattr(settings, "TRACING_FILE_PATH", str(trace_file))
+    provider = tracing.create_tracer_provider("rag-test")
+    with provider.get_tracer("test").start_as_current_span("ingest.embed"):
+        pass
+    out = provider._active_span_processor._span_processors[0].span_exporter.out
+    provider.shutdown()
+    assert out.closed  # exporter가 파일 핸들을 닫음
+
+    spans = [json.loads(line) for line in trace_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    assert [span["name"] for span in spans] == ["ingest.embed"]
+    assert spans[0]["resource"]["attributes"]["service.name"] == "rag-test"
+
+
+def test_disabled_tracing_is_a_no_op():
+    assert tracing._tracer is None and not tracing.is_enabled()
+    with tracing.start_span("noop") as span:
+        assert span is None
+    assert tracing.inject_context({}) == {}
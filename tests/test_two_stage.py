@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.schemas.search import SearchFilters
+from app.services import vector_service
+from app.services.vector_index import PgVectorIndex
+from app.services.vector_service import RESET_EF_SEARCH, VectorService
+
+DIM = 768
+
+
+class RecordingIndex:
+    requires_document_filters = False
+
+    def __init__(self):
+        self.filters = []
+
+    async def search(self, query_vector, limit, filters=None, ef_search=None):
+        self.filters.append(filters)
+        return []
+
+
+@pytest.fixture(autouse=True)
+def two_stage_settings(monkeypatch):
+    monkeypatch.setattr(vector_service.settings, "TWO_STAGE_RETRIEVAL", True)
+    monkeypatch.setattr(vector_service.settings, "TWO_STAGE_TOP_DOCUMENTS", 20)
+
+
+def test_first_stage_picks_top_documents_per_query_by_summary_vector(recording_session):
+    documents = [uuid.uuid4(), uuid.uuid4()]
+    session = recording_session(documents)
+    filters = asyncio.run(VectorService(session, RecordingIndex())._two_stage_filters(
+        [[0.0] * DIM, [1.0] * DIM], SearchFilters(category="ENS")
+    ))
+    assert filters == SearchFilters(document_ids=documents)
+
+    sql = session.sql()
+    assert "FROM unnest(%(query_vectors)s::TEXT[]) AS q(vec) JOIN LATERAL (SELECT documents.id AS id" in sql
+    assert "WHERE documents.summary_embedding IS NOT NULL AND documents.category = %(category_1)s" in sql
+    assert "ORDER BY documents.summary_embedding <-> CAST(q.vec AS VECTOR(768))" in sql
+    assert sql.startswith("SELECT DISTINCT d.id")  # 배치는 쿼리별 상위 문서의 합집합
+    assert session.statements[-1].compile().params["param_1"] == 20
+
+
+def test_first_stage_widens_ef_search_beyond_the_default(monkeypatch, recording_session):
+    monkeypatch.setattr(vector_service.settings, "TWO_STAGE_TOP_DOCUMENTS", 100)
+    session = recording_session([uuid.uuid4()])
+    asyncio.run(VectorService(session, RecordingIndex())._two_stage_filters([[0.0] * DIM], None))
+    assert session.sql(0, literal_binds=True) == "SELECT set_config('hnsw.ef_search', '100', true) AS set_config_1"
+    assert len(session.statements) == 3
+    assert session.statements[2] is RESET_EF_SEARCH  # 1단계 직후 되돌림
+
+
+@pytest.mark.parametrize("configured, expected", [(None, None), (64, "64")])
+def test_chunk_query_does_not_inherit_the_widened_ef_search(monkeypatch, recording_session, configured, expected):
+    monkeypatch.setattr(vector_service.settings, "TWO_STAGE_TOP_DOCUMENTS", 100)
+    monkeypatch.setattr(vector_service.settings, "HNSW_EF_SEARCH", configured)
+    documents = [uuid.uuid4()]
+    session = recording_session(respond=lambda statement: documents if "summary_embedding" in str(statement) else [])
+    service = VectorService(session, PgVectorIndex(session))
+    asyncio.run(service._search_legs(["ENS"], [[0.0] * DIM], 50, False, None, None))
+
+    sql = [session.sql(i, literal_binds=True) if "set_config(" in str(statement) else str(statement)
+           for i, statement in enumerate(session.statements)]
+    chunk_query = next(i for i, s in enumerate(sql) if "embeddings.embedding <->" in s)
+    reset = sql.index(str(RESET_EF_SEARCH))
+    assert reset < chunk_query
+    # 되돌린 뒤 청크 쿼리 전에 설정되는 ef_search는 청크 검색 자체의 값뿐
+    chunk_configs = [s for s in sql[reset + 1:chunk_query] if "hnsw.ef_search" in s]
+    if expected is None:
+        assert chunk_configs == []
+    else:
+        assert len(chunk_configs) == 1 and f"set_config('hnsw.ef_search', '{expected}', true)" in chunk_configs[0]
+
+
+def test_first_stage_keeps_original_filters_when_it_cannot_narrow(recording_session):
+    narrow = SearchFilters(document_ids=[uuid.uuid4()])
+    session = recording_session([uuid.uuid4()])
+    service = VectorService(session, RecordingIndex())
+    assert asyncio.run(service._two_stage_filters([[0.0] * DIM], narrow)) is narrow
+    assert session.statements == []  # 이미 문서 단위로 좁혀진 요청은 1단계 생략
+
+    # 요약 벡터가 있는 문서가 없으면(백필 전) 원래 필터로 청크 검색
+    filters = SearchFilters(category="ENS")
+    assert asyncio.run(VectorService(recording_session(), RecordingIndex())._two_stage_filters(
+        [[0.0] * DIM], filters
+    )) is filters
+
+
+def test_chunk_search_is_limited_to_first_stage_documents(recording_session):
+    documents = [uuid.uuid4()]
+    index = RecordingIndex()
+    service = VectorService(recording_session(documents), index)
+    asyncio.run(service._search_legs(["ENS"], [[0.0] * DIM], 50, False, SearchFilters(category="ENS"), None))
+    assert index.filters == [SearchFilters(document_ids=documents)]
@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+
+from app.services.upload_service import UploadError, UploadService, find_indexed, lock_nonblocking
+
+PAYLOAD = os.urandom(300_000)
+
+
+class FakeUploadFile:
+    def __init__(self, data: bytes):
+        self._buffer = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._buffer.read(size)
+
+
+async def _chunks(data: bytes, size: int = 64_000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def _broken(data: bytes, fail_after: int):
+    """fail_after 바이트를 보낸 뒤 연결이 끊기는 클라이언트"""
+    yield data[:fail_after]
+    raise ConnectionResetError("client disconnected")
+
+
+def test_stream_save_hashes_while_writing(tmp_path):
+    service = UploadService(str(tmp_path), chunk_size=4096)
+    path, size, digest = asyncio.run(service.save_stream(FakeUploadFile(PAYLOAD), "../report.pdf"))
+
+    assert path == os.path.join(str(tmp_path), "report.pdf")
+    assert size == len(PAYLOAD)
+    assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+    assert open(path, "rb").read() == PAYLOAD
+
+
+def test_resumable_upload_resumes_after_disconnect(tmp_path):
+    service = UploadService(str(tmp_path))
+    upload = asyncio.run(service.create("export.xlsx", len(PAYLOAD)))
+    upload_id = upload["upload_id"]
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(service.append(upload_id, 0, _broken(PAYLOAD, 100_000)))
+    offset = asyncio.run(service.status(upload_id))["offset"]
+    assert offset == 100_000
+
+    # 잘못된 offset은 현재 위치와 함께 거절
+    with pytest.raises(UploadError) as exc_info:
+        asyncio.run(service.append(upload_id, 0, _chunks(PAYLOAD)))
+    assert exc_info.value.status_code == 409 and exc_info.value.offset == offset
+
+    with pytest.raises(UploadError) as exc_info:
+        asyncio.run(service.complete(upload_id))
+    assert exc_info.value.status_code == 409
+
+    asyncio.run(service.append(upload_id, offset, _chunks(PAYLOAD[offset:])))
+    path, size, digest = asyncio.run(service.complete(upload_id))
+    assert (size, digest) == (len(PAYLOAD), hashlib.sha256(PAYLOAD).hexdigest())
+    assert open(path, "rb").read() == PAYLOAD
+
+    with pytest.raises(UploadError) as exc_info:
+        asyncio.run(service.status(upload_id))
+    assert exc_info.value.status_code == 404
+
+
+def test_complete_takes_the_upload_lock(tmp_path):
+    service = UploadService(str(tmp_path))
+    upload_id = asyncio.run(service.create("export.xlsx", len(PAYLOAD)))["upload_id"]
+    asyncio.run(service.append(upload_id, 0, _chunks(PAYLOAD)))
+    data_path, _ = service._paths(upload_id)
+
+    # 다른 요청이 잠금을 잡고 있는 동안(쓰기/완료 처리 중)에는 완료하지 않음
+    with open(data_path, "rb") as held:
+        lock_nonblocking(held)
+        with pytest.raises(UploadError) as exc_info:
+            asyncio.run(service.complete(upload_id))
+        assert exc_info.value.status_code == 409
+
+    asyncio.run(service.complete(upload_id))
+    with pytest.raises(UploadError) as exc_info:
+        asyncio.run(service.complete(upload_id))
+    assert exc_info.value.status_code == 404
+
+
+def test_find_indexed_matches_filename_and_content_hash(recording_session):
+    session = recording_session()
+    assert asyncio.run(find_indexed(session, "abc", "manual.pdf")) is None
+    sql = session.sql()
+    # 내용이 같아도 파일명이 다른 업로드는 건너뛰지 않음
+    assert ("WHERE documents.filename = %(filename_1)s AND documents.content_hash = %(content_hash_1)s "
+            "AND documents.status = %(status_1)s") in sql
+    assert session.statements[0].compile().params["filename_1"] == "manual.pdf"
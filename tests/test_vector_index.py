@@ -0,0 +1,105 @@
+import asyncio
+import uuid
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.schemas.search import SearchFilters  # noqa: E402
+from app.services.vector_index import LocalVectorIndex  # noqa: E402
+
+DIM = 8
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def _exact(vectors, query, k):
+    distances = np.linalg.norm(vectors - query, axis=1)
+    return list(np.argsort(distances)[:k])
+
+
+def test_exact_search_matches_bruteforce_and_filters_by_document(tmp_path):
+    vectors = _vectors(50)
+    ids = [uuid.uuid4() for _ in range(50)]
+    doc_a, doc_b = uuid.uuid4(), uuid.uuid4()
+    documents = [doc_a if i % 2 == 0 else doc_b for i in range(50)]
+
+    index = LocalVectorIndex(str(tmp_path), dim=DIM)
+    asyncio.run(index.add(ids, vectors.tolist(), documents))
+
+    query = vectors[3] + 0.01
+    hits = asyncio.run(index.search(query.tolist(), 5))
+    assert [chunk_id for chunk_id, _ in hits] == [ids[i] for i in _exact(vectors, query, 5)]
+    assert hits[0][1] == pytest.approx(float(np.linalg.norm(vectors[3] - query)), rel=1e-4)
+
+    filtered = asyncio.run(index.search(query.tolist(), 5, SearchFilters(document_ids=[doc_b])))
+    assert len(filtered) == 5
+    assert all(ids.index(chunk_id) % 2 == 1 for chunk_id, _ in filtered)
+
+
+def test_delete_and_reload_from_disk(tmp_path):
+    vectors = _vectors(20, seed=1)
+    ids = [uuid.uuid4() for _ in range(20)]
+    doc_a, doc_b = uuid.uuid4(), uuid.uuid4()
+    documents = [doc_a] * 10 + [doc_b] * 10
+
+    index = LocalVectorIndex(str(tmp_path), dim=DIM)
+    asyncio.run(index.add(ids, vectors.tolist(), documents))
+    asyncio.run(index.delete([ids[0]]))
+    asyncio.run(index.delete_documents([doc_b]))
+    assert len(index) == 9
+
+    # 다른 프로세스가 여는 것과 동일하게 디스크에서 다시 로드
+    reloaded = LocalVectorIndex(str(tmp_path), dim=DIM)
+    assert len(reloaded) == 9
+    hits = asyncio.run(reloaded.search(vectors[0].tolist(), 20))
+    assert {chunk_id for chunk_id, _ in hits} == set(ids[1:10])
+
+    # 같은 id를 다시 추가하면 교체되고, 기존 인스턴스도 version 변화를 보고 새 내용을 읽음
+    asyncio.run(reloaded.add([ids[1]], [vectors[15].tolist()], [doc_a]))
+    hits = asyncio.run(index.search(vectors[15].tolist(), 1))
+    assert hits[0][0] == ids[1]
+    assert hits[0][1] == pytest.approx(0.0, abs=1e-5)
+
+
+def test_deferred_adds_commit_once_on_save(tmp_path):
+    vectors = _vectors(30, seed=2)
+    ids = [uuid.uuid4() for _ in range(30)]
+    document = uuid.uuid4()
+
+    index = LocalVectorIndex(str(tmp_path), dim=DIM)
+    version = index._version
+    for start in range(0, 30, 10):
+        asyncio.run(index.add(ids[start:start + 10], vectors[start:start + 10].tolist(), [document] * 10, save=False))
+    assert index._version == version  # 배치마다 커밋하지 않음
+    assert len(LocalVectorIndex(str(tmp_path), dim=DIM)) == 0
+
+    index.save()
+    assert index._version == version + 1
+    reloaded = LocalVectorIndex(str(tmp_path), dim=DIM)
+    assert len(reloaded) == 30
+    assert asyncio.run(reloaded.search(vectors[25].tolist(), 1))[0][0] == ids[25]
+
+
+def test_hnsw_graph_is_saved_periodically_and_replays_newer_rows_on_load(tmp_path, monkeypatch):
+    pytest.importorskip("hnswlib")
+    monkeypatch.setattr(LocalVectorIndex, "HNSW_SAVE_INTERVAL", 25)
+    vectors = _vectors(40, seed=3)
+    ids = [uuid.uuid4() for _ in range(40)]
+    document = uuid.uuid4()
+
+    index = LocalVectorIndex(str(tmp_path), dim=DIM, mode="hnsw")
+    asyncio.run(index.add(ids[:30], vectors[:30].tolist(), [document] * 30))
+    graph = tmp_path / "hnsw.bin"
+    saved_at = graph.stat().st_mtime_ns
+    # 증분 추가/삭제는 그래프 파일을 다시 쓰지 않음
+    asyncio.run(index.add(ids[30:], vectors[30:].tolist(), [document] * 10))
+    asyncio.run(index.delete([ids[0]]))
+    assert graph.stat().st_mtime_ns == saved_at and index._hnsw_count == 30
+
+    reloaded = LocalVectorIndex(str(tmp_path), dim=DIM, mode="hnsw")
+    assert len(reloaded) == 39
+    assert asyncio.run(reloaded.search(vectors[35].tolist(), 1))[0][0] == ids[35]
+    assert ids[0] not in {chunk_id for chunk_id, _ in asyncio.run(reloaded.search(vectors[0].tolist(), 5))}